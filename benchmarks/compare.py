@@ -0,0 +1,44 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Mapping
+
+
+def load(path: str) -> Mapping[str, Mapping[str, Any]]:
+    data = json.loads(Path(path).read_text())
+    return {x['name']: x for x in data['results']}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Compare two benchmark reports produced by benchmarks.run')
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--metric', choices=['min', 'median'], default='median')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='Exit with status 1 if any benchmark becomes slower by this factor (default: %(default)s).')
+    args = parser.parse_args(argv)
+
+    base, new = load(args.base), load(args.new)
+    regressions = []
+    print(f'{"benchmark":<70} {"base":>10} {"new":>10} {"ratio":>7}')
+    for name in sorted(base.keys() & new.keys()):
+        b, n = base[name][args.metric], new[name][args.metric]
+        ratio = n / b if b else float('inf')
+        mark = ''
+        if ratio > args.threshold:
+            mark = ' !'
+            regressions.append(name)
+        if new[name].get('ok') is False:
+            mark += ' (round-trip failed)'
+            regressions.append(name)
+        print(f'{name:<70} {b:>10.4f} {n:>10.4f} {ratio:>7.2f}{mark}')
+
+    for name in sorted(base.keys() ^ new.keys()):
+        print(f'{name:<70} only in {"base" if name in base else "new"}')
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import copy
+import time
+from collections import abc
+from typing import Any, Callable, List, Tuple
+
+from openapi_type import OpenAPI, parse_spec
+from openapi_type.diff import diff_specs
+from openapi_type.fingerprint import Fingerprints
+
+from benchmarks.generator import generate_spec, sizes
+
+
+def naive_diff(old: Any, new: Any, path: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+    """ Baseline that walks every node of both specs, without skipping identical subtrees
+    """
+    rv: List[Tuple[Any, ...]] = []
+    if isinstance(old, abc.Mapping) and isinstance(new, abc.Mapping):
+        for key in old.keys() | new.keys():
+            if key not in old or key not in new:
+                rv.append(path + (key,))
+            else:
+                rv.extend(naive_diff(old[key], new[key], path + (key,)))
+    elif isinstance(old, tuple) and isinstance(new, tuple) and len(old) == len(new):
+        for i, (a, b) in enumerate(zip(old, new)):
+            rv.extend(naive_diff(a, b, path + (i,)))
+    elif isinstance(old, (list, frozenset)) and type(old) is type(new):
+        if len(old) != len(new) or any(naive_diff(a, b) for a, b in zip(old, new)):
+            rv.append(path)
+    elif old != new:
+        rv.append(path)
+    return rv
+
+
+def edited(data: Any) -> Any:
+    """ The spec with one path item and one component schema changed
+    """
+    rv = copy.deepcopy(data)
+    path = next(iter(rv['paths'].values()))
+    next(iter(path.values()))['description'] = 'Changed'
+    schema = next(iter(rv['components']['schemas'].values()))
+    schema['description'] = 'Changed'
+    return rv
+
+
+def derived(spec: OpenAPI, changed: OpenAPI) -> OpenAPI:
+    """ ``changed`` rebuilt from ``spec`` with its changes only, sharing every other subtree with ``spec``
+    """
+    paths = dict(spec.paths)
+    schemas = dict(spec.components.schemas)
+    for key in paths:
+        if paths[key] != changed.paths[key]:
+            paths[key] = changed.paths[key]
+    for key in schemas:
+        if schemas[key] != changed.components.schemas[key]:
+            schemas[key] = changed.components.schemas[key]
+    return spec._replace(paths=paths, components=spec.components._replace(schemas=schemas))
+
+
+def measure(fn: Callable[[], Any]) -> float:
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Structural diff of specs with one path and one schema changed')
+    parser.add_argument('--sizes', default='1k,10k', help='Numbers of component schemas of generated specs.')
+    args = parser.parse_args(argv)
+
+    for size in sizes(args.sizes.split(',')):
+        data = generate_spec(size)
+        old = parse_spec(data)
+        reparsed = parse_spec(edited(data))
+        shared = derived(old, reparsed)
+        fingerprints = Fingerprints()
+        fingerprints(old), fingerprints(reparsed)
+        print(f'{size} schemas')
+        for name, new in (('separately parsed', reparsed), ('sharing subtrees', shared)):
+            assert len(diff_specs(old, new)) == 2
+            print(f'  {name}')
+            print(f'    naive walk                  {measure(lambda: naive_diff(old, new)):.4f}s')
+            print(f'    diff_specs                  {measure(lambda: diff_specs(old, new)):.4f}s')
+            print(f'    diff_specs, fingerprints    {measure(lambda: diff_specs(old, new, Fingerprints())):.4f}s')
+            if new is reparsed:
+                print(f'    diff_specs, memoized        '
+                      f'{measure(lambda: diff_specs(old, new, fingerprints)):.4f}s')
+
+
+if __name__ == '__main__':
+    main()
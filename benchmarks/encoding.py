@@ -0,0 +1,125 @@
+import argparse
+import io
+import json
+import random
+import statistics
+import time
+from typing import Any, Callable, List, Tuple
+
+from openapi_type import parse_spec
+from openapi_type.encoding import EncoderCompiler
+from openapi_type.resolver import Resolver
+
+from benchmarks.generator import generate_spec
+from benchmarks.validation import _TooDeep, request_bodies, sample
+
+
+ROWS_SPEC = {
+    'openapi': '3.0.0',
+    'info': {'version': '1', 'title': 'Rows'},
+    'paths': {},
+    'components': {'schemas': {
+        'Row': {
+            'type': 'object',
+            'required': ['id', 'name', 'price', 'active', 'tags'],
+            'properties': {
+                'id': {'type': 'integer'},
+                'name': {'type': 'string'},
+                'price': {'type': 'number'},
+                'active': {'type': 'boolean'},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+                'note': {'type': 'string'},
+            },
+        },
+        'Rows': {'type': 'array', 'items': {'$ref': '#/components/schemas/Row'}},
+    }},
+}
+
+
+def rows(count: int) -> List[Any]:
+    rv = []
+    for i in range(count):
+        row = {'id': i, 'name': f'row {i}', 'price': i * 0.25, 'active': i % 2 == 0, 'tags': ['a', 'b']}
+        if i % 3 == 0:
+            row['note'] = 'note'
+        rv.append(row)
+    return rv
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t)
+    return statistics.median(runs)
+
+
+def report(title: str, size: int, cases: List[Tuple[str, Callable[[], Any]]], repeat: int) -> None:
+    print(f'{title}, {size / 1e6:.2f} MB of JSON')
+    for name, fn in cases:
+        t = measure(fn, repeat)
+        print(f'  {name:<22} {t:.4f}s, {size / t / 1e6:.1f} MB/s')
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Compiled schema-aware encoders against json.dumps')
+    parser.add_argument('--rows', type=int, default=100000, help='Rows of the large array response.')
+    parser.add_argument('--schemas', type=int, default=300)
+    parser.add_argument('--ref-density', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-n', '--number', type=int, default=100, help='Encodings of every generated payload per run.')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    spec = parse_spec(ROWS_SPEC)
+    encoder = EncoderCompiler(spec).compile(spec.components.schemas['Rows'])
+    payload = rows(args.rows)
+    text = encoder.encode(payload)
+    assert json.loads(text) == payload
+
+    def stream() -> None:
+        encoder.write(payload, io.StringIO())
+
+    def stream_stdlib() -> None:
+        out = io.StringIO()
+        for chunk in json.JSONEncoder().iterencode(payload):
+            out.write(chunk)
+
+    report(f'{args.rows} rows', len(text), [
+        ('json.dumps', lambda: json.dumps(payload)),
+        ('json.dumps compact', lambda: json.dumps(payload, separators=(',', ':'))),
+        ('compiled', lambda: encoder.encode(payload)),
+        ('json iterencode', stream_stdlib),
+        ('compiled, streamed', stream),
+    ], args.repeat)
+
+    spec = parse_spec(generate_spec(args.schemas, ref_density=args.ref_density, seed=args.seed))
+    resolver = Resolver(spec)
+    rnd = random.Random(args.seed)
+    cases = []
+    compiler = EncoderCompiler(spec, resolver)
+    for schema in request_bodies(spec):
+        try:
+            cases.append((compiler.compile(schema).encode, sample(schema, resolver, rnd)))
+        except _TooDeep:
+            pass
+    size = sum(len(encode(x)) for encode, x in cases) * args.number
+    for encode, x in cases:
+        assert json.loads(encode(x)) == x
+
+    def run(fn: Callable[[Any, Any], Any]) -> Callable[[], None]:
+        def go() -> None:
+            for encode, x in cases:
+                for _ in range(args.number):
+                    fn(encode, x)
+        return go
+
+    report(f'{len(cases)} payloads of generated schemas x {args.number}', size, [
+        ('json.dumps', run(lambda encode, x: json.dumps(x))),
+        ('compiled', run(lambda encode, x: encode(x))),
+    ], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import random
+from typing import Any, Dict, List, Mapping
+
+
+PRIMITIVES = [
+    {'type': 'string'},
+    {'type': 'string', 'format': 'date-time'},
+    {'type': 'string', 'enum': ['a', 'b', 'c']},
+    {'type': 'integer', 'format': 'int64', 'minimum': 0},
+    {'type': 'number', 'format': 'double'},
+    {'type': 'boolean'},
+]
+
+
+def _ref(i: int) -> Dict[str, Any]:
+    return {'$ref': f'#/components/schemas/Schema{i}'}
+
+
+class _Generator:
+    def __init__(self, n_schemas: int, nesting: int, ref_density: float, union_ratio: float, seed: int) -> None:
+        self.rnd = random.Random(seed)
+        self.n_schemas = n_schemas
+        self.nesting = nesting
+        self.ref_density = ref_density
+        self.union_ratio = union_ratio
+
+    def value(self, depth: int) -> Dict[str, Any]:
+        rnd = self.rnd
+        roll = rnd.random()
+        if roll < self.ref_density:
+            return _ref(rnd.randrange(self.n_schemas))
+        if roll < self.ref_density + self.union_ratio:
+            kind = rnd.choice(['oneOf', 'anyOf', 'allOf'])
+            return {kind: [_ref(rnd.randrange(self.n_schemas)) for _ in range(rnd.randint(2, 4))]}
+        if depth < self.nesting:
+            if rnd.random() < 0.5:
+                return {'type': 'array', 'items': self.value(depth + 1)}
+            return self.obj(depth + 1)
+        return dict(rnd.choice(PRIMITIVES))
+
+    def obj(self, depth: int) -> Dict[str, Any]:
+        rnd = self.rnd
+        props = {f'field{i}': self.value(depth) for i in range(rnd.randint(2, 8))}
+        return {
+            'type': 'object',
+            'description': f'Object at depth {depth}',
+            'required': sorted(rnd.sample(sorted(props), k=rnd.randint(0, len(props)))),
+            'properties': props,
+        }
+
+    def operation(self, i: int, method: str) -> Dict[str, Any]:
+        rnd = self.rnd
+        rv: Dict[str, Any] = {
+            'operationId': f'{method}Resource{i}',
+            'tags': [f'tag{i % 17}'],
+            'parameters': [
+                {'name': 'id', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}},
+                {'name': 'limit', 'in': 'query', 'schema': {'type': 'integer', 'maximum': 100}},
+            ],
+            'responses': {
+                '200': {
+                    'description': 'OK',
+                    'content': {'application/json': {'schema': _ref(rnd.randrange(self.n_schemas))}},
+                },
+                'default': {'$ref': '#/components/responses/Error'},
+            },
+        }
+        if method in ('post', 'put'):
+            rv['requestBody'] = {
+                'required': True,
+                'content': {'application/json': {'schema': _ref(rnd.randrange(self.n_schemas))}},
+            }
+        return rv
+
+    def spec(self, n_paths: int) -> Dict[str, Any]:
+        schemas = {f'Schema{i}': self.obj(0) for i in range(self.n_schemas)}
+        paths = {}
+        for i in range(n_paths):
+            methods = self.rnd.sample(['get', 'post', 'put', 'delete'], k=self.rnd.randint(1, 4))
+            paths[f'/resources{i}/{{id}}'] = {m: self.operation(i, m) for m in sorted(methods)}
+        return {
+            'openapi': '3.0.2',
+            'info': {'title': 'Synthetic', 'version': '1.0.0'},
+            'paths': paths,
+            'components': {
+                'schemas': schemas,
+                'responses': {
+                    'Error': {
+                        'description': 'Error',
+                        'content': {'application/json': {'schema': {
+                            'type': 'object',
+                            'required': ['message'],
+                            'properties': {'message': {'type': 'string'}},
+                        }}},
+                    },
+                },
+            },
+        }
+
+
+def generate_spec(n_schemas: int,
+                  n_paths: int = -1,
+                  nesting: int = 2,
+                  ref_density: float = 0.3,
+                  union_ratio: float = 0.1,
+                  seed: int = 0) -> Mapping[str, Any]:
+    """ Generates a valid spec with ``n_schemas`` component schemas.
+    The same arguments always produce the same spec.
+
+    :param n_paths: number of paths, defaults to one path per 10 schemas
+    :param nesting: maximum depth of inline objects and arrays
+    :param ref_density: probability of a property being a ``$ref``
+    :param union_ratio: probability of a property being a ``oneOf``/``anyOf``/``allOf`` of refs
+    """
+    if n_paths < 0:
+        n_paths = max(1, n_schemas // 10)
+    return _Generator(n_schemas, nesting, ref_density, union_ratio, seed).spec(n_paths)
+
+
+def sizes(raw: List[str]) -> List[int]:
+    """ Parses sizes like ``1k``, ``10k``, ``100000``
+    """
+    rv = []
+    for x in raw:
+        x = x.strip().lower()
+        rv.append(int(float(x[:-1]) * 1000) if x.endswith('k') else int(x))
+    return rv
@@ -0,0 +1,53 @@
+import argparse
+import json
+import time
+
+from openapi_type import parse_spec
+from openapi_type.cli.load import IncrementalLoader, load_data
+from openapi_type.incremental import IncrementalParser
+
+from benchmarks.generator import generate_spec, sizes
+
+
+def edits(text: str, count: int):
+    """ Versions of the document with a one-line edit of a description, each in a different entry
+    """
+    marker = '"description": "'
+    position = 0
+    for i in range(count):
+        position = text.index(marker, position + len(text) // (count + 1)) + len(marker)
+        text = text[:position] + f'Edited {i}. ' + text[position:]
+        yield text
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Latency of re-checking a spec after one-line edits, '
+                                                 'as in `openapi-type check --watch`')
+    parser.add_argument('--paths', default='1k,10k', help='Numbers of paths of generated specs.')
+    parser.add_argument('--edits', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for n in sizes(args.paths.split(',')):
+        text = json.dumps(generate_spec(max(1, n // 5), n_paths=n), indent=2)
+        print(f'{n} paths, {len(text) / 2 ** 20:.1f} MiB')
+
+        t = time.perf_counter()
+        parse_spec(load_data(text.encode()))
+        print(f'  full load and parse      {time.perf_counter() - t:.3f}s')
+
+        loader, incremental = IncrementalLoader('spec.json'), IncrementalParser()
+        incremental.parse(loader.load(text.encode()))
+        for version in edits(text, args.edits):
+            buf = version.encode()
+            t = time.perf_counter()
+            data = loader.load(buf)
+            loaded = time.perf_counter()
+            spec = incremental.parse(data)
+            parsed = time.perf_counter()
+            print(f'  incremental              {(parsed - t) * 1000:.1f} ms (load {(loaded - t) * 1000:.1f} ms, '
+                  f'parse {(parsed - loaded) * 1000:.1f} ms, re-parsed {incremental.stats.reparsed})')
+        assert spec == parse_spec(load_data(buf))
+
+
+if __name__ == '__main__':
+    main()
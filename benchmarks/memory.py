@@ -0,0 +1,65 @@
+import argparse
+import gc
+import tracemalloc
+from collections import abc
+from typing import Any, Tuple
+
+from openapi_type import SchemaType, parse_spec
+from openapi_type.compact import compact
+
+from benchmarks.generator import generate_spec, sizes
+
+
+SCHEMA_TYPES = tuple(x for x in SchemaType.__args__ if isinstance(x, type))
+
+
+def schema_nodes(value: Any) -> int:
+    """ Schemas of a parsed spec, counted at every location, whether or not they are shared
+    """
+    count = 0
+    pending = [value]
+    while pending:
+        x = pending.pop()
+        if isinstance(x, SCHEMA_TYPES):
+            count += 1
+        if isinstance(x, abc.Mapping):
+            pending.extend(x.values())
+        elif isinstance(x, (tuple, list)):
+            pending.extend(x)
+    return count
+
+
+def retained(size: int) -> Tuple[int, int, int]:
+    """ Memory held by a parsed spec, and by its compact form alone, with the number of its schemas
+    """
+    data = generate_spec(size)
+    gc.collect()
+    tracemalloc.start()
+    spec = parse_spec(data)
+    gc.collect()
+    plain = tracemalloc.get_traced_memory()[0]
+    nodes = schema_nodes(spec)
+    spec = compact(spec)
+    gc.collect()
+    compacted = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return plain, compacted, nodes
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Memory held by parsed specs per schema node, '
+                                                 'with and without openapi_type.compact')
+    parser.add_argument('--sizes', default='1k,5k', help='Numbers of component schemas of generated specs.')
+    args = parser.parse_args(argv)
+
+    # the parser is built outside of the measurement
+    parse_spec(generate_spec(1))
+    for size in sizes(args.sizes.split(',')):
+        plain, compacted, nodes = retained(size)
+        print(f'{size} schemas, {nodes} schema nodes')
+        print(f'  parse_spec     {plain / 2 ** 20:8.1f} MiB, {plain / nodes:6.0f} bytes per schema node')
+        print(f'  compact        {compacted / 2 ** 20:8.1f} MiB, {compacted / nodes:6.0f} bytes per schema node')
+
+
+if __name__ == '__main__':
+    main()
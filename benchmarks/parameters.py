@@ -0,0 +1,120 @@
+import argparse
+import statistics
+import time
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, Mapping
+from urllib.parse import parse_qs
+
+from pyrsistent import pmap
+
+from openapi_type import (
+    OperationParameter, ParamLocation, ParamStyle,
+    IntegerValue, FloatValue, StringValue, BooleanValue, ArrayValue, ObjectValue,
+)
+from openapi_type.parameters import ParameterDecoder
+
+
+def _param(name, location, schema, style=None, explode=None, required=False) -> OperationParameter:
+    return OperationParameter(name=name, in_=ParamLocation(location), schema=schema, required=required,
+                              style=None if style is None else ParamStyle(style), explode=explode)
+
+
+INTEGER = IntegerValue(type='integer')
+STRING = StringValue(type='string')
+
+PARAMETERS = [
+    _param('id', 'path', INTEGER, required=True),
+    _param('tags', 'query', ArrayValue(type='array', items=STRING)),
+    _param('ids', 'query', ArrayValue(type='array', items=INTEGER), explode=False),
+    _param('filter', 'query', ObjectValue(type='object', properties=pmap({'role': STRING, 'age': INTEGER})),
+           'deepObject', explode=True),
+    _param('limit', 'query', INTEGER, required=True),
+    _param('offset', 'query', INTEGER),
+    _param('flag', 'query', BooleanValue(type='boolean')),
+    _param('X-Rate', 'header', FloatValue(type='number')),
+    _param('X-Request-Id', 'header', STRING),
+    _param('session', 'cookie', STRING),
+]
+
+REQUEST: Mapping[str, Any] = {
+    'query': 'tags=a&tags=b&ids=1,2,3&filter[role]=admin&filter[age]=7&limit=10&offset=20&flag=true',
+    'headers': {'Host': 'example.com', 'X-Rate': '1.5', 'X-Request-Id': 'abc', 'Accept': '*/*'},
+    'cookies': 'theme=dark; session=abc',
+    'path': {'id': '42'},
+}
+
+
+def _convert(schema: Any, value: str) -> Any:
+    if isinstance(schema, IntegerValue):
+        return int(value)
+    if isinstance(schema, FloatValue):
+        return float(value)
+    if isinstance(schema, BooleanValue):
+        return value == 'true'
+    return value
+
+
+def decode_generic(parameters, query: str, headers: Mapping[str, str], cookies: str,
+                   path: Mapping[str, str]) -> Dict[str, Dict[str, Any]]:
+    """ Decodes parameters with ``urllib.parse`` and inspects the style and the schema of every parameter
+    on every request, the way it is done without compiled decoders
+    """
+    values = parse_qs(query)
+    jar = SimpleCookie()
+    jar.load(cookies)
+    lower_headers = {k.lower(): v for k, v in headers.items()}
+    rv: Dict[str, Dict[str, Any]] = {'path': {}, 'query': {}, 'header': {}, 'cookie': {}}
+    for p in parameters:
+        if p.in_ is ParamLocation.QUERY:
+            style = p.style or ParamStyle.FORM
+            explode = p.explode if p.explode is not None else style is ParamStyle.FORM
+            if style is ParamStyle.DEEP_OBJECT:
+                found = {k: _convert(x, values[f'{p.name}[{k}]'][0])
+                         for k, x in p.schema.properties.items() if f'{p.name}[{k}]' in values}
+                if found:
+                    rv['query'][p.name] = found
+            elif p.name in values:
+                if isinstance(p.schema, ArrayValue):
+                    items = values[p.name] if explode else values[p.name][0].split(',')
+                    rv['query'][p.name] = [_convert(p.schema.items, x) for x in items]
+                else:
+                    rv['query'][p.name] = _convert(p.schema, values[p.name][0])
+        elif p.in_ is ParamLocation.HEADER:
+            if p.name.lower() in lower_headers:
+                rv['header'][p.name] = _convert(p.schema, lower_headers[p.name.lower()])
+        elif p.in_ is ParamLocation.COOKIE:
+            if p.name in jar:
+                rv['cookie'][p.name] = _convert(p.schema, jar[p.name].value)
+        elif p.name in path:
+            rv['path'][p.name] = _convert(p.schema, path[p.name])
+    return rv
+
+
+def measure(fn: Callable[[], Any], number: int, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - t) / number)
+    return statistics.median(runs)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Compiled parameter decoders against generic urllib.parse decoding')
+    parser.add_argument('-n', '--number', type=int, default=20000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    decoder = ParameterDecoder(PARAMETERS)
+    compiled = decoder.decode(**REQUEST)
+    generic = decode_generic(PARAMETERS, **REQUEST)
+    assert compiled._asdict() == generic, (compiled, generic)
+
+    for name, fn in [('generic', lambda: decode_generic(PARAMETERS, **REQUEST)),
+                     ('compiled', lambda: decoder.decode(**REQUEST))]:
+        print(f'{name:<10} {measure(fn, args.number, args.repeat) * 1e6:.2f}us per request')
+
+
+if __name__ == '__main__':
+    main()
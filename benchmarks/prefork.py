@@ -0,0 +1,103 @@
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from collections import abc
+from typing import Any, Dict, List
+
+from openapi_type import parse_spec
+from openapi_type.prefork import freeze, parse_shared, unique_memory
+
+from benchmarks.generator import generate_spec, sizes
+
+
+MODES = ('plain', 'frozen')
+
+
+def walk(value: Any) -> int:
+    """ Visits every object of a parsed spec, as workers that serve requests eventually do
+    """
+    pending = [value]
+    count = 0
+    while pending:
+        x = pending.pop()
+        count += 1
+        if isinstance(x, abc.Mapping):
+            pending.extend(x.keys())
+            pending.extend(x.values())
+        elif isinstance(x, (tuple, list, frozenset)):
+            pending.extend(x)
+    return count
+
+
+def worker(spec: Any) -> Dict[str, int]:
+    """ Unique memory of a forked worker right after the fork, after a full collection, and after a walk
+    over the whole spec
+    """
+    gc.enable()
+    rv = {'forked': unique_memory() or 0}
+    gc.collect()
+    rv['collected'] = unique_memory() or 0
+    walk(spec)
+    rv['walked'] = unique_memory() or 0
+    return rv
+
+
+def run_mode(mode: str, size: int, workers: int) -> List[Dict[str, int]]:
+    data = generate_spec(size)
+    if mode == 'frozen':
+        spec = parse_shared(data)
+        del data
+        freeze()
+    else:
+        spec = parse_spec(data)
+        del data
+        gc.collect()
+
+    results = []
+    for _ in range(workers):
+        read, write = os.pipe()
+        pid = os.fork()
+        if not pid:
+            os.close(read)
+            os.write(write, json.dumps(worker(spec)).encode())
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as f:
+            results.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Unique memory (USS) of forked workers sharing a parsed spec '
+                                                 'with their parent, with and without openapi_type.prefork')
+    parser.add_argument('--sizes', default='1k,5k', help='Numbers of component schemas of generated specs.')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if unique_memory() is None or not hasattr(os, 'fork'):
+        sys.exit('Measuring unique memory requires Linux')
+    if args.mode:
+        # every mode runs in a fresh interpreter, since freezing cannot be undone for objects created before it
+        print(json.dumps(run_mode(args.mode, int(args.sizes), args.workers)))
+        return
+
+    for size in sizes(args.sizes.split(',')):
+        print(f'{size} schemas, USS per worker (MiB): after fork / after gc.collect() / after a walk over the spec')
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.prefork', '--mode', mode, '--sizes', str(size),
+                 '--workers', str(args.workers)],
+                check=True, capture_output=True, text=True,
+            )
+            results = json.loads(out.stdout)
+            mean = {k: sum(x[k] for x in results) / len(results) / 2 ** 20 for k in results[0]}
+            print(f'  {mode:<8} {mean["forked"]:>8.1f} {mean["collected"]:>8.1f} {mean["walked"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
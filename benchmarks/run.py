@@ -0,0 +1,143 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+from benchmarks.generator import generate_spec, sizes
+
+
+ROOT = Path(__file__).absolute().parent.parent
+EXAMPLE_DIRS = [
+    ROOT / 'specification' / 'examples' / 'v3.0',
+    ROOT / 'tests' / 'custom_examples',
+]
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t)
+    return {
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'runs': runs,
+    }
+
+
+def measure_import(repeat: int) -> Dict[str, Any]:
+    """ Every run imports the package in a fresh interpreter
+    """
+    code = ('import time; t = time.perf_counter(); import openapi_type; '
+            'print(time.perf_counter() - t)')
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True)
+        runs.append(float(out.stdout.strip()))
+    return {
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'runs': runs,
+    }
+
+
+def corpora(args: argparse.Namespace) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+    if not args.no_examples:
+        for d in EXAMPLE_DIRS:
+            for p in sorted(d.glob('*.json')):
+                with p.open() as f:
+                    yield f'example:{p.stem}', json.load(f)
+
+    for n in sizes(args.sizes.split(',')) if args.sizes else []:
+        yield (
+            f'synthetic:{n}:nesting={args.nesting}:refs={args.ref_density}:unions={args.union_ratio}',
+            generate_spec(n, nesting=args.nesting, ref_density=args.ref_density,
+                          union_ratio=args.union_ratio, seed=args.seed),
+        )
+
+
+def commit() -> str:
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True, capture_output=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+    return out.stdout.strip()
+
+
+def run(args: argparse.Namespace) -> Mapping[str, Any]:
+    from openapi_type import parse_spec, serialize_spec
+    from openapi_type.fingerprint import Fingerprints
+    from openapi_type.graph import DependencyGraph
+    from openapi_type.deref import DereferencedView
+
+    def dereference(spec: Any) -> None:
+        view = DereferencedView(spec)
+        for ref in view.resolver.index:
+            view[ref]
+        for template in spec.paths:
+            view.spec.paths[template]
+
+    results: List[Dict[str, Any]] = [
+        {'name': 'import', **measure_import(args.repeat)},
+    ]
+    for name, data in corpora(args):
+        oapi = parse_spec(data)
+        serialized = serialize_spec(oapi)
+        copy = parse_spec(serialized)
+        roundtrip_ok = copy == oapi
+        fingerprints = Fingerprints()
+        fingerprints.equal(copy, oapi)
+        results.extend([
+            {'name': f'{name}:parse_spec', **measure(lambda: parse_spec(data), args.repeat)},
+            {'name': f'{name}:serialize_spec', **measure(lambda: serialize_spec(oapi), args.repeat)},
+            {'name': f'{name}:roundtrip', 'ok': roundtrip_ok,
+             **measure(lambda: parse_spec(serialize_spec(oapi)) == oapi, args.repeat)},
+            {'name': f'{name}:equal', **measure(lambda: copy == oapi, args.repeat)},
+            {'name': f'{name}:fingerprint', **measure(lambda: Fingerprints().equal(copy, oapi), args.repeat)},
+            {'name': f'{name}:fingerprint_memoized', **measure(lambda: fingerprints.equal(copy, oapi), args.repeat)},
+            {'name': f'{name}:dependency_graph', **measure(lambda: DependencyGraph(oapi).order(), args.repeat)},
+            {'name': f'{name}:dereferenced_view', **measure(lambda: dereference(oapi), args.repeat)},
+        ])
+        print(f'{name}: done', file=sys.stderr)
+
+    return {
+        'meta': {
+            'commit': commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks of parse_spec and serialize_spec')
+    parser.add_argument('-o', '--output', help='Write JSON results to this file instead of stdout.')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--sizes', default='1k',
+                        help='Comma-separated numbers of schemas in synthetic specs, e.g. 1k,10k,100k. '
+                             'Empty string disables synthetic specs.')
+    parser.add_argument('--nesting', type=int, default=2)
+    parser.add_argument('--ref-density', type=float, default=0.3)
+    parser.add_argument('--union-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-examples', action='store_true', help='Skip bundled example specs.')
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Mapping
+
+
+ROOT = Path(__file__).absolute().parent.parent
+
+# Every scenario runs in a fresh interpreter and prints the seconds it took,
+# the interpreter start-up itself is not included.
+SCENARIOS: Mapping[str, str] = {
+    'import': (
+        'import time; t = time.perf_counter(); '
+        'import openapi_type; '
+        'print(time.perf_counter() - t)'
+    ),
+    'cli-version': (
+        'import time, io, contextlib; t = time.perf_counter(); '
+        'from openapi_type.cli import main\n'
+        'with contextlib.redirect_stdout(io.StringIO()):\n'
+        '    try: main(["--version"])\n'
+        '    except SystemExit: pass\n'
+        'print(time.perf_counter() - t)'
+    ),
+    'first-parse': (
+        'import time; t = time.perf_counter(); '
+        'from openapi_type import parse_spec; '
+        'parse_spec({"openapi": "3.0.0", "info": {"title": "", "version": ""}, "paths": {}}); '
+        'print(time.perf_counter() - t)'
+    ),
+}
+
+# Budgets in seconds for the median run. They are generous enough for slow CI machines,
+# and still fail when the schema graph or a heavy dependency is loaded at import time again.
+BUDGETS: Mapping[str, float] = {
+    'import': 0.08,
+    'cli-version': 0.20,
+    'first-parse': 0.35,
+}
+
+
+def measure(code: str, repeat: int) -> List[float]:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True)
+        runs.append(float(out.stdout.strip()))
+    return runs
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Measure start-up latency of openapi-type against time budgets')
+    parser.add_argument('-r', '--repeat', type=int, default=7)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply all budgets by this factor, e.g. on a machine known to be slow '
+                             '(default: %(default)s).')
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    print(f'{"scenario":<15} {"min":>8} {"median":>8} {"budget":>8}')
+    for name, code in SCENARIOS.items():
+        runs = measure(code, args.repeat)
+        median = statistics.median(runs)
+        budget = BUDGETS[name] * args.scale
+        mark = ''
+        if median > budget:
+            mark = ' !'
+            over_budget.append(name)
+        print(f'{name:<15} {min(runs):>8.4f} {median:>8.4f} {budget:>8.4f}{mark}')
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import random
+import re
+import statistics
+import time
+from typing import Any, Iterator, List, Tuple
+
+from openapi_type import (
+    OpenAPI, Reference, RequestBody, parse_spec,
+    StringValue, IntegerValue, FloatValue, BooleanValue,
+    ObjectValue, InlinedObjectValue, ObjectWithAdditionalProperties, ArrayValue,
+    ProductSchemaType, UnionSchemaTypeAny, UnionSchemaTypeOne,
+)
+from openapi_type.resolver import Resolver
+from openapi_type.validation import InvalidPayload, ValidatorCompiler
+
+from benchmarks.generator import generate_spec
+
+
+def validate_naive(schema: Any, value: Any, resolver: Resolver) -> None:
+    """ Walks the schema tree on every call, the way validation is done without compilation
+    """
+    if isinstance(schema, Reference):
+        return validate_naive(resolver.resolve(schema), value, resolver)
+    if isinstance(schema, StringValue):
+        if not isinstance(value, str):
+            raise InvalidPayload('Expected a string')
+        if schema.enum and value not in schema.enum:
+            raise InvalidPayload('Not in enum')
+        if schema.pattern is not None and re.search(schema.pattern, value) is None:
+            raise InvalidPayload('Does not match pattern')
+    elif isinstance(schema, IntegerValue):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise InvalidPayload('Expected an integer')
+        if schema.minimum is not None and value < schema.minimum:
+            raise InvalidPayload('Less than minimum')
+        if schema.maximum is not None and value > schema.maximum:
+            raise InvalidPayload('Greater than maximum')
+    elif isinstance(schema, FloatValue):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise InvalidPayload('Expected a number')
+    elif isinstance(schema, BooleanValue):
+        if not isinstance(value, bool):
+            raise InvalidPayload('Expected a boolean')
+    elif isinstance(schema, (ObjectValue, InlinedObjectValue)):
+        if not isinstance(value, dict):
+            raise InvalidPayload('Expected an object')
+        for name in schema.required:
+            if name not in value:
+                raise InvalidPayload('Missing required property')
+        for name, x in schema.properties.items():
+            if name in value:
+                validate_naive(x, value[name], resolver)
+    elif isinstance(schema, ObjectWithAdditionalProperties):
+        if not isinstance(value, dict):
+            raise InvalidPayload('Expected an object')
+        if schema.additional_properties is False and value:
+            raise InvalidPayload('Unexpected properties')
+        if schema.additional_properties not in (None, True, False):
+            for v in value.values():
+                validate_naive(schema.additional_properties, v, resolver)
+    elif isinstance(schema, ArrayValue):
+        if not isinstance(value, list):
+            raise InvalidPayload('Expected an array')
+        for item in value:
+            validate_naive(schema.items, item, resolver)
+    elif isinstance(schema, ProductSchemaType):
+        for x in schema.all_of:
+            validate_naive(x, value, resolver)
+    elif isinstance(schema, (UnionSchemaTypeAny, UnionSchemaTypeOne)):
+        variants = schema.any_of if isinstance(schema, UnionSchemaTypeAny) else schema.one_of
+        matched = 0
+        for x in variants:
+            try:
+                validate_naive(x, value, resolver)
+            except InvalidPayload:
+                continue
+            matched += 1
+        if not matched or (matched > 1 and isinstance(schema, UnionSchemaTypeOne)):
+            raise InvalidPayload('Does not match the union')
+
+
+class _TooDeep(Exception):
+    pass
+
+
+def sample(schema: Any, resolver: Resolver, rnd: random.Random, depth: int = 0) -> Any:
+    """ Generates a payload for ``schema``. Required properties are always present, optional ones
+    are present at random until the payload gets too deep. Raises ``_TooDeep`` for schemas
+    that require themselves through a chain of references.
+    """
+    if depth > 20:
+        raise _TooDeep
+    if isinstance(schema, Reference):
+        return sample(resolver.resolve(schema), resolver, rnd, depth)
+    if isinstance(schema, StringValue):
+        return rnd.choice(list(schema.enum)) if schema.enum else 'text'
+    if isinstance(schema, IntegerValue):
+        return max(schema.minimum or 0, 1)
+    if isinstance(schema, FloatValue):
+        return 1.5
+    if isinstance(schema, BooleanValue):
+        return True
+    if isinstance(schema, (ObjectValue, InlinedObjectValue)):
+        return {
+            name: sample(x, resolver, rnd, depth + 1)
+            for name, x in schema.properties.items()
+            if name in schema.required or (depth < 4 and rnd.random() < 0.5)
+        }
+    if isinstance(schema, ArrayValue):
+        return [sample(schema.items, resolver, rnd, depth + 1) for _ in range(3 if depth < 4 else 0)]
+    if isinstance(schema, ProductSchemaType):
+        rv = {}
+        for x in schema.all_of:
+            rv.update(sample(x, resolver, rnd, depth))
+        return rv
+    if isinstance(schema, UnionSchemaTypeAny):
+        return sample(schema.any_of[0], resolver, rnd, depth)
+    if isinstance(schema, UnionSchemaTypeOne):
+        return sample(schema.one_of[0], resolver, rnd, depth)
+    return {}
+
+
+def request_bodies(spec: OpenAPI) -> Iterator[Any]:
+    for item in spec.paths.values():
+        for operation in (item.post, item.put):
+            if operation is not None and isinstance(operation.request_body, RequestBody):
+                for media in operation.request_body.content.values():
+                    yield media.schema
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Compiled validators against naive tree-walking validation')
+    parser.add_argument('--schemas', type=int, default=300)
+    parser.add_argument('--ref-density', type=float, default=0.1,
+                        help='Payloads cannot be generated for schemas that require themselves through references, '
+                             'which is likely with dense references.')
+    parser.add_argument('--union-ratio', type=float, default=0.0,
+                        help='Unions of generated specs are not necessarily satisfiable by sampled payloads, '
+                             'so they are disabled by default.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-n', '--number', type=int, default=100, help='Validations of every payload per run.')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    spec = parse_spec(generate_spec(args.schemas, ref_density=args.ref_density, union_ratio=args.union_ratio,
+                                    seed=args.seed))
+    resolver = Resolver(spec)
+    rnd = random.Random(args.seed)
+    cases: List[Tuple[Any, Any]] = []
+    for schema in request_bodies(spec):
+        try:
+            cases.append((schema, sample(schema, resolver, rnd)))
+        except _TooDeep:
+            pass
+
+    t = time.perf_counter()
+    compiler = ValidatorCompiler(spec, resolver)
+    compiled = [(compiler.compile(schema), payload) for schema, payload in cases]
+    print(f'{len(cases)} request bodies with payloads, compiled in {time.perf_counter() - t:.4f}s')
+
+    def run_naive() -> None:
+        for schema, payload in cases:
+            for _ in range(args.number):
+                validate_naive(schema, payload, resolver)
+
+    def run_compiled() -> None:
+        for validate, payload in compiled:
+            for _ in range(args.number):
+                validate(payload)
+
+    for name, fn in [('naive', run_naive), ('compiled', run_compiled)]:
+        runs = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - t)
+        print(f'{name:<10} min {min(runs):.4f}s, median {statistics.median(runs):.4f}s')
+
+
+if __name__ == '__main__':
+    main()
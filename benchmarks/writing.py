@@ -0,0 +1,62 @@
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from openapi_type import OpenAPI, parse_spec, serialize_spec
+from openapi_type.writing import _yaml_dump, write_json, write_yaml
+
+from benchmarks.generator import generate_spec, sizes
+
+
+def measure(fn: Callable[[Any], None]) -> Tuple[float, int]:
+    """ Returns the time of ``fn(stream)`` writing to /dev/null, and the peak of memory allocated by it.
+    The peak is measured in a separate run, since tracing allocations slows the writers down considerably.
+    """
+    gc.collect()
+    with open(os.devnull, 'w') as stream:
+        t = time.perf_counter()
+        fn(stream)
+        elapsed = time.perf_counter() - t
+        gc.collect()
+        tracemalloc.start()
+        fn(stream)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def cases(spec: OpenAPI, yaml: bool) -> List[Tuple[str, Callable[[Any], None]]]:
+    rv: List[Tuple[str, Callable[[Any], None]]] = [
+        ('serialize_spec + json.dump', lambda f: json.dump(serialize_spec(spec), f, sort_keys=True)),
+        ('serialize_spec + json.dumps', lambda f: f.write(json.dumps(serialize_spec(spec), sort_keys=True))),
+        ('write_json', lambda f: write_json(spec, f)),
+    ]
+    if yaml:
+        dump = _yaml_dump()
+        rv += [
+            ('serialize_spec + yaml.dump', lambda f: f.write(dump(serialize_spec(spec)))),
+            ('write_yaml', lambda f: write_yaml(spec, f)),
+        ]
+    return rv
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Peak memory of streaming spec writers against serialize_spec')
+    parser.add_argument('--sizes', default='200,1k', help='Numbers of component schemas of generated specs.')
+    parser.add_argument('--no-yaml', action='store_true')
+    args = parser.parse_args(argv)
+
+    for size in sizes(args.sizes.split(',')):
+        spec = parse_spec(generate_spec(size))
+        print(f'{size} schemas')
+        for name, fn in cases(spec, not args.no_yaml):
+            elapsed, peak = measure(fn)
+            print(f'  {name:<28} {elapsed:.3f}s, peak {peak / 2 ** 20:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
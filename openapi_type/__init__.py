@@ -1,16 +1,17 @@
 from enum import Enum
+from functools import lru_cache
 
 from typing import Literal, NewType
 from typing import Mapping
-from typing import Any, NamedTuple, Optional, Sequence, FrozenSet, Union
+from typing import Any, Callable, NamedTuple, Optional, Sequence, FrozenSet, Tuple, Union
 
 from pyrsistent import pmap, pvector
 from pyrsistent.typing import PVector, PMap
 
-from .custom_types import *
+from .values import *
 
 
-__all__ = ('parse_spec', 'serialize_spec', 'OpenAPI')
+__all__ = ('parse_spec', 'serialize_spec', 'OpenAPI', 'dispatch_stats', 'InternPool')
 
 
 class IntegerValue(NamedTuple):
@@ -314,4 +315,71 @@ overrides = {
 }
 
 
-parse_spec, serialize_spec = TypeGenerator & overrides ^ OpenAPI
+dispatch_stats = DispatchStats()
+""" Shows how often ``SchemaType`` and other unions of structures could not be resolved
+by the keys of their data and had to fall back to the ordered trial of variants.
+"""
+
+
+@lru_cache(maxsize=None)
+def _type_tools() -> Tuple[Callable[[Mapping[str, Any]], OpenAPI], Callable[[OpenAPI], Mapping[str, Any]], Any]:
+    """ Builds the parser, the serializer and the root of their schema graph on first use,
+    so that importing the package does not pay for typeit and the graph construction.
+    """
+    from .custom_types import TypeGenerator, install_canonical_sets, install_dispatch, install_interning
+    from .custom_types import install_single_pass_mappings
+
+    parser, serializer = TypeGenerator & overrides ^ OpenAPI
+    spec_node = parser.args[0].__self__
+    install_dispatch(spec_node, dispatch_stats)
+    install_interning(spec_node)
+    install_canonical_sets(spec_node)
+    install_single_pass_mappings(spec_node)
+    return parser, serializer, spec_node
+
+
+def _spec_node() -> Any:
+    """ Root of the schema graph behind ``parse_spec`` and ``serialize_spec``
+    """
+    return _type_tools()[2]
+
+
+def _parse_spec(data: Mapping[str, Any]) -> OpenAPI:
+    return _type_tools()[0](data)
+
+
+def parse_spec(data: Mapping[str, Any], workers: int = 1, pool: Optional[InternPool] = None,
+               compact: bool = False) -> OpenAPI:
+    """ Parses a spec represented as Python data (as loaded from JSON or YAML).
+
+    :param workers: when greater than 1, ``paths`` and ``components.schemas`` are parsed
+                    in chunks across a pool of that many processes.
+    :param pool: interning pool shared with other parses; by default every parse uses its own pool.
+    :param compact: returns the spec in the form of ``openapi_type.compact.compact``, which is equal to it
+                    and takes less memory, at the cost of a longer parse.
+    """
+    with interning(InternPool() if pool is None else pool):
+        if workers > 1:
+            from .parallel import parse_parallel
+            spec = parse_parallel(data, workers)
+        else:
+            spec = _parse_spec(data)
+    if compact:
+        from .compact import compact as compact_spec
+        return compact_spec(spec)
+    return spec
+
+
+def serialize_spec(spec: OpenAPI) -> Mapping[str, Any]:
+    """ Converts a spec back to Python data suitable for JSON or YAML
+    """
+    return _type_tools()[1](spec)
+
+
+def __getattr__(name: str) -> Any:
+    """ ``TypeGenerator`` is still available from the package, but imported on first access, since it loads typeit
+    """
+    if name == 'TypeGenerator':
+        from .custom_types import TypeGenerator
+        return TypeGenerator
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+
+from typeit.schema.errors import errors_aware_constructor
+
+from . import OpenAPI, parse_spec, serialize_spec
+from .parallel import LocatedError, ParseError, _chunk_node, _chunks, _join, _parse_chunk, _split
+from .values import InternPool
+from .writing import _skeleton
+
+
+__all__ = ('parse_spec_async', 'serialize_spec_async')
+
+
+T = TypeVar('T')
+
+
+async def parse_spec_async(data: Mapping[str, Any],
+                           executor: Optional[Executor] = None,
+                           chunk_size: Optional[int] = None,
+                           pool: Optional[InternPool] = None) -> OpenAPI:
+    """ ``parse_spec`` that runs in ``executor``, a thread or a process pool, instead of the event loop;
+    by default in the default executor of the running loop. The result is equal to the one of ``parse_spec(data)``.
+
+    Without ``chunk_size``, the spec is parsed with a single call of the executor, and cancelling the task
+    leaves that call to finish in the background. With ``chunk_size``, entries of ``paths``
+    and ``components.schemas`` are parsed in chunks of that many entries, one chunk at a time,
+    so cancelling stops the parse after the current chunk and the event loop gets to run other tasks
+    between the chunks. Invalid entries are then reported with ``ParseError``, as with ``parse_spec(data, workers=N)``.
+
+    :param pool: interning pool shared with other parses; process pools intern values of every chunk separately.
+    """
+    run = _runner(executor)
+    if isinstance(executor, ProcessPoolExecutor):
+        pool = None
+    elif pool is None:
+        pool = InternPool()
+    split = None if chunk_size is None else _split(data)
+    if split is None:
+        return await run(partial(parse_spec, data, pool=pool))
+    assert chunk_size is not None
+    skeleton, sections = split
+
+    spec = await run(partial(parse_spec, skeleton, pool=pool))
+    parsed: Dict[str, Dict[str, Any]] = {}
+    errors: List[LocatedError] = []
+    for kind, raw in sections.items():
+        parsed[kind] = {}
+        for chunk in _chunks(raw, chunk_size):
+            chunk_parsed, chunk_errors = await run(partial(_parse_chunk, kind, chunk, pool))
+            parsed[kind].update(chunk_parsed)
+            errors.extend(chunk_errors)
+    if errors:
+        raise ParseError(errors, data)
+    return _join(spec, parsed)
+
+
+async def serialize_spec_async(spec: OpenAPI,
+                               executor: Optional[Executor] = None,
+                               chunk_size: Optional[int] = None) -> Mapping[str, Any]:
+    """ ``serialize_spec`` that runs in ``executor`` instead of the event loop, with the same chunking
+    and cancellation as ``parse_spec_async``. The result is equal to the one of ``serialize_spec(spec)``.
+    """
+    run = _runner(executor)
+    if chunk_size is None:
+        return await run(partial(serialize_spec, spec))
+
+    rv: Any = await run(partial(serialize_spec, _skeleton(spec)))
+    sections: List[Tuple[str, Mapping[str, Any], Dict[str, Any]]] = [('paths', spec.paths, rv['paths'])]
+    if spec.components is not None:
+        sections.append(('schemas', spec.components.schemas, rv['components']['schemas']))
+    for kind, items, target in sections:
+        for chunk in _chunks(items, chunk_size):
+            target.update(await run(partial(_serialize_chunk, kind, chunk)))
+    return rv
+
+
+def _runner(executor: Optional[Executor]) -> Callable[[Callable[[], T]], 'asyncio.Future[T]']:
+    loop = asyncio.get_running_loop()
+    return partial(loop.run_in_executor, executor)
+
+
+def _serialize_chunk(kind: str, items: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+    node = _chunk_node(kind)
+    return [(key, errors_aware_constructor(node.serialize, value)) for key, value in items]
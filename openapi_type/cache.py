@@ -0,0 +1,115 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from . import OpenAPI, parse_spec
+
+
+__all__ = ('SpecCache',)
+
+
+SNAPSHOT_SUFFIX = '.oapi'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _library_version() -> str:
+    from importlib.metadata import version, PackageNotFoundError
+    from .info import DISTRIBUTION_NAME
+    try:
+        return version(DISTRIBUTION_NAME)
+    except PackageNotFoundError:
+        return ''
+
+
+class SpecCache:
+    """ Content-addressed on-disk cache of parsed specs.
+
+    Snapshots are keyed by a hash of the raw spec bytes and the library version, so that a cache directory
+    can be shared between releases. On a hit the ``OpenAPI`` value is loaded from a binary snapshot
+    without running the parser again. The least recently used snapshots are evicted
+    once the total size of the directory exceeds ``max_bytes``.
+
+    Snapshots are pickles, therefore the cache directory should be writable by trusted users only.
+    """
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.version = _library_version()
+
+    def key(self, raw: bytes) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(self.version.encode())
+        h.update(b'\0')
+        h.update(raw)
+        return h.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f'{key}{SNAPSHOT_SUFFIX}'
+
+    def get(self, raw: bytes) -> Optional[OpenAPI]:
+        """ Returns a cached spec for the given raw input, or None if there is no usable snapshot
+        """
+        path = self.path(self.key(raw))
+        try:
+            with path.open('rb') as f:
+                spec = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # a truncated or otherwise unreadable snapshot is a cache miss
+            path.unlink(missing_ok=True)
+            return None
+        if not isinstance(spec, OpenAPI):
+            path.unlink(missing_ok=True)
+            return None
+        # mark as recently used
+        os.utime(path)
+        return spec
+
+    def put(self, raw: bytes, spec: OpenAPI) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+            path = self.path(self.key(raw))
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """ Removes the least recently used snapshots until the cache fits into ``max_bytes``.
+        The snapshot at ``keep`` is never removed.
+        """
+        entries = []
+        for p in self.directory.glob(f'*{SNAPSHOT_SUFFIX}'):
+            if p == keep:
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        if keep is not None:
+            total += keep.stat().st_size
+        for _, size, p in sorted(entries, key=lambda x: x[0]):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def parse(self, raw: bytes, load: Callable[[bytes], Any]) -> OpenAPI:
+        """ Returns a cached spec for ``raw``, or parses ``load(raw)`` and caches the result
+        """
+        spec = self.get(raw)
+        if spec is None:
+            spec = parse_spec(load(raw))
+            self.put(raw, spec)
+        return spec
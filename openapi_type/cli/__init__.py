@@ -1,16 +1,16 @@
 import argparse
 import sys
 
-from pkg_resources import get_distribution
+from importlib.metadata import version
 
-from . import check
+from . import check, diff
 from ..info import DISTRIBUTION_NAME
 
 
 def main(args=None, in_channel=sys.stdin, out_channel=sys.stdout):
     parser = argparse.ArgumentParser(description='OpenAPI Type')
     parser.add_argument('-V', '--version', action='version',
-                        version=f'{DISTRIBUTION_NAME} {get_distribution(DISTRIBUTION_NAME).version}')
+                        version=f'{DISTRIBUTION_NAME} {version(DISTRIBUTION_NAME)}')
     subparsers = parser.add_subparsers(title='sub-commands',
                                        description='valid sub-commands',
                                        help='additional help',
@@ -21,6 +21,7 @@ def main(args=None, in_channel=sys.stdin, out_channel=sys.stdout):
     # $ <cmd> gen
     # ---------------------------
     check.setup(subparsers)
+    diff.setup(subparsers)
 
     # Parse arguments and config
     # --------------------------
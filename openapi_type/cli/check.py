@@ -1,11 +1,21 @@
 import argparse
+import glob
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import Mapping
+from typing import Any, Dict, Iterator, List, Mapping, Optional
 from itertools import islice
 
 from openapi_type import parse_spec
+from openapi_type.cache import SpecCache, DEFAULT_MAX_BYTES
+from .load import EXTENSIONS, IncrementalLoader, load_data, read_source
+
+
+SPEC_SUFFIXES = frozenset(EXTENSIONS)
 
 
 def is_empty_dir(p: Path) -> bool:
@@ -16,6 +26,26 @@ def setup(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
     sub = subparsers.add_parser('check', help='Check whether a provided schema (JSON, YAML) can be parsed.')
     sub.add_argument('-s', '--source', help="Path to a spec (JSON, YAML). "
                                             "If not specified, then the data will be read from stdin.")
+    sub.add_argument('sources', nargs='*', metavar='PATH',
+                     help="Spec files, directories (searched recursively for *.json, *.yaml, *.yml) or glob patterns. "
+                          "Results are reported as one JSON object per line, and the command fails "
+                          "if any of the specs cannot be parsed.")
+    sub.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                     help="Number of worker processes for checking multiple specs (default: %(default)s).")
+    sub.add_argument('--timings', action='store_true',
+                     help="Report the time spent on loading JSON/YAML data separately from the time spent on parsing.")
+    sub.add_argument('--cache-dir', help="Directory for caching parsed specs between runs. "
+                                         "Caching is disabled if not specified.")
+    sub.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                     help="Maximum size of the cache directory, in megabytes (default: %(default)s).")
+    sub.add_argument('-w', '--watch', action='store_true',
+                     help="Keep checking the spec given with --source every time it is saved, re-parsing only "
+                          "the entries of paths and components that changed, and report the time every check took.")
+    sub.add_argument('--interval', type=float, default=0.2,
+                     help="How often to look for changes of the watched spec, in seconds (default: %(default)s).")
+    sub.add_argument('--profile', action='store_true',
+                     help="Report call counts, time and memory allocations of the parser, ranked by the types "
+                          "of the parsed data and by the locations in the spec.")
     sub.set_defaults(run_cmd=main)
     return sub
 
@@ -23,31 +53,203 @@ def setup(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
 def main(args: argparse.Namespace, in_channel=sys.stdin, out_channel=sys.stdout) -> None:
     """ $ <cmd-prefix> gen <source> <target>
     """
-    try:
-        with Path(args.source).open('r') as f:
-            python_data = _read_data(f)
-    except TypeError:
-        # source is None, read from stdin
-        python_data = _read_data(in_channel)
+    if args.watch:
+        if not args.source or Path(args.source).is_dir() or args.sources:
+            sys.exit('--watch requires a single spec file given with --source')
+        watch(Path(args.source), out_channel, args.interval)
+        return
+
+    if args.sources or (args.source and Path(args.source).is_dir()):
+        sources = args.sources + ([args.source] if args.source else [])
+        failed = check_batch(sources, args, out_channel)
+        if failed:
+            sys.exit(1)
+        return
 
-    _spec = parse_spec(python_data)
+    t = time.perf_counter()
+    if args.source:
+        buf = read_source(Path(args.source))
+    else:
+        buf = getattr(in_channel, 'buffer', in_channel).read()
+        if isinstance(buf, str):
+            buf = buf.encode('utf-8')
+
+    timings = _Timings(t)
+    load = partial(timings.load, filename=args.source)
+    report = None
+    if args.profile:
+        # imported here, since typeit is loaded by the parser only when a spec is actually parsed
+        from openapi_type.profiling import profile
+
+        data = load(buf)
+        with profile() as p:
+            _spec = parse_spec(data)
+        report = p.report()
+    elif args.cache_dir:
+        cache = SpecCache(Path(args.cache_dir), max_bytes=args.cache_size * 1024 * 1024)
+        _spec = cache.parse(buf, load)
+    else:
+        _spec = parse_spec(load(buf))
+    timings.done()
 
     out_channel.write('Successfully parsed.\n')
+    if args.timings:
+        out_channel.write(f'{timings}\n')
+    if report is not None:
+        out_channel.write(report)
+
+
+class _Timings:
+    """ Splits the time since ``started`` into loading data and parsing it
+    """
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.loaded: Optional[float] = None
+        self.finished = started
+
+    def load(self, buf: bytes, filename: Optional[str] = None) -> Mapping:
+        rv = load_data(buf, filename)
+        self.loaded = time.perf_counter()
+        return rv
+
+    def done(self) -> None:
+        self.finished = time.perf_counter()
+
+    def asdict(self) -> Dict[str, float]:
+        rv = {'seconds': self.finished - self.started}
+        if self.loaded is not None:
+            rv['load_seconds'] = self.loaded - self.started
+            rv['parse_seconds'] = self.finished - self.loaded
+        return rv
+
+    def __str__(self) -> str:
+        if self.loaded is None:
+            return f'Loaded from cache in {self.finished - self.started:.3f}s.'
+        return (f'Loaded in {self.loaded - self.started:.3f}s, '
+                f'parsed in {self.finished - self.loaded:.3f}s.')
+
+
+def expand_sources(sources: List[str]) -> Iterator[Path]:
+    """ Expands directories and glob patterns into paths of spec files
+    """
+    for source in sources:
+        p = Path(source)
+        if p.is_dir():
+            yield from sorted(x for x in p.rglob('*') if x.suffix in SPEC_SUFFIXES and x.is_file())
+        elif p.exists() or not glob.has_magic(source):
+            yield p
+        else:
+            yield from sorted(Path(x) for x in glob.iglob(source, recursive=True) if Path(x).is_file())
 
 
-def _read_data(fd) -> Mapping:
-    buf = fd.read()  # because stdin does not support seek and we want to try both json and yaml parsing
+def _error_locations(e: Exception) -> List[Dict[str, Any]]:
+    # imported here, since typeit is loaded by the parser only when a spec is actually parsed
+    from typeit.schema.errors import Error
+    from openapi_type.parallel import ParseError
+    from openapi_type.pointer import invalid_pointers
+
+    if isinstance(e, ParseError):
+        return [{'pointer': x.pointer, 'reason': x.reason} for x in e]
+    if isinstance(e, Error):
+        return [{'pointer': pointer, 'reason': reason}
+                for pointer, reason in invalid_pointers(e.validation_error, e.sample_data)]
+    return [{'pointer': '', 'reason': f'{type(e).__name__}: {e}'}]
+
+
+def _check_file(path: str, cache_dir: Optional[str], cache_size: int) -> Dict[str, Any]:
+    """ Runs in worker processes; the parser is built once per worker, on the first check
+    """
+    rv: Dict[str, Any] = {'source': path, 'ok': False}
+    timings = _Timings(time.perf_counter())
+    load = partial(timings.load, filename=path)
+    try:
+        buf = read_source(Path(path))
+        if cache_dir:
+            SpecCache(Path(cache_dir), max_bytes=cache_size * 1024 * 1024).parse(buf, load)
+        else:
+            parse_spec(load(buf))
+    except Exception as e:
+        rv['errors'] = _error_locations(e)
+    else:
+        rv['ok'] = True
+    timings.done()
+    rv.update(timings.asdict())
+    return rv
+
+
+def check_batch(sources: List[str], args: argparse.Namespace, out_channel) -> int:
+    """ Checks specs across a pool of worker processes, writing one JSON line per spec as soon as it is checked.
+    Returns the number of specs that failed the check.
+    """
+    failed = 0
+
+    def report(result: Mapping[str, Any]) -> None:
+        nonlocal failed
+        failed += not result['ok']
+        out_channel.write(json.dumps(result) + '\n')
+        out_channel.flush()
+
+    paths = []
+    for source in sources:
+        matched = list(expand_sources([source]))
+        if not matched:
+            reason = 'empty directory' if is_empty_dir(Path(source)) else 'no spec files found'
+            report({'source': source, 'ok': False, 'errors': [{'pointer': '', 'reason': reason}]})
+        for p in matched:
+            if p.is_file():
+                paths.append(str(p))
+            else:
+                report({'source': str(p), 'ok': False, 'errors': [{'pointer': '', 'reason': 'no such file'}]})
+
+    if paths:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(paths)))) as pool:
+            futures = [pool.submit(_check_file, p, args.cache_dir, args.cache_size) for p in paths]
+            for future in as_completed(futures):
+                report(future.result())
+    return failed
+
+
+def watch(path: Path, out_channel, interval: float, runs: Optional[int] = None) -> None:
+    """ Checks the spec whenever its modification time or size changes, until interrupted
+    or until it is checked ``runs`` times
+    """
+    # imported here, since typeit is loaded by the parser only when a spec is actually parsed
+    from openapi_type.incremental import IncrementalParser
+
+    loader = IncrementalLoader(str(path))
+    parser = IncrementalParser()
+    seen = None
     try:
-        struct = json.loads(buf)
-    except ValueError:
-        try:
-            import yaml
-        except ImportError:
-            raise RuntimeError(
-                "Could not parse data as JSON, and could not locate PyYAML library "
-                "to try to parse the data as YAML. You can either install PyYAML as a separate "
-                "dependency, or use the `third_party` extra tag:\n\n"
-                "$ pip install openapi-client-generator[third_party]"
-            )
-        struct = yaml.full_load(buf)
-    return struct
+        while runs is None or runs > 0:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stat = None
+            version = stat and (stat.st_mtime_ns, stat.st_size)
+            if version is None or version == seen:
+                time.sleep(interval)
+                continue
+            seen = version
+            runs = None if runs is None else runs - 1
+
+            started = time.perf_counter()
+            try:
+                data = loader.load(read_source(path))
+                loaded = time.perf_counter()
+                parser.parse(data)
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                out_channel.write(f'Failed in {elapsed * 1000:.1f} ms:\n')
+                out_channel.write(''.join(f'  {x["pointer"] or "/"}: {x["reason"]}\n' for x in _error_locations(e)))
+            else:
+                finished = time.perf_counter()
+                stats = parser.stats
+                out_channel.write(
+                    f'Successfully parsed in {(finished - started) * 1000:.1f} ms '
+                    f'(loaded in {(loaded - started) * 1000:.1f} ms{", partially" if loader.partial else ""}, '
+                    f'parsed in {(finished - loaded) * 1000:.1f} ms), '
+                    f're-parsed {stats.reparsed} of {stats.total} entries.\n'
+                )
+            out_channel.flush()
+    except KeyboardInterrupt:
+        pass
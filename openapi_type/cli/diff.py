@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from openapi_type import parse_spec
+from .load import load_data, read_source
+
+
+def setup(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    sub = subparsers.add_parser('diff', help='List changes between two versions of a spec (JSON, YAML), '
+                                             'and whether they break clients of the old version.')
+    sub.add_argument('old', metavar='OLD', help="Path to the old version of the spec.")
+    sub.add_argument('new', metavar='NEW', help="Path to the new version of the spec.")
+    sub.add_argument('--breaking-only', action='store_true', help="Report breaking changes only.")
+    sub.add_argument('--json', action='store_true',
+                     help="Report changes as one JSON object per line, rather than as text.")
+    sub.add_argument('--fail-on-breaking', action='store_true',
+                     help="Exit with status 1 if any of the changes are breaking.")
+    sub.set_defaults(run_cmd=main)
+    return sub
+
+
+def main(args: argparse.Namespace, in_channel=sys.stdin, out_channel=sys.stdout) -> None:
+    """ $ <cmd-prefix> diff <old> <new>
+    """
+    # imported here, since typeit is loaded by the parser only when a spec is actually parsed
+    from openapi_type.diff import diff_specs
+
+    old, new = (parse_spec(load_data(read_source(Path(x)), x)) for x in (args.old, args.new))
+    changes = diff_specs(old, new)
+    breaking = False
+    for change in changes:
+        breaking |= change.breaking
+        if args.breaking_only and not change.breaking:
+            continue
+        if args.json:
+            out_channel.write(json.dumps({
+                'kind': change.kind.value,
+                'pointer': change.pointer,
+                'breaking': change.breaking,
+                'message': change.message,
+            }) + '\n')
+        else:
+            out_channel.write(f'{change}\n')
+    if breaking and args.fail_on_breaking:
+        sys.exit(1)
@@ -0,0 +1,244 @@
+import json
+import re
+from bisect import bisect_right
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+
+__all__ = ('DataFormat', 'sniff_format', 'load_data', 'read_source', 'IncrementalLoader')
+
+
+class DataFormat(Enum):
+    JSON = 'json'
+    YAML = 'yaml'
+
+
+EXTENSIONS: Mapping[str, DataFormat] = {
+    '.json': DataFormat.JSON,
+    '.yaml': DataFormat.YAML,
+    '.yml': DataFormat.YAML,
+}
+
+UTF8_BOM = b'\xef\xbb\xbf'
+_leading_space = re.compile(rb'\s*')
+
+
+def sniff_format(buf: bytes, filename: Optional[str] = None) -> DataFormat:
+    """ Detects the format by the file extension, or by the first non-whitespace byte of the data:
+    JSON documents start with an object or an array.
+    """
+    if filename:
+        fmt = EXTENSIONS.get(Path(filename).suffix.lower())
+        if fmt is not None:
+            return fmt
+    start = len(UTF8_BOM) if buf.startswith(UTF8_BOM) else 0
+    start = _leading_space.match(buf, start).end()  # type: ignore
+    if buf[start:start + 1] in (b'{', b'['):
+        return DataFormat.JSON
+    return DataFormat.YAML
+
+
+def _load_yaml(buf: bytes) -> Any:
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(
+            "Could not parse data as JSON, and could not locate PyYAML library "
+            "to try to parse the data as YAML. You can either install PyYAML as a separate "
+            "dependency, or use the `third_party` extra tag:\n\n"
+            "$ pip install openapi-client-generator[third_party]"
+        )
+    # libyaml-based loader is an order of magnitude faster than the pure-Python one
+    loader = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+    return yaml.load(buf, Loader=loader)
+
+
+def load_data(buf: bytes, filename: Optional[str] = None) -> Mapping:
+    """ Loads JSON or YAML data. The format is detected up front, see ``sniff_format``.
+    """
+    if sniff_format(buf, filename) is DataFormat.JSON:
+        try:
+            return json.loads(buf)
+        except ValueError:
+            # YAML flow mappings look like JSON too
+            pass
+    return _load_yaml(buf)
+
+
+def read_source(path: Path) -> bytes:
+    """ Reads the whole file with a single bulk read
+    """
+    with path.open('rb', buffering=0) as f:
+        return f.readall()
+
+
+Location = Tuple[str, ...]
+
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+class IncrementalLoader:
+    """ Loads successive versions of a spec file, e.g. as it is being edited.
+    UTF-8 JSON documents are scanned once for the locations of the entries of ``paths`` and the members
+    of ``components`` sections; if the bytes of a new version differ from the previous one within
+    a single such entry, only that entry is decoded, and the rest of the data is shared with the previous
+    version by identity. Any other change, and YAML documents, are loaded in full.
+    """
+    def __init__(self, filename: Optional[str] = None) -> None:
+        self.filename = filename
+        self.partial = False
+        """ Whether the last version was loaded by decoding a single entry
+        """
+        self._buf: Optional[bytes] = None
+        self._data: Any = None
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._locations: List[Location] = []
+
+    def load(self, buf: bytes) -> Mapping:
+        self.partial = False
+        if self._buf is not None:
+            rv = self._update(buf)
+            if rv is not None:
+                self.partial = True
+                return rv
+        self._buf = None
+        if sniff_format(buf, self.filename) is not DataFormat.JSON:
+            return load_data(buf, self.filename)
+        encoding = json.detect_encoding(buf)
+        text = buf.decode(encoding, 'surrogatepass')
+        try:
+            spans: List[Tuple[int, int, Location]] = []
+            data = _scan(text, spans)
+        except ValueError:
+            # let the regular loader report the error or fall back to YAML
+            return load_data(buf, self.filename)
+        if encoding in ('utf-8', 'utf-8-sig'):
+            self._index(buf, text, spans)
+        self._data = data
+        return data
+
+    def _index(self, buf: bytes, text: str, spans: List[Tuple[int, int, Location]]) -> None:
+        """ Remembers the spans of the entries in bytes
+        """
+        offset = len(buf) - len(text.encode('utf-8', 'surrogatepass'))  # BOM
+        position = 0
+        self._starts, self._ends, self._locations = [], [], []
+        for start, end, location in spans:
+            offset += len(text[position:start].encode('utf-8', 'surrogatepass'))
+            self._starts.append(offset)
+            offset += len(text[start:end].encode('utf-8', 'surrogatepass'))
+            self._ends.append(offset)
+            self._locations.append(location)
+            position = end
+        self._buf = buf
+
+    def _update(self, buf: bytes) -> Optional[Mapping]:
+        old = self._buf
+        assert old is not None
+        if buf == old:
+            return self._data
+        prefix = _common_prefix(old, buf)
+        suffix = _common_suffix(old, buf, min(len(old), len(buf)) - prefix)
+        delta = len(buf) - len(old)
+
+        i = bisect_right(self._starts, prefix) - 1
+        if i < 0 or len(old) - suffix > self._ends[i]:
+            return None
+        start, end = self._starts[i], self._ends[i] + delta
+        try:
+            text = buf[start:end].decode('utf-8', 'surrogatepass')
+            value, decoded = _decoder.raw_decode(text)
+        except ValueError:
+            return None
+        if decoded != len(text):
+            return None
+
+        self._buf = buf
+        self._ends[i] = end
+        self._starts[i + 1:] = [x + delta for x in self._starts[i + 1:]]
+        self._ends[i + 1:] = [x + delta for x in self._ends[i + 1:]]
+        self._data = _replaced(self._data, self._locations[i], value)
+        return self._data
+
+
+def _common_prefix(a: bytes, b: bytes, chunk: int = 1 << 16) -> int:
+    """ Compares chunks of decreasing sizes, so that few slices are made
+    """
+    i = 0
+    n = min(len(a), len(b))
+    while chunk:
+        while i + chunk <= n and a[i:i + chunk] == b[i:i + chunk]:
+            i += chunk
+        chunk >>= 1
+    return i
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int, chunk: int = 1 << 16) -> int:
+    """ Length of the common suffix, up to ``limit``
+    """
+    i = 0
+    while chunk:
+        while i + chunk <= limit and a[len(a) - i - chunk:len(a) - i] == b[len(b) - i - chunk:len(b) - i]:
+            i += chunk
+        chunk >>= 1
+    return i
+
+
+def _replaced(data: Mapping, location: Location, value: Any) -> Mapping:
+    """ Shallow copies of mappings along the location, with the value at the location replaced
+    """
+    key, *rest = location
+    return {**data, key: _replaced(data[key], tuple(rest), value) if rest else value}
+
+
+_SPLIT: Mapping[Location, bool] = {
+    (): False,
+    ('paths',): True,
+    ('components',): False,
+    **{('components', x): True for x in ('schemas', 'links', 'parameters', 'responses', 'headers',
+                                         'requestBodies', 'securitySchemes')},
+}
+""" Objects that are scanned for the spans of their members, and whether the members are entries
+that are decoded as a whole
+"""
+
+
+def _scan(text: str, spans: List[Tuple[int, int, Location]]) -> Any:
+    i = _whitespace.match(text, 0).end()  # type: ignore
+    value, i = _scan_value(text, i, (), spans)
+    if _whitespace.match(text, i).end() != len(text):  # type: ignore
+        raise json.JSONDecodeError('Extra data', text, i)
+    return value
+
+
+def _scan_value(text: str, i: int, location: Location, spans: List[Tuple[int, int, Location]]) -> Tuple[Any, int]:
+    split = _SPLIT.get(location)
+    if split is None or not text.startswith('{', i):
+        return _decoder.raw_decode(text, i)
+    rv: Dict[str, Any] = {}
+    i = _whitespace.match(text, i + 1).end()  # type: ignore
+    if text.startswith('}', i):
+        return rv, i + 1
+    while True:
+        if not text.startswith('"', i):
+            raise json.JSONDecodeError('Expecting property name enclosed in double quotes', text, i)
+        key, i = json.decoder.scanstring(text, i + 1)  # type: ignore
+        i = _whitespace.match(text, i).end()  # type: ignore
+        if not text.startswith(':', i):
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, i)
+        start = _whitespace.match(text, i + 1).end()  # type: ignore
+        if split:
+            rv[key], i = _decoder.raw_decode(text, start)
+            spans.append((start, i, location + (key,)))
+        else:
+            rv[key], i = _scan_value(text, start, location + (key,), spans)
+        i = _whitespace.match(text, i).end()  # type: ignore
+        if text.startswith('}', i):
+            return rv, i + 1
+        if not text.startswith(',', i):
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, i)
+        i = _whitespace.match(text, i + 1).end()  # type: ignore
@@ -0,0 +1,120 @@
+from collections import abc
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Tuple, TypeVar
+
+from .fingerprint import Fingerprints, _rebuild
+
+
+__all__ = ('CompactMap', 'compact', 'MAX_COMPACT_ITEMS')
+
+
+T = TypeVar('T')
+
+MAX_COMPACT_ITEMS = 8
+""" Larger mappings, such as ``paths`` and ``components.schemas``, stay dicts for constant time lookups
+"""
+
+
+class CompactMap(abc.Mapping):
+    """ Immutable mapping that keeps its keys and values in two tuples, rather than in a hash table.
+    Maps with the same keys in the same order share the tuple of keys. Lookups scan the keys,
+    so it is meant for small maps, such as properties of schemas and responses of operations.
+    Equal to any mapping with the same items, including dicts.
+    """
+    __slots__ = ('_keys', '_values')
+
+    def __init__(self, keys: Tuple[Any, ...], values: Tuple[Any, ...]) -> None:
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def items(self) -> '_ItemsView':
+        return _ItemsView(self)
+
+    def values(self) -> '_ValuesView':
+        return _ValuesView(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompactMap) and self._keys is other._keys:
+            return self._values == other._values
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self._keys, self._values)
+
+
+class _ItemsView(abc.ItemsView):
+    _mapping: CompactMap
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return zip(self._mapping._keys, self._mapping._values)
+
+
+class _ValuesView(abc.ValuesView):
+    _mapping: CompactMap
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._mapping._values)
+
+
+def compact(value: T, max_items: int = MAX_COMPACT_ITEMS) -> T:
+    """ Returns a parsed spec, or any part of it, in a form that takes less memory and is equal to it.
+    Equal subtrees, such as repeated inline schemas and empty sets of required properties,
+    become a single shared instance, and dicts of up to ``max_items`` items become ``CompactMap``.
+    The result is meant to be read only, like parsed values in general.
+
+    Raw JSON data that the spec keeps unparsed, such as ``components.request_bodies`` and ``examples``
+    of media types, is left as it is, so that it can still be passed to ``json.dumps()``.
+    """
+    keys: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+    def rebuild(x: Any, visit: Callable[[Any], Any]) -> Any:
+        if type(x) is dict and len(x) <= max_items:
+            k = tuple(visit(k) for k in x)
+            return CompactMap(keys.setdefault(k, k), tuple(visit(v) for v in x.values()))
+        raw = _raw_fields(type(x))
+        if raw:
+            children = [v if field in raw else visit(v) for field, v in zip(x._fields, x)]
+            if all(a is b for a, b in zip(children, x)):
+                return x
+            return type(x)._make(children)
+        return _rebuild(x, visit)
+
+    return Fingerprints().dedup(value, rebuild)
+
+
+_raw: Dict[Any, FrozenSet[str]] = {}
+
+
+def _raw_fields(cls: Any) -> FrozenSet[str]:
+    """ Fields of a named tuple that hold raw JSON data, annotated with ``Any``, e.g. ``Mapping[str, Any]``
+    """
+    try:
+        return _raw[cls]
+    except KeyError:
+        pass
+    hints = getattr(cls, '__annotations__', {}) if issubclass(cls, tuple) and hasattr(cls, '_fields') else {}
+    rv = _raw[cls] = frozenset(field for field, hint in hints.items() if _mentions_any(hint))
+    return rv
+
+
+def _mentions_any(hint: Any) -> bool:
+    if hint is Any:
+        return True
+    return any(_mentions_any(x) for x in getattr(hint, '__args__', None) or ())
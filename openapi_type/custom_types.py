@@ -1,9 +1,16 @@
-from enum import Enum
-from typing import NewType, NamedTuple, Optional, Mapping, Sequence, Any, List
+import json
+from typing import NamedTuple, Mapping, Sequence, Any, List, Tuple, FrozenSet, Dict, Set, Iterator
 
+import colander
 import typeit
 from inflection import camelize
 from typeit.schema import Invalid
+from typeit.schema.nodes import Null, SetSchema
+from typeit.schema.types import Union as UnionSchema, Structure, Literal as LiteralSchema, TypedMapping
+from typeit.schema.types import ForwardReferenceType
+
+from .values import ContentTypeFormat, ContentTypeTag, RefTo, Ref, EmptyValue
+from .values import DispatchStats, InternPool, InternStats, interning, _active_pool, _content_type_tag
 
 
 __all__ = (
@@ -11,44 +18,37 @@ __all__ = (
     'ContentTypeTag',
     'Ref',
     'EmptyValue',
+    'DispatchStats',
+    'InternPool',
+    'InternStats',
+    'interning',
 )
 
 
-ContentTypeFormat = NewType('ContentTypeFormat', str)
-MediaTypeCharset = NewType('MediaTypeCharset', str)
-
-
-class ContentTypeTag(NamedTuple):
-    format: ContentTypeFormat
-    charset: Optional[MediaTypeCharset]
-
-
 class ContentTypeTagSchema(typeit.schema.primitives.Str):
     def deserialize(self, node, cstruct: str) -> ContentTypeTag:
         """ Converts input string value ``cstruct`` to ``ContentTypeTag``
         """
+        pool = _active_pool.get()
+        if pool is not None and type(cstruct) is str:
+            try:
+                rv = pool.content_types[cstruct]
+            except KeyError:
+                rv = pool.content_types[cstruct] = self._deserialize(node, cstruct)
+                pool.misses += 1
+            else:
+                pool.hits += 1
+            return rv
+        return self._deserialize(node, cstruct)
+
+    def _deserialize(self, node, cstruct: str) -> ContentTypeTag:
         try:
             tag_str = super().deserialize(node, cstruct)
         except Invalid as e:
             error = Invalid(node, "Media Type should be a string", cstruct)
             error.add(e)
             raise error
-
-        media_format, *param = tag_str.split(';')
-        typed_format = ContentTypeFormat(media_format)
-
-        if param:
-            param = [x for x in param[0].split('charset=') if x.strip()]
-            if param:
-                charset = param[0]
-            else:
-                charset = None
-        else:
-            charset = None
-        return ContentTypeTag(
-            format=typed_format,
-            charset=charset
-        )
+        return _content_type_tag(tag_str)
 
     def serialize(self, node, appstruct: ContentTypeTag) -> str:
         """ Converts ``ContentTypeTag`` back to string value suitable for JSON/YAML
@@ -60,23 +60,6 @@ class ContentTypeTagSchema(typeit.schema.primitives.Str):
         return super().serialize(node, ''.join(rv))
 
 
-class RefTo(Enum):
-    SCHEMAS          = '#/components/schemas/'
-    LINKS            = '#/components/links/'
-    PARAMS           = '#/components/parameters/'
-    RESPONSES        = '#/components/responses/'
-    HEADERS          = '#/components/headers/'
-    EXAMPLES         = '#/components/examples/'
-    REQUEST_BODIES   = '#/components/requestBodies/'
-    SECURITY_SCHEMES = '#/components/securitySchemes/'
-    CALLBACKS        = '#/components/callbacks/'
-
-
-class Ref(NamedTuple):
-    location: RefTo
-    name: str
-
-
 class RefSchema(typeit.schema.primitives.Str):
     REF_PREFIX: Sequence[str] = ['#', 'components']
     REF_LOCATIONS: Mapping[str, RefTo] = {
@@ -94,6 +77,19 @@ class RefSchema(typeit.schema.primitives.Str):
     def deserialize(self, node, cstruct: str) -> Ref:
         """ Converts input string value ``cstruct`` to ``Ref``
         """
+        pool = _active_pool.get()
+        if pool is not None and type(cstruct) is str:
+            try:
+                rv = pool.refs[cstruct]
+            except KeyError:
+                rv = pool.refs[cstruct] = self._deserialize(node, cstruct)
+                pool.misses += 1
+            else:
+                pool.hits += 1
+            return rv
+        return self._deserialize(node, cstruct)
+
+    def _deserialize(self, node, cstruct: str) -> Ref:
         try:
             ref_str = super().deserialize(node, cstruct)
         except Invalid as e:
@@ -123,19 +119,6 @@ class RefSchema(typeit.schema.primitives.Str):
         return super().serialize(node, ''.join(rv))
 
 
-class EmptyValue(NamedTuple):
-    """ Sometimes spec contains schemas like:
-    {
-        "type": "array",
-        "items": {}
-    }
-
-    In that case we need a strict type that would check that its serialized representation
-    exactly matches the empty schema value {}. This object serves that purpose.
-    """
-    pass
-
-
 _empty = EmptyValue()
 
 
@@ -160,3 +143,231 @@ TypeGenerator = (typeit.TypeConstructor
                  & EmptyValueSchema[EmptyValue]          # type: ignore
                  & typeit.flags.GlobalNameOverride(lambda x: camelize(x, uppercase_first_letter=False))
                  )
+
+
+class _VariantKeys(NamedTuple):
+    """ Necessary conditions for a variant to accept a mapping
+    """
+    required: FrozenSet[str]
+    literals: Mapping[str, FrozenSet[Any]]
+    empty_only: bool
+
+
+Signature = Tuple[FrozenSet[str], Tuple[Any, ...], bool]
+
+
+class DispatchingUnion(UnionSchema):
+    """ A union of structures that chooses variants by looking at the keys of the input mapping
+    (``type``, ``$ref``, ``allOf``, ``properties`` and so on) instead of trying every variant in order.
+
+    The keys each variant requires, and the literal values it accepts, are taken from the variant schema nodes,
+    so only the variants that could possibly accept the input are tried, in their original union order.
+    The result is therefore the same as the one of the ordered trial.
+    """
+    def __init__(self, union: UnionSchema, stats: DispatchStats) -> None:
+        super().__init__(variant_nodes=union.variant_nodes, primitive_types=union.primitive_types)
+        self.stats = stats
+        self.variant_keys = [_variant_keys(var_schema) for _, var_schema in self.variant_nodes]
+        self.discriminators: FrozenSet[str] = frozenset().union(*[x.required for x in self.variant_keys])
+        self.literal_keys: Tuple[str, ...] = tuple(sorted(frozenset().union(*[x.literals for x in self.variant_keys])))
+        self.dispatch_table: Dict[Signature, Tuple[Any, ...]] = {}
+
+    def deserialize(self, node, cstruct):
+        if cstruct in (Null, None):
+            return cstruct
+
+        if not isinstance(cstruct, dict):
+            self.stats.fallbacks += 1
+            return super().deserialize(node, cstruct)
+
+        signature = ( self.discriminators.intersection(cstruct)
+                    , tuple(cstruct.get(k, Null) for k in self.literal_keys)
+                    , not cstruct
+                    )
+        try:
+            candidates = self.dispatch_table[signature]
+        except KeyError:
+            candidates = self.dispatch_table[signature] = self._candidates(signature)
+        except TypeError:
+            # unhashable literal value, no variant can accept it
+            self.stats.fallbacks += 1
+            return super().deserialize(node, cstruct)
+
+        for i, variant in enumerate(candidates):
+            try:
+                rv = variant.deserialize(cstruct)
+            except Invalid:
+                continue
+            if i:
+                self.stats.fallbacks += 1
+            else:
+                self.stats.dispatched += 1
+            return rv
+
+        # none of the variants accepts the data, the ordered trial collects a complete error report
+        self.stats.fallbacks += 1
+        return super().deserialize(node, cstruct)
+
+    def _candidates(self, signature: Signature) -> Tuple[Any, ...]:
+        present, literal_values, is_empty = signature
+        literals = dict(zip(self.literal_keys, literal_values))
+        rv = []
+        for (_, var_schema), keys in zip(self.variant_nodes, self.variant_keys):
+            if keys.empty_only and not is_empty:
+                continue
+            if not keys.required <= present:
+                continue
+            if any(literals[k] is not Null and literals[k] not in allowed for k, allowed in keys.literals.items()):
+                continue
+            rv.append(var_schema)
+        return tuple(rv)
+
+
+def _variant_keys(var_schema) -> _VariantKeys:
+    if isinstance(var_schema.typ, EmptyValueSchema):
+        return _VariantKeys(required=frozenset(), literals={}, empty_only=True)
+
+    required: Set[str] = set()
+    literals: Dict[str, FrozenSet[Any]] = {}
+    for child in var_schema.children:
+        if child.required:
+            required.add(child.name)
+        if isinstance(child.typ, LiteralSchema):
+            literals[child.name] = child.typ.variants
+    return _VariantKeys(required=frozenset(required), literals=literals, empty_only=False)
+
+
+def _is_dispatchable(typ: UnionSchema) -> bool:
+    return len(typ.variant_nodes) > 1 and all(
+        isinstance(var_schema.typ, (Structure, EmptyValueSchema)) for _, var_schema in typ.variant_nodes
+    )
+
+
+def iter_schema_nodes(root) -> Iterator[Any]:
+    """ Yields every node of the schema graph of ``root`` once.
+    Children of a node are looked up after the node is yielded, so its type can be replaced in the meantime.
+    """
+    seen: Set[int] = set()
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        yield node
+
+        typ = node.typ
+        if isinstance(typ, UnionSchema):
+            pending.extend(var_schema for _, var_schema in typ.variant_nodes)
+        elif isinstance(typ, TypedMapping):
+            pending.extend([typ.key_node, typ.value_node])
+        elif isinstance(typ, ForwardReferenceType):
+            pending.append(typ.ref_registry[typ.ref])
+        pending.extend(node.children)
+
+
+def install_dispatch(root, stats: DispatchStats) -> None:
+    """ Replaces union types of structures found in the schema graph of ``root``
+    with ``DispatchingUnion``, in place.
+    """
+    for node in iter_schema_nodes(root):
+        typ = node.typ
+        if isinstance(typ, UnionSchema) and _is_dispatchable(typ) and not isinstance(typ, DispatchingUnion):
+            node.typ = DispatchingUnion(typ, stats)
+
+
+class InterningStr(typeit.schema.primitives.Str):
+    def deserialize(self, node, cstruct):
+        rv = super().deserialize(node, cstruct)
+        pool = _active_pool.get()
+        if pool is None or type(rv) is not str:
+            return rv
+        return pool.string(rv)
+
+
+def install_interning(root) -> None:
+    """ Replaces string types found in the schema graph of ``root`` with ``InterningStr``, in place.
+    This covers string fields as well as mapping keys, such as property names.
+    """
+    interning_str = InterningStr(allow_empty=True)
+    nodes = list(iter_schema_nodes(root))
+    for node in nodes:
+        if type(node.typ) is typeit.schema.primitives.Str:
+            node.typ = interning_str
+    # unions match primitive values against the schema types of their variants, through tables
+    # shared between unions, which are replaced rather than changed in place
+    tables: Dict[int, Tuple[Mapping[Any, Any], Dict[Any, Any]]] = {}
+    for node in nodes:
+        if isinstance(node.typ, UnionSchema):
+            table = node.typ.primitive_types
+            if id(table) not in tables:
+                tables[id(table)] = table, {
+                    k: interning_str if type(v) is typeit.schema.primitives.Str else v for k, v in table.items()
+                }
+            node.typ.primitive_types = tables[id(table)][1]
+            node.typ.variant_schema_types = {x.typ for _, x in node.typ.variant_nodes}
+
+
+class CanonicalSet(colander.Sequence):
+    """ Serializes frozen sets as lists sorted by the JSON of their items, rather than in the iteration order
+    of the sets, which differs between equal sets and between interpreter runs
+    """
+    def serialize(self, node, appstruct, accept_scalar=None):
+        rv = super().serialize(node, appstruct, accept_scalar)
+        if isinstance(rv, list):
+            rv.sort(key=_canonical_key)
+        return rv
+
+
+def _canonical_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def install_canonical_sets(root) -> None:
+    """ Replaces sequence types of set fields found in the schema graph of ``root`` with ``CanonicalSet``, in place
+    """
+    for node in iter_schema_nodes(root):
+        if isinstance(node, SetSchema) and type(node.typ) is colander.Sequence:
+            node.typ = CanonicalSet(accept_scalar=node.typ.accept_scalar)
+
+
+class SinglePassMapping(TypedMapping):
+    """ ``TypedMapping`` that converts every key and value once, straight from the input mapping.
+    The base type deep-copies the whole mapping first, then deserializes every item twice,
+    which makes the cost of nested mappings grow exponentially with their depth.
+    Errors are reported the same way.
+    """
+    def deserialize(self, node, cstruct):
+        if cstruct is Null:
+            return cstruct
+        r = self._validate(node, cstruct)
+        rv = {}
+        for k, v in r.items():
+            try:
+                key = self.key_node.deserialize(k)
+            except Invalid as e:
+                error = Invalid(node, "{<k>: <v>} error parsing <k>", cstruct)
+                error.add(e)
+                raise error
+            try:
+                rv[key] = self.value_node.deserialize(v)
+            except Invalid as e:
+                error = Invalid(node, f"{{{k}: <v>}} error parsing <v>", v)
+                error.add(e)
+                raise error
+        return rv
+
+    def serialize(self, node, appstruct):
+        if appstruct is Null:
+            return {}
+        r = self._validate(node, appstruct)
+        return {self.key_node.serialize(k): self.value_node.serialize(v) for k, v in r.items()}
+
+
+def install_single_pass_mappings(root) -> None:
+    """ Replaces mapping types found in the schema graph of ``root`` with ``SinglePassMapping``, in place
+    """
+    for node in iter_schema_nodes(root):
+        typ = node.typ
+        if type(typ) is TypedMapping:
+            node.typ = SinglePassMapping(key_node=typ.key_node, value_node=typ.value_node)
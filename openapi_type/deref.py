@@ -0,0 +1,208 @@
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from . import OpenAPI, Reference
+from .fingerprint import _rebuild
+from .resolver import COMPONENT_LOCATIONS, ReferenceCycle, Resolver, iter_refs
+from .values import Ref
+
+
+__all__ = ('Cycle', 'DereferencedView')
+
+
+Group = Optional[FrozenSet[Ref]]
+
+
+class Cycle(NamedTuple):
+    """ Stands in for a reference from a component to a component that refers back to it,
+    directly or transitively, such as the reference of a recursive schema to itself.
+    ``view[cycle]`` returns the dereferenced component.
+    """
+    ref: Ref
+
+
+class DereferencedView:
+    """ The spec with every ``Reference`` replaced by its target, itself dereferenced. Every component is
+    dereferenced once, on first access, and every reference to it shares that single instance,
+    so the view is a DAG rather than a tree with a copy of a component at every use.
+    Parts of the spec without references are the very same objects as in the spec.
+
+    References that would make the view infinite, from a component to another component of the same cycle
+    (as in ``Resolver.cycles()``), are replaced by ``Cycle`` markers instead. References that do not point
+    to any component are left as they are.
+
+    >>> view = DereferencedView(spec)
+    >>> view.spec.paths['/pets'].get.responses['200'].content[tag].schema is view[Ref(RefTo.SCHEMAS, 'Pets')]
+    True
+    """
+    def __init__(self, spec: OpenAPI, resolver: Optional[Resolver] = None) -> None:
+        self.resolver = Resolver(spec) if resolver is None else resolver
+        self._spec = spec
+        self._view: Optional[OpenAPI] = None
+        self._groups: Optional[Dict[Ref, FrozenSet[Ref]]] = None
+        self._components: Dict[Ref, Any] = {}
+        self._markers: Dict[Ref, Cycle] = {}
+        # dereferenced copies of values with references inside, by the identities of the values and their groups
+        self._rebuilt: Dict[Tuple[int, int], Tuple[Any, Any]] = {}
+
+    @property
+    def spec(self) -> OpenAPI:
+        """ The dereferenced spec: ``paths`` and members of ``components`` are dereferenced on first access
+        """
+        if self._view is None:
+            spec = self._spec
+            components: Dict[str, Any] = {
+                attr: _LazyMapping(getattr(spec.components, attr), self._component_getter(location))
+                for location, attr in COMPONENT_LOCATIONS.items()
+            }
+            paths = spec.paths
+            self._view = spec._replace(
+                paths=_LazyMapping(paths, lambda template: self.deref(paths[template])),
+                components=spec.components._replace(**components),
+            )
+        return self._view
+
+    def __getitem__(self, ref: Union[Ref, Reference, Cycle]) -> Any:
+        """ The dereferenced component that ``ref`` points to, through other references if needed.
+        Raises ``UnresolvedReference`` and ``ReferenceCycle`` like ``Resolver.resolve()`` does.
+        """
+        if isinstance(ref, (Reference, Cycle)):
+            ref = ref.ref
+        try:
+            return self._components[ref]
+        except KeyError:
+            pass
+
+        # dependencies are dereferenced first, so that long chains of references do not exhaust the stack
+        pending = [ref]
+        while pending:
+            x = pending[-1]
+            if x in self._components:
+                pending.pop()
+                continue
+            target = self.resolver[x]
+            missing = [y for y in self._dependencies(x, target) if y not in self._components]
+            if missing:
+                pending.extend(missing)
+                continue
+            pending.pop()
+            if isinstance(target, Reference):
+                # references to references share the instance of the final target
+                self._components[x] = self._components[self._final(x)]
+            else:
+                self._components[x] = self._deref(target, self._group(x))
+        return self._components[ref]
+
+    def deref(self, value: Any) -> Any:
+        """ Dereferenced copy of any part of the spec, such as a path item, an operation or a schema.
+        Copies are memoized, so dereferencing the same value again returns the same instance.
+        """
+        return self._deref(value, None)
+
+    def _component_getter(self, location: Any) -> Callable[[str], Any]:
+        return lambda name: self[Ref(location, name)]
+
+    def _dependencies(self, ref: Ref, target: Any) -> List[Ref]:
+        """ Components that have to be dereferenced before ``ref``: every referenced component
+        outside of the cycle of ``ref``
+        """
+        if isinstance(target, Reference):
+            return [self._final(ref)]
+        group = self._group(ref)
+        return [
+            x for x in iter_refs(target)
+            if x in self.resolver and (group is None or self._final(x) not in group)
+        ]
+
+    def _group(self, ref: Ref) -> Group:
+        if self._groups is None:
+            self._groups = {x: group for group in self.resolver.cycles() for x in group}
+        return self._groups.get(ref)
+
+    def _final(self, ref: Ref) -> Ref:
+        """ The last reference of a chain of references to references
+        """
+        chain: List[Ref] = []
+        while True:
+            if ref in chain:
+                raise ReferenceCycle(chain + [ref])
+            chain.append(ref)
+            target = self.resolver[ref]
+            if not isinstance(target, Reference):
+                return ref
+            ref = target.ref
+
+    def _reference(self, reference: Reference, group: Group) -> Any:
+        ref = reference.ref
+        if ref not in self.resolver:
+            return reference
+        if group is not None and self._final(ref) in group:
+            try:
+                return self._markers[ref]
+            except KeyError:
+                rv = self._markers[ref] = Cycle(ref)
+                return rv
+        return self[ref]
+
+    def _deref(self, value: Any, group: Group) -> Any:
+        rebuilt = self._rebuilt
+
+        def visit(x: Any) -> Any:
+            if isinstance(x, (str, int, float, Enum)) or x is None:
+                return x
+            if isinstance(x, Reference):
+                return self._reference(x, group)
+            key = (id(x), id(group))
+            try:
+                return rebuilt[key][1]
+            except KeyError:
+                pass
+            rv = _rebuild_set(x, visit) if isinstance(x, (frozenset, set)) else _rebuild(x, visit)
+            if rv is not x:
+                rebuilt[key] = (x, rv)
+            return rv
+
+        return visit(value)
+
+
+def _rebuild_set(value: Any, visit: Callable[[Any], Any]) -> Any:
+    """ Sets whose members are no longer hashable once dereferenced, such as parameters with object schemas,
+    become tuples
+    """
+    members = [visit(x) for x in value]
+    if all(a is b for a, b in zip(members, value)):
+        return value
+    try:
+        return type(value)(members)
+    except TypeError:
+        return tuple(members)
+
+
+class _LazyMapping(Mapping[Any, Any]):
+    """ A mapping with the keys of ``raw``, and values computed by ``get(key)`` on first access
+    """
+    __slots__ = ('_raw', '_get', '_values')
+
+    def __init__(self, raw: Mapping[Any, Any], get: Callable[[Any], Any]) -> None:
+        self._raw = raw
+        self._get = get
+        self._values: Dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self._raw:
+            raise KeyError(key)
+        rv = self._values[key] = self._get(key)
+        return rv
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(dereferenced={len(self._values)}, total={len(self._raw)})'
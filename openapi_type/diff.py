@@ -0,0 +1,421 @@
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from . import (
+    OpenAPI, Operation, OperationParameter, PathItem, Reference, RequestBody, Response, Header,
+    StringValue, IntegerValue, FloatValue,
+    ObjectValue, InlinedObjectValue, ObjectWithAdditionalProperties, ArrayValue,
+    ProductSchemaType, UnionSchemaTypeAny, UnionSchemaTypeOne,
+    _spec_node,
+)
+from .fingerprint import Fingerprints, _field_key, _key_text
+from .pointer import json_pointer
+from .resolver import Resolver, UnresolvedReference, ReferenceCycle
+from .routing import METHODS
+
+
+__all__ = (
+    'ChangeKind',
+    'Change',
+    'diff_specs',
+)
+
+
+class ChangeKind(Enum):
+    ADDED = 'added'
+    REMOVED = 'removed'
+    CHANGED = 'changed'
+
+
+class Change(NamedTuple):
+    kind: ChangeKind
+    pointer: str
+    """ JSON pointer into the serialized new spec, or into the old one for removals
+    """
+    breaking: bool
+    """ Whether clients written against the old spec may fail against the new one
+    """
+    message: str
+
+    def __str__(self) -> str:
+        return f"{'BREAKING' if self.breaking else 'ok':<8} {self.kind.value:<7} {self.pointer}: {self.message}"
+
+
+Path = List[Any]
+Direction = FrozenSet[str]
+""" Where a schema is used: in requests, which clients write and servers read, in responses, or in both
+"""
+REQUEST: Direction = frozenset({'request'})
+RESPONSE: Direction = frozenset({'response'})
+BOTH: Direction = REQUEST | RESPONSE
+
+
+_OBJECTS = (ObjectValue, InlinedObjectValue)
+_COMPOSITIONS = {
+    ProductSchemaType: 'all_of',
+    UnionSchemaTypeAny: 'any_of',
+    UnionSchemaTypeOne: 'one_of',
+}
+
+
+def diff_specs(old: OpenAPI, new: OpenAPI, fingerprints: Optional[Fingerprints] = None) -> List[Change]:
+    """ Lists the changes from ``old`` to ``new``: paths, operations, parameters, request bodies, responses
+    and components that were added, removed or changed, classified as breaking or not for clients
+    of the old spec. Schemas are compared according to where they are used: e.g. a new required property
+    breaks requests, a removed property breaks responses.
+
+    Subtrees that are the same objects in both specs, as in specs derived from one another with ``_replace()``
+    and persistent mappings, are skipped right away. Other subtrees are compared by value, or by their
+    fingerprints if ``fingerprints`` are given, which is worth it when they are kept between diffs.
+    """
+    differ = _Differ(old, new, fingerprints)
+    differ.spec()
+    return differ.changes
+
+
+class _Differ:
+    def __init__(self, old: OpenAPI, new: OpenAPI, fingerprints: Optional[Fingerprints]) -> None:
+        self.old = old
+        self.new = new
+        self.fingerprints = fingerprints
+        self.old_resolver = Resolver(old)
+        self.new_resolver = Resolver(new)
+        self.changes: List[Change] = []
+
+    def same(self, a: Any, b: Any) -> bool:
+        if a is b:
+            return True
+        if self.fingerprints is not None:
+            return self.fingerprints.equal(a, b)
+        return a == b
+
+    def known_same(self, a: Any, b: Any) -> bool:
+        """ Cheap check for containers, whose items are compared one by one anyway
+        """
+        if a is b:
+            return True
+        if self.fingerprints is None:
+            return False
+        fingerprint = self.fingerprints.memoized(a)
+        return fingerprint is not None and fingerprint == self.fingerprints.memoized(b)
+
+    def report(self, kind: ChangeKind, path: Path, breaking: bool, message: str) -> None:
+        self.changes.append(Change(kind=kind, pointer=json_pointer(path), breaking=breaking, message=message))
+
+    def mapping(self, old: Mapping[Any, Any], new: Mapping[Any, Any], path: Path, what: str,
+                removed_breaking: bool, added_breaking: Callable[[Any], bool],
+                changed: Callable[[Any, Any, Path], None]) -> None:
+        if self.known_same(old, new):
+            return
+        for key, value in old.items():
+            if key not in new:
+                self.report(ChangeKind.REMOVED, path + [_key_text(key)], removed_breaking, f'{what} removed')
+        for key, value in new.items():
+            if key not in old:
+                self.report(ChangeKind.ADDED, path + [_key_text(key)], added_breaking(value), f'{what} added')
+            elif not self.same(old[key], value):
+                changed(old[key], value, path + [_key_text(key)])
+
+    def generic(self, old: Any, new: Any, path: Path, skip: Iterable[str] = ()) -> None:
+        """ Changes that do not affect clients, like descriptions and examples.
+        Skipped fields are compared elsewhere, so they are not compared as part of the whole.
+        """
+        if self.known_same(old, new) if skip else self.same(old, new):
+            return
+        if type(old) is type(new) and hasattr(old, '_fields'):
+            cls = type(old)
+            for field, a, b in zip(old._fields, old, new):
+                if field not in skip:
+                    self.generic(a, b, path + [_field_key(cls, field)])
+        elif isinstance(old, Mapping) and isinstance(new, Mapping):
+            self.mapping(old, new, path, 'value', False, lambda _: False, self.generic)
+        else:
+            self.report(ChangeKind.CHANGED, path, False, 'value changed')
+
+    # Spec structure
+    # --------------
+
+    def spec(self) -> None:
+        old, new = self.old, self.new
+        if self.known_same(old, new):
+            return
+        self.mapping(old.paths, new.paths, ['paths'], 'path', True, lambda _: False, self.path_item)
+        if old.components is not None and new.components is not None:
+            self.components(old.components, new.components, ['components'])
+        else:
+            self.generic(old.components, new.components, ['components'])
+        self.generic(old, new, [], skip=('paths', 'components'))
+
+    def components(self, old: Any, new: Any, path: Path) -> None:
+        """ Use sites of components compare equal references, so referenced components are compared here,
+        with the same rules as inline ones
+        """
+        compare: Mapping[str, Tuple[str, Callable[[Any, Any, Path], None]]] = {
+            'schemas': ('schema', lambda a, b, p: self.schema(a, b, p, BOTH)),
+            'parameters': ('parameter', self.component_parameter),
+            'request_bodies': ('request body', self.request_body),
+            'responses': ('response', self.response),
+            'headers': ('header', self.header),
+        }
+        cls = type(old)
+        for field, (what, changed) in compare.items():
+            self.mapping(getattr(old, field), getattr(new, field), path + [_field_key(cls, field)], what,
+                         True, lambda _: False, changed)
+        self.generic(old, new, path, skip=tuple(compare))
+
+    def path_item(self, old: PathItem, new: PathItem, path: Path) -> None:
+        for method in METHODS:
+            a, b = getattr(old, method), getattr(new, method)
+            if a is None and b is None:
+                continue
+            if b is None:
+                self.report(ChangeKind.REMOVED, path + [method], True, 'operation removed')
+            elif a is None:
+                self.report(ChangeKind.ADDED, path + [method], False, 'operation added')
+            elif not self.same(a, b):
+                self.operation(a, b, path + [method])
+        self.generic(old, new, path, skip=METHODS)
+
+    def operation(self, old: Operation, new: Operation, path: Path) -> None:
+        self.parameters(old, new, path + ['parameters'])
+        self.request_body(old.request_body, new.request_body, path + ['requestBody'])
+        self.mapping(old.responses, new.responses, path + ['responses'], 'response', True, lambda _: False,
+                     self.response)
+        self.generic(old, new, path, skip=('parameters', 'request_body', 'responses'))
+
+    def parameters(self, old: Operation, new: Operation, path: Path) -> None:
+        if self.same(old.parameters, new.parameters):
+            return
+        a = _parameters(old.parameters, self.old_resolver)
+        b = _parameters(new.parameters, self.new_resolver)
+        for key, (position, param, _) in a.items():
+            if key not in b:
+                self.report(ChangeKind.REMOVED, path + [position], True, f'parameter {_name(key)} removed')
+        for key, (position, param, resolved) in b.items():
+            if key not in a:
+                required = isinstance(resolved, OperationParameter) and resolved.required
+                self.report(ChangeKind.ADDED, path + [position], required,
+                            f"{'required' if required else 'optional'} parameter {_name(key)} added")
+                continue
+            _, old_param, old_resolved = a[key]
+            if self.same(old_param, param):
+                continue
+            if not isinstance(old_resolved, OperationParameter) or not isinstance(resolved, OperationParameter):
+                self.report(ChangeKind.CHANGED, path + [position], True, f'parameter {_name(key)} changed')
+                continue
+            self.parameter(old_resolved, resolved, path + [position])
+
+    def parameter(self, old: OperationParameter, new: OperationParameter, path: Path) -> None:
+        if old.required != new.required:
+            self.report(ChangeKind.CHANGED, path + ['required'], new.required,
+                        f"parameter became {'required' if new.required else 'optional'}")
+        if (old.style, old.explode) != (new.style, new.explode):
+            self.report(ChangeKind.CHANGED, path + ['style'], True, 'serialization style changed')
+        self.schema(old.schema, new.schema, path + ['schema'], REQUEST)
+        self.generic(old, new, path, skip=('required', 'style', 'explode', 'schema'))
+
+    def component_parameter(self, old: Any, new: Any, path: Path) -> None:
+        if not isinstance(old, OperationParameter) or not isinstance(new, OperationParameter):
+            self.report(ChangeKind.CHANGED, path, True, 'parameter changed')
+        elif (old.in_, old.name) != (new.in_, new.name):
+            self.report(ChangeKind.CHANGED, path, True,
+                        f'parameter {_name((old.in_.value, old.name))} replaced by {_name((new.in_.value, new.name))}')
+        else:
+            self.parameter(old, new, path)
+
+    def request_body(self, old: Any, new: Any, path: Path) -> None:
+        if self.same(old, new):
+            return
+        if new is None:
+            self.report(ChangeKind.REMOVED, path, True, 'request body removed')
+        elif old is None:
+            required = isinstance(new, RequestBody) and new.required
+            self.report(ChangeKind.ADDED, path, required,
+                        f"{'required' if required else 'optional'} request body added")
+        elif isinstance(old, RequestBody) and isinstance(new, RequestBody):
+            if old.required != new.required:
+                self.report(ChangeKind.CHANGED, path + ['required'], new.required,
+                            f"request body became {'required' if new.required else 'optional'}")
+            self.mapping(old.content, new.content, path + ['content'], 'media type', True, lambda _: False,
+                         lambda a, b, p: self.schema(a.schema, b.schema, p + ['schema'], REQUEST))
+            self.generic(old, new, path, skip=('required', 'content'))
+        else:
+            self.report(ChangeKind.CHANGED, path, True, 'request body changed')
+
+    def response(self, old: Any, new: Any, path: Path) -> None:
+        old = _resolve(old, self.old_resolver)
+        new = _resolve(new, self.new_resolver)
+        if not isinstance(old, Response) or not isinstance(new, Response):
+            if not self.same(old, new):
+                self.report(ChangeKind.CHANGED, path, True, 'response changed')
+            return
+        self.mapping(old.content, new.content, path + ['content'], 'media type', True, lambda _: False,
+                     lambda a, b, p: self.schema(a.schema, b.schema, p + ['schema'], RESPONSE))
+        self.mapping(old.headers, new.headers, path + ['headers'], 'header', True, lambda _: False, self.header)
+        self.generic(old, new, path, skip=('content', 'headers'))
+
+    def header(self, old: Any, new: Any, path: Path) -> None:
+        old = _resolve(old, self.old_resolver)
+        new = _resolve(new, self.new_resolver)
+        if not isinstance(old, Header) or not isinstance(new, Header):
+            if not self.same(old, new):
+                self.report(ChangeKind.CHANGED, path, True, 'header changed')
+            return
+        self.schema(old.schema, new.schema, path + ['schema'], RESPONSE)
+        self.generic(old, new, path, skip=('schema',))
+
+    # Schemas
+    # -------
+
+    def schema(self, old: Any, new: Any, path: Path, direction: Direction) -> None:
+        if self.same(old, new):
+            return
+        if isinstance(old, Reference) or isinstance(new, Reference):
+            self.reference(old, new, path)
+            return
+        if _group(old) != _group(new):
+            self.report(ChangeKind.CHANGED, path, True,
+                        f'type changed from {type(old).__name__} to {type(new).__name__}')
+            return
+
+        if isinstance(old, _OBJECTS):
+            self.object(old, new, path, direction)
+            self.generic(old, new, path, skip=('properties', 'required', 'type'))
+        elif isinstance(old, ArrayValue):
+            self.schema(old.items, new.items, path + ['items'], direction)
+            self.generic(old, new, path, skip=('items',))
+        elif isinstance(old, ObjectWithAdditionalProperties):
+            a, b = old.additional_properties, new.additional_properties
+            if isinstance(a, tuple) and isinstance(b, tuple):
+                self.schema(a, b, path + ['additionalProperties'], direction)
+            elif a != b:
+                self.report(ChangeKind.CHANGED, path + ['additionalProperties'], True, 'additional properties changed')
+        elif type(old) in _COMPOSITIONS:
+            field = _COMPOSITIONS[type(old)]
+            a, b = getattr(old, field), getattr(new, field)
+            key = _field_key(type(old), field)
+            if len(a) != len(b):
+                self.report(ChangeKind.CHANGED, path + [key], True, f'{key} variants changed')
+            else:
+                for i, (x, y) in enumerate(zip(a, b)):
+                    self.schema(x, y, path + [key, i], direction)
+        elif isinstance(old, (StringValue, IntegerValue, FloatValue)):
+            self.primitive(old, new, path, direction)
+        else:
+            self.generic(old, new, path)
+
+    def reference(self, old: Any, new: Any, path: Path) -> None:
+        if isinstance(old, Reference) and isinstance(new, Reference):
+            # referenced schemas are compared among components
+            if old.ref != new.ref:
+                self.report(ChangeKind.CHANGED, path, True, f'reference changed from {old.ref.name} to {new.ref.name}')
+            return
+        # a schema moved to or from components is the same as long as its content is
+        same = self.same(_resolve(old, self.old_resolver), _resolve(new, self.new_resolver))
+        self.report(ChangeKind.CHANGED, path, not same,
+                    'schema replaced with a reference' if isinstance(new, Reference) else 'reference replaced with a schema')
+
+    def object(self, old: Any, new: Any, path: Path, direction: Direction) -> None:
+        properties = path + ['properties']
+        for name in old.properties:
+            if name not in new.properties:
+                # clients may rely on properties of responses, while servers may ignore extra properties of requests
+                self.report(ChangeKind.REMOVED, properties + [name], 'response' in direction, 'property removed')
+        for name, schema in new.properties.items():
+            if name not in old.properties:
+                required = name in new.required
+                self.report(ChangeKind.ADDED, properties + [name], required and 'request' in direction,
+                            f"{'required' if required else 'optional'} property added")
+                continue
+            self.schema(old.properties[name], schema, properties + [name], direction)
+            if (name in old.required) != (name in new.required):
+                required = name in new.required
+                breaking = 'request' in direction if required else 'response' in direction
+                self.report(ChangeKind.CHANGED, properties + [name], breaking,
+                            f"property became {'required' if required else 'optional'}")
+
+    def primitive(self, old: Any, new: Any, path: Path, direction: Direction) -> None:
+        """ Narrowed values break requests, which may no longer be accepted,
+        widened values break responses, which clients may not expect
+        """
+        def narrowed(field: str, is_narrowed: bool) -> None:
+            breaking = 'request' in direction if is_narrowed else 'response' in direction
+            self.report(ChangeKind.CHANGED, path + [field], breaking,
+                        f"{field} {'narrowed' if is_narrowed else 'widened'}")
+
+        skip = ['format']
+        if old.format != new.format:
+            self.report(ChangeKind.CHANGED, path + ['format'], True, 'format changed')
+        if isinstance(old, StringValue):
+            skip += ['enum', 'pattern']
+            if set(old.enum) != set(new.enum):
+                if not old.enum or (new.enum and set(new.enum) < set(old.enum)):
+                    narrowed('enum', True)
+                elif not new.enum or set(new.enum) > set(old.enum):
+                    narrowed('enum', False)
+                else:
+                    self.report(ChangeKind.CHANGED, path + ['enum'], True, 'enum changed')
+            if old.pattern != new.pattern:
+                self.report(ChangeKind.CHANGED, path + ['pattern'], True, 'pattern changed')
+        elif isinstance(old, IntegerValue):
+            skip += ['minimum', 'maximum']
+            for field, sign in (('minimum', 1), ('maximum', -1)):
+                a, b = getattr(old, field), getattr(new, field)
+                if a != b:
+                    narrowed(field, a is None or (b is not None and (b - a) * sign > 0))
+        self.generic(old, new, path, skip=skip)
+
+
+def _group(schema: Any) -> Any:
+    return 'object' if isinstance(schema, _OBJECTS) else type(schema)
+
+
+def _resolve(value: Any, resolver: Resolver) -> Any:
+    if isinstance(value, Reference):
+        try:
+            return resolver.resolve(value)
+        except (UnresolvedReference, ReferenceCycle):
+            return value
+    return value
+
+
+def _name(key: Tuple[str, str]) -> str:
+    return f'{key[1]!r} in {key[0]}' if key[0] != '$ref' else key[1]
+
+
+def _parameters(parameters: Iterable[Any], resolver: Resolver) -> Dict[Tuple[str, str], Tuple[int, Any, Any]]:
+    """ Parameters by location and name, with their positions in the serialized spec
+    and their values with references resolved
+    """
+    positions = _positions(parameters)
+    rv = {}
+    for param in parameters:
+        resolved = _resolve(param, resolver)
+        if isinstance(resolved, OperationParameter):
+            key = (resolved.in_.value, resolved.name)
+        else:
+            key = ('$ref', param.ref.location.value + param.ref.name)
+        rv[key] = (positions[id(param)], param, resolved)
+    return rv
+
+
+def _positions(members: Iterable[Any]) -> Dict[int, int]:
+    """ Positions of the members of ``Operation.parameters`` in the serialized spec, where sets are sorted
+    """
+    from .custom_types import _canonical_key
+
+    serialize = _parameter_node().serialize
+    ordered = sorted(members, key=lambda x: _canonical_key(serialize(x)))
+    return {id(x): i for i, x in enumerate(ordered)}
+
+
+@lru_cache(maxsize=None)
+def _parameter_node() -> Any:
+    from typeit.schema.nodes import SetSchema
+    from .custom_types import iter_schema_nodes
+
+    for node in iter_schema_nodes(_spec_node()):
+        if isinstance(node, SetSchema) and node.name == 'parameters':
+            return node.children[0]
+    raise LookupError('Operation.parameters is not in the schema graph')
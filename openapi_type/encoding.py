@@ -0,0 +1,285 @@
+import io
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from . import (
+    OpenAPI, Reference,
+    StringValue, IntegerValue, FloatValue, BooleanValue,
+    ObjectValue, InlinedObjectValue, ObjectWithAdditionalProperties, ArrayValue, ProductSchemaType,
+)
+from .resolver import Resolver
+from .values import Ref
+
+
+__all__ = (
+    'Encoder',
+    'EncoderCompiler',
+    'DEFAULT_CHUNK_SIZE',
+)
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+_dumps = json.JSONEncoder(separators=(',', ':')).encode
+""" Generic encoding of values that do not match their schemas, or whose schemas
+do not determine their types (unions, free-form objects)
+"""
+
+
+def _number(x: Any) -> str:
+    if type(x) is int:
+        return int.__repr__(x)
+    if x - x == 0.0:
+        # finite floats; json.dumps spells NaN and infinities in its own way
+        return float.__repr__(x)
+    return _dumps(x)
+
+
+def _is_binary(stream: Any) -> bool:
+    """ Whether ``stream`` expects bytes rather than text
+    """
+    return isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(stream, 'mode', '')
+
+
+EncodeFunction = Callable[[Any], str]
+
+
+class Encoder:
+    """ Encodes payloads of a single schema to compact JSON. The output is always equal to the payload
+    when loaded back: values that do not match the schema are encoded generically.
+    """
+    def __init__(self, encode: EncodeFunction, encode_item: Optional[EncodeFunction]) -> None:
+        self.encode: EncodeFunction = encode
+        self._encode_item = encode_item
+
+    def iter_encode(self, value: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """ Yields the JSON text in chunks of about ``chunk_size`` characters.
+        Arrays are encoded item by item, so ``value`` of an array schema can be any iterable, e.g. a generator
+        of rows that is never materialized as a whole.
+        """
+        encode_item = self._encode_item
+        if encode_item is None or isinstance(value, (str, bytes, Mapping)):
+            yield self.encode(value)
+            return
+        try:
+            items = iter(value)
+        except TypeError:
+            yield self.encode(value)
+            return
+        buf: List[str] = ['[']
+        size = 1
+        for i, item in enumerate(items):
+            x = encode_item(item)
+            if i:
+                buf.append(',')
+            buf.append(x)
+            size += len(x) + 1
+            if size >= chunk_size:
+                yield ''.join(buf)
+                buf.clear()
+                size = 0
+        buf.append(']')
+        yield ''.join(buf)
+
+    def write(self, value: Any, stream: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """ Writes the JSON text to a text or a binary stream, chunk by chunk
+        """
+        binary = _is_binary(stream)
+        for chunk in self.iter_encode(value, chunk_size):
+            # the output is ASCII, since non-ASCII characters are escaped like json.dumps does
+            stream.write(chunk.encode('ascii') if binary else chunk)
+
+
+class EncoderCompiler:
+    """ Compiles schemas of a parsed spec into JSON encoders of payloads. Every schema becomes a Python function
+    that accesses the properties of objects in the order of the schema, and encodes their values
+    with the encoder of their type, without inspecting the types of values first:
+
+    >>> compiler = EncoderCompiler(spec)
+    >>> encoder = compiler.compile(spec.components.schemas['Pet'])
+    >>> encoder.encode({'id': 1, 'name': 'Rex'})
+    '{"id":1,"name":"Rex"}'
+    """
+    def __init__(self, spec: OpenAPI, resolver: Optional[Resolver] = None) -> None:
+        self.spec = spec
+        self.resolver = Resolver(spec) if resolver is None else resolver
+        self._namespace: Dict[str, Any] = {
+            '_s': encode_basestring_ascii,
+            '_int': int.__repr__,
+            '_float': float.__repr__,
+            '_number': _number,
+            '_dumps': _dumps,
+        }
+        # keyed by id(), since parsed schemas contain plain dicts and are not hashable
+        self._functions: Dict[int, Tuple[Any, str]] = {}
+        self._refs: Dict[Ref, str] = {}
+        self._pending: List[Tuple[str, Any]] = []
+        self._encoders: Dict[int, Tuple[Any, Encoder]] = {}
+
+    def compile(self, schema: Any) -> Encoder:
+        try:
+            return self._encoders[id(schema)][1]
+        except KeyError:
+            pass
+        name = self._function(schema)
+        target = self._target(schema)
+        item_name = self._function(target.items) if isinstance(target, ArrayValue) else None
+        # functions of referenced components are generated one by one, rather than recursively
+        while self._pending:
+            self._define(*self._pending.pop())
+        rv = Encoder(self._namespace[name], None if item_name is None else self._namespace[item_name])
+        self._encoders[id(schema)] = (schema, rv)
+        return rv
+
+    def _target(self, schema: Any) -> Any:
+        while isinstance(schema, Reference):
+            schema = self.resolver.resolve(schema)
+        return schema
+
+    def _function(self, schema: Any) -> str:
+        """ Returns the name of the function that encodes ``schema``, which is generated later if necessary
+        """
+        if isinstance(schema, Reference):
+            try:
+                return self._refs[schema.ref]
+            except KeyError:
+                pass
+            rv = self._refs[schema.ref] = self._function(self.resolver.resolve(schema))
+            return rv
+        try:
+            return self._functions[id(schema)][1]
+        except KeyError:
+            pass
+        rv = f'encode_{len(self._functions)}'
+        self._functions[id(schema)] = (schema, rv)
+        self._pending.append((rv, schema))
+        return rv
+
+    def _define(self, name: str, schema: Any) -> None:
+        body: List[str] = []
+        expr = _Generator(self, body).emit(schema, 'x')
+        lines = [f'def {name}(x):', '    try:']
+        lines.extend(f'        {line}' for line in body)
+        lines += [
+            f'        return {expr}',
+            '    except (TypeError, KeyError, AttributeError):',
+            '        return _dumps(x)',
+        ]
+        exec('\n'.join(lines), self._namespace)
+
+
+class _Generator:
+    """ Generates statements that check the types of values, and the expression that encodes them
+    """
+    def __init__(self, compiler: EncoderCompiler, body: List[str]) -> None:
+        self.compiler = compiler
+        self.body = body
+        self.counter = 0
+
+    def var(self) -> str:
+        self.counter += 1
+        return f'x{self.counter}'
+
+    def emit(self, schema: Any, var: str) -> str:
+        compiler = self.compiler
+        if isinstance(schema, Reference):
+            target = compiler._target(schema)
+            if isinstance(target, (StringValue, IntegerValue, FloatValue, BooleanValue)):
+                return self.emit(target, var)
+            return f'{compiler._function(schema)}({var})'
+        if isinstance(schema, StringValue):
+            return f'_s({var})'
+        if isinstance(schema, IntegerValue):
+            self.body.append(f'if type({var}) is not int: raise TypeError')
+            return f'_int({var})'
+        if isinstance(schema, FloatValue):
+            # finite floats are formatted in place, anything else like json.dumps does
+            return f'(_float({var}) if type({var}) is float and {var} - {var} == 0.0 else _number({var}))'
+        if isinstance(schema, BooleanValue):
+            self.body.append(f'if type({var}) is not bool: raise TypeError')
+            return f"('true' if {var} else 'false')"
+        if isinstance(schema, (ObjectValue, InlinedObjectValue)):
+            return self.emit_object(schema.properties, frozenset(schema.required), var)
+        if isinstance(schema, ProductSchemaType):
+            merged = _merge_objects([compiler._target(x) for x in schema.all_of])
+            if merged is not None:
+                return self.emit_object(*merged, var)
+        if isinstance(schema, ArrayValue):
+            self.body.append(f'if type({var}) is not list: raise TypeError')
+            item = compiler._target(schema.items)
+            if isinstance(item, StringValue):
+                return f"'[' + ','.join(map(_s, {var})) + ']'"
+            return f"'[' + ','.join([{compiler._function(schema.items)}(i) for i in {var}]) + ']'"
+        if isinstance(schema, ObjectWithAdditionalProperties) and isinstance(schema.additional_properties, tuple):
+            self.body.append(f'if type({var}) is not dict: raise TypeError')
+            encode_value = compiler._function(schema.additional_properties)
+            return f"'{{' + ','.join([_s(k) + ':' + {encode_value}(v) for k, v in {var}.items()]) + '}}'"
+        return f'_dumps({var})'
+
+    def emit_object(self, properties: Mapping[str, Any], required: frozenset, var: str) -> str:
+        """ Required properties are formatted into a fixed layout, optional ones follow it in the order of the schema
+        """
+        body = self.body
+        body.append(f'if type({var}) is not dict: raise TypeError')
+        parts = []
+        args = []
+        for name, schema in properties.items():
+            if name in required:
+                x = self.var()
+                body.append(f'{x} = {var}[{name!r}]')
+                parts.append(_key(name).replace('%', '%%') + ':%s')
+                args.append(self.emit(schema, x))
+        layout = f"{'{' + ','.join(parts)!r} % ({', '.join(args)},)" if args else "'{'"
+        optional = [(name, schema) for name, schema in properties.items() if name not in required]
+        if not optional:
+            # the payload must not have properties that are not in the schema
+            body.append(f'if len({var}) != {len(args)}: raise TypeError')
+            return f"{layout} + '}}'"
+
+        count = self.var()
+        body.append(f'{count} = {len(args)}')
+        pieces = []
+        for name, schema in optional:
+            x = self.var()
+            piece = self.var()
+            # statements of optional values go to the branch where they are present
+            self.body = []
+            expr = self.emit(schema, x)
+            nested, self.body = self.body, body
+            body.append(f'if {name!r} in {var}:')
+            body.append(f'    {x} = {var}[{name!r}]')
+            body.extend(f'    {line}' for line in nested)
+            body.append(f"    {piece} = {',' + _key(name) + ':'!r} + {expr}")
+            body.append(f'    {count} += 1')
+            body.append('else:')
+            body.append(f"    {piece} = ''")
+            pieces.append(piece)
+        body.append(f'if {count} != len({var}): raise TypeError')
+        if args:
+            return f"{layout} + {' + '.join(pieces)} + '}}'"
+        return f"'{{' + ({' + '.join(pieces)})[1:] + '}}'"
+
+
+def _key(name: str) -> str:
+    """ JSON text of a property name
+    """
+    return encode_basestring_ascii(name)
+
+
+def _merge_objects(schemas: Iterable[Any]) -> Optional[Tuple[Mapping[str, Any], frozenset]]:
+    """ Properties and required properties of ``allOf`` of objects
+    """
+    properties: Dict[str, Any] = {}
+    required: frozenset = frozenset()
+    for x in schemas:
+        if not isinstance(x, (ObjectValue, InlinedObjectValue)):
+            return None
+        for name, schema in x.properties.items():
+            if name in properties and properties[name] is not schema:
+                # the value has to match both schemas, which the generic encoder does not need to know
+                return None
+            properties[name] = schema
+        required |= frozenset(x.required)
+    return properties, required
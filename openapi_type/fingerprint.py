@@ -0,0 +1,307 @@
+import struct
+from collections import abc
+from enum import Enum
+from hashlib import blake2b
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union
+
+from inflection import camelize
+from pyrsistent import PMap, PVector, pmap, pvector
+
+from . import (
+    OpenAPI, overrides,
+    ObjectValue, InlinedObjectValue, ObjectWithAdditionalProperties, ArrayValue,
+    ProductSchemaType, UnionSchemaTypeAny, UnionSchemaTypeOne,
+)
+from .pointer import json_pointer
+from .values import ContentTypeTag
+
+
+__all__ = (
+    'Fingerprints',
+    'DuplicateSchema',
+    'duplicate_schemas',
+)
+
+
+T = TypeVar('T')
+
+Fingerprint = bytes
+
+
+class Fingerprints:
+    """ Structural fingerprints of parsed values: every named tuple, mapping, sequence and set is hashed
+    from the fingerprints of its children (a Merkle tree), once, and memoized.
+    Values with equal fingerprints are equal, and the fingerprints of equal values are equal,
+    except that the types of named tuples are taken into account, unlike in ``==`` of tuples.
+
+    Memoization is keyed by object identity, so parsed values are treated as immutable,
+    and they are kept alive for as long as the ``Fingerprints`` instance is.
+
+    >>> fingerprints = Fingerprints()
+    >>> fingerprints.equal(parse_spec(serialize_spec(spec)), spec)
+    True
+    """
+    def __init__(self) -> None:
+        self._memo: Dict[int, Tuple[Any, Fingerprint]] = {}
+        self._strings: Dict[str, bytes] = {}
+
+    def __call__(self, value: Any) -> Fingerprint:
+        try:
+            return self._memo[id(value)][1]
+        except KeyError:
+            pass
+        part = self._part
+        t = type(value)
+        if isinstance(value, tuple):
+            # named tuples are hashed with their type, plain tuples like sequences
+            tag = _tag(t) if hasattr(value, '_fields') else _LIST
+            body = [part(x) for x in value]
+        elif t is dict or isinstance(value, abc.Mapping):
+            tag = _MAPPING
+            body = sorted([part(k) + part(v) for k, v in value.items()])
+        elif t is list or isinstance(value, PVector):
+            tag = _LIST
+            body = [part(x) for x in value]
+        elif isinstance(value, (frozenset, set)):
+            tag = _SET
+            body = sorted([part(x) for x in value])
+        else:
+            return blake2b(part(value), digest_size=16).digest()
+        rv = blake2b(tag + b''.join(body), digest_size=16).digest()
+        self._memo[id(value)] = (value, rv)
+        return rv
+
+    def _part(self, value: Any) -> bytes:
+        """ Unambiguous encoding of a child: primitives are encoded in place, containers by their fingerprints
+        """
+        t = type(value)
+        if t is str:
+            # parsed specs share equal strings, and so do their encodings
+            try:
+                return self._strings[value]
+            except KeyError:
+                rv = self._strings[value] = b's' + _sized(value.encode())
+                return rv
+        if value is None:
+            return b'N'
+        if t is bool:
+            return b'T' if value else b'F'
+        if t is int:
+            return b'i' + _sized(repr(value).encode())
+        if t is float:
+            return b'f' + struct.pack('<d', value)
+        if isinstance(value, Enum):
+            return b'e' + _sized(t.__qualname__.encode()) + self._part(value.value)
+        return b'#' + self(value)
+
+    def memoized(self, value: Any) -> Optional[Fingerprint]:
+        """ The fingerprint of ``value`` if it is already computed, without computing it
+        """
+        try:
+            return self._memo[id(value)][1]
+        except KeyError:
+            return None
+
+    def equal(self, a: Any, b: Any) -> bool:
+        """ Constant time, once the fingerprints of both values are memoized
+        """
+        return a is b or self(a) == self(b)
+
+    def dedup(self, value: T, rebuild: Optional[Callable[[Any, Callable[[Any], Any]], Any]] = None) -> T:
+        """ Returns ``value`` with equal subtrees replaced by a single shared instance.
+        Subtrees without duplicates inside are reused as they are.
+
+        :param rebuild: makes the shared instance of a subtree from its first occurrence and a function
+                        that returns the shared instances of its children; it has to return an equal value.
+        """
+        rebuild = _rebuild if rebuild is None else rebuild
+        canonical: Dict[Fingerprint, Any] = {}
+        seen: Dict[int, Any] = {}
+
+        def visit(x: Any) -> Any:
+            if isinstance(x, (str, int, float, Enum)) or x is None:
+                return x
+            try:
+                return seen[id(x)]
+            except KeyError:
+                pass
+            fingerprint = self(x)
+            try:
+                rv = canonical[fingerprint]
+            except KeyError:
+                rv = canonical[fingerprint] = rebuild(x, visit)
+                if rv is not x:
+                    self._memo[id(rv)] = (rv, fingerprint)
+            seen[id(x)] = rv
+            return rv
+
+        return visit(value)
+
+
+def _sized(data: bytes) -> bytes:
+    return len(data).to_bytes(4, 'little') + data
+
+
+_MAPPING = _sized(b'M')
+_LIST = _sized(b'L')
+_SET = _sized(b'S')
+
+
+_tags: Dict[Any, bytes] = {}
+
+
+def _tag(cls: Any) -> bytes:
+    try:
+        return _tags[cls]
+    except KeyError:
+        rv = _tags[cls] = _sized(cls.__qualname__.encode())
+        return rv
+
+
+def _rebuild(value: Any, visit: Callable[[Any], Any]) -> Any:
+    """ Copy of ``value`` with its children replaced by ``visit(child)``, or ``value`` itself
+    if none of them is replaced
+    """
+    if isinstance(value, tuple):
+        children = [visit(x) for x in value]
+        if all(a is b for a, b in zip(children, value)):
+            return value
+        rebuilt: Any = type(value)
+        return rebuilt._make(children) if hasattr(value, '_fields') else tuple(children)
+    if isinstance(value, abc.Mapping):
+        items = [(visit(k), visit(v)) for k, v in value.items()]
+        if all(a is k and b is v for (a, b), (k, v) in zip(items, value.items())):
+            return value
+        return pmap(items) if isinstance(value, PMap) else dict(items)
+    if isinstance(value, (frozenset, set)):
+        members = [visit(x) for x in value]
+        if all(a is b for a, b in zip(members, value)):
+            return value
+        return type(value)(members)
+    if isinstance(value, (list, PVector)):
+        children = [visit(x) for x in value]
+        if all(a is b for a, b in zip(children, value)):
+            return value
+        return pvector(children) if isinstance(value, PVector) else children
+    return value
+
+
+_PROMOTABLE = (ObjectValue, InlinedObjectValue, ObjectWithAdditionalProperties, ArrayValue,
+               ProductSchemaType, UnionSchemaTypeAny, UnionSchemaTypeOne)
+
+
+def _is_promotable(schema: Any) -> bool:
+    """ Whether a schema has enough structure to be worth a component of its own:
+    objects with properties, compositions, and arrays and maps of those
+    """
+    if isinstance(schema, (ObjectValue, InlinedObjectValue)):
+        return bool(schema.properties)
+    if isinstance(schema, (ProductSchemaType, UnionSchemaTypeAny, UnionSchemaTypeOne)):
+        return True
+    if isinstance(schema, ArrayValue):
+        return _is_promotable(schema.items)
+    if isinstance(schema, ObjectWithAdditionalProperties):
+        return _is_promotable(schema.additional_properties)
+    return False
+
+
+class DuplicateSchema(NamedTuple):
+    schema: Any
+    pointers: Sequence[str]
+    """ JSON pointers to the inline occurrences of the schema in the serialized spec
+    """
+    component: Optional[str]
+    """ Name of a component schema that is equal to the inline ones, if any
+    """
+
+
+Path = List[Union[str, int]]
+
+
+def _walk(value: Any, path: Path, visit: Callable[[Path, Any], bool]) -> None:
+    """ Visits promotable schemas found in ``value`` with their locations in the serialized spec.
+    ``visit(path, schema)`` returns whether to descend into the schema.
+    """
+    if isinstance(value, (str, int, float, Enum)) or value is None:
+        return
+    if isinstance(value, _PROMOTABLE) and _is_promotable(value) and not visit(path, value):
+        return
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        cls = type(value)
+        for field, x in zip(value._fields, value):
+            _walk(x, path + [_field_key(cls, field)], visit)
+    elif isinstance(value, abc.Mapping):
+        for k, x in value.items():
+            _walk(x, path + [_key_text(k)], visit)
+    elif isinstance(value, (list, tuple, PVector)):
+        for i, x in enumerate(value):
+            _walk(x, path + [i], visit)
+    # members of sets, such as operation parameters, are hashable, which promotable schemas
+    # with their mappings and lists of properties are not
+
+
+_field_keys: Dict[Tuple[Any, str], str] = {}
+
+
+def _field_key(cls: Any, field: str) -> str:
+    """ Key of a named tuple field in the serialized spec
+    """
+    try:
+        return _field_keys[(cls, field)]
+    except KeyError:
+        pass
+    rv = _field_keys[(cls, field)] = (overrides.get(getattr(cls, field), None)
+                                      or camelize(field, uppercase_first_letter=False))
+    return rv
+
+
+def _key_text(key: Any) -> str:
+    if isinstance(key, ContentTypeTag):
+        return key.format + (f';charset={key.charset}' if key.charset else '')
+    return str(key)
+
+
+def duplicate_schemas(spec: OpenAPI, fingerprints: Optional[Fingerprints] = None) -> List[DuplicateSchema]:
+    """ Lists inline schemas that occur more than once, or that are equal to a component schema,
+    which could be replaced with references to ``components.schemas``.
+    Duplicates nested in reported duplicates are not reported separately.
+    """
+    fingerprints = Fingerprints() if fingerprints is None else fingerprints
+    components: Dict[Fingerprint, str] = {}
+    for name, schema in spec.components.schemas.items():
+        components.setdefault(fingerprints(schema), name)
+
+    def is_component(path: Path) -> bool:
+        return len(path) == 3 and path[:2] == ['components', 'schemas']
+
+    counts: Dict[Fingerprint, int] = {}
+
+    def count(path: Path, schema: Any) -> bool:
+        if not is_component(path):
+            fingerprint = fingerprints(schema)
+            counts[fingerprint] = counts.get(fingerprint, 0) + 1
+        return True
+
+    found: Dict[Fingerprint, List[str]] = {}
+    first: Dict[Fingerprint, Any] = {}
+
+    def collect(path: Path, schema: Any) -> bool:
+        if is_component(path):
+            return True
+        fingerprint = fingerprints(schema)
+        if counts[fingerprint] < 2 and fingerprint not in components:
+            return True
+        found.setdefault(fingerprint, []).append(json_pointer(path))
+        first.setdefault(fingerprint, schema)
+        # the rest of the schema is duplicated as a whole
+        return False
+
+    _walk(spec, [], count)
+    _walk(spec, [], collect)
+    rv = [
+        DuplicateSchema(schema=first[fingerprint], pointers=pointers, component=components.get(fingerprint))
+        for fingerprint, pointers in found.items()
+        if len(pointers) > 1 or fingerprint in components
+    ]
+    rv.sort(key=lambda x: (-len(x.pointers), x.pointers[0]))
+    return rv
@@ -0,0 +1,174 @@
+from collections import abc
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Union
+
+from pyrsistent import PMap, PVector, pmap, pvector
+
+from . import OpenAPI, PathItem
+from .operations import OperationKey, _operations
+from .resolver import COMPONENT_LOCATIONS, _index, _strongly_connected, iter_refs
+from .routing import METHODS
+from .values import Ref, RefTo
+
+
+__all__ = (
+    'DependencyGraph',
+    'extract',
+)
+
+
+Node = Union[Ref, OperationKey]
+
+
+class DependencyGraph:
+    """ References from operations and components of a spec to components, through schemas, parameters,
+    request bodies, responses and headers, and from operations to the security schemes they require.
+    Built with a single pass over every operation and component.
+
+    >>> graph = DependencyGraph(spec)
+    >>> graph.reachable([OperationKey('/pets', 'get')])
+    {Ref(location=<RefTo.SCHEMAS: '#/components/schemas/'>, name='Pet')}
+    """
+    def __init__(self, spec: OpenAPI) -> None:
+        self.spec = spec
+        self.components: Mapping[Ref, Any] = _index(spec.components)
+        """ Every component of the spec, by the reference that would point to it
+        """
+        self.operations: Mapping[OperationKey, Any] = {
+            key: operation
+            for template, item in spec.paths.items()
+            for key, operation in _operations(template, item)
+        }
+        # references of a path item outside of its operations belong to every operation of it
+        shared = {template: _refs(_without_operations(item)) for template, item in spec.paths.items()}
+        default_security = _security_refs(spec.security)
+        edges: Dict[Node, FrozenSet[Ref]] = {
+            key: _refs(operation) | shared[key.template] | (
+                default_security if operation.security is None else _security_refs(operation.security)
+            )
+            for key, operation in self.operations.items()
+        }
+        edges.update((ref, _refs(target)) for ref, target in self.components.items())
+        self.edges: Mapping[Node, FrozenSet[Ref]] = edges
+        """ References found in every operation and component, including dangling ones
+        """
+        self._dependents: Optional[Dict[Ref, Set[Node]]] = None
+
+    def dependencies(self, node: Node) -> FrozenSet[Ref]:
+        """ Components that ``node`` refers to directly
+        """
+        return self.edges[node]
+
+    def dependents(self, ref: Ref) -> FrozenSet[Node]:
+        """ Operations and components that refer to ``ref`` directly
+        """
+        if self._dependents is None:
+            self._dependents = {}
+            for node, refs in self.edges.items():
+                for x in refs:
+                    self._dependents.setdefault(x, set()).add(node)
+        return frozenset(self._dependents.get(ref, ()))
+
+    def reachable(self, roots: Iterable[Node]) -> Set[Ref]:
+        """ Components that ``roots`` refer to, directly or transitively, including the components among roots.
+        Dangling references are not followed.
+        """
+        rv: Set[Ref] = set()
+        pending = [x for x in roots if x in self.edges]
+        rv.update(x for x in pending if isinstance(x, Ref))
+        while pending:
+            for ref in self.edges[pending.pop()]:
+                if ref not in rv and ref in self.components:
+                    rv.add(ref)
+                    pending.append(ref)
+        return rv
+
+    def unused(self) -> Set[Ref]:
+        """ Components that no operation needs
+        """
+        return set(self.components) - self.reachable(self.operations)
+
+    def order(self) -> Sequence[FrozenSet[Ref]]:
+        """ Components in topological order, dependencies first, in groups: every group is either
+        a single component, or components that refer to each other, directly or transitively.
+        """
+        edges = {ref: frozenset(x for x in self.edges[ref] if x in self.components) for ref in self.components}
+        return list(_strongly_connected(edges))
+
+
+def _without_operations(item: PathItem) -> PathItem:
+    operations: Dict[str, Any] = dict.fromkeys(METHODS)
+    return item._replace(**operations)
+
+
+def _refs(value: Any) -> FrozenSet[Ref]:
+    # components such as request bodies, links and callbacks are kept as raw data, with '$ref' strings
+    return frozenset(iter_refs(value, raw=True))
+
+
+def _security_refs(requirements: Any) -> FrozenSet[Ref]:
+    """ Security schemes are required by their names rather than references
+    """
+    return frozenset(
+        Ref(RefTo.SECURITY_SCHEMES, name)
+        for requirement in requirements or () if isinstance(requirement, abc.Mapping)
+        for name in requirement
+    )
+
+
+def extract(spec: OpenAPI,
+            operations: Iterable[Union[OperationKey, str]] = (),
+            tags: Iterable[str] = (),
+            graph: Optional[DependencyGraph] = None) -> OpenAPI:
+    """ Returns a spec with only the selected operations, given by their keys or operation ids,
+    and operations with any of ``tags``, along with the components and the tags they need, and nothing else
+    from ``components`` and ``tags``.
+    """
+    graph = DependencyGraph(spec) if graph is None else graph
+    wanted = set(operations)
+    tags = set(tags)
+    selected: List[OperationKey] = [
+        key for key, operation in graph.operations.items()
+        if key in wanted or operation.operation_id in wanted or not tags.isdisjoint(operation.tags)
+    ]
+
+    paths: Dict[str, PathItem] = {}
+    for key in selected:
+        item = paths.get(key.template) or _without_operations(spec.paths[key.template])
+        paths[key.template] = item._replace(**{key.method: graph.operations[key]})
+    # path items are kept in the order of the spec
+    paths = {template: paths[template] for template in spec.paths if template in paths}
+
+    # requirements of the whole spec stay in the spec, even if the selected operations override them
+    needed = graph.reachable([*selected, *(x for x in _security_refs(spec.security) if x in graph.components)])
+    kept: Dict[str, Dict[str, Any]] = {attr: {} for attr in COMPONENT_LOCATIONS.values()}
+    for ref, target in graph.components.items():
+        if ref in needed:
+            kept[COMPONENT_LOCATIONS[ref.location]][ref.name] = target
+
+    components: Dict[str, Any] = {attr: _ordered(kept[attr], getattr(spec.components, attr)) for attr in kept}
+    used_tags = {tag for x in selected for tag in graph.operations[x].tags}
+    return spec._replace(
+        paths=paths,
+        components=spec.components._replace(**components),
+        tags=_filtered(spec.tags, lambda x: x.name in used_tags),
+    )
+
+
+def _filtered(original: Sequence[Any], keep: Callable[[Any], bool]) -> Sequence[Any]:
+    """ Kept items in the order of the spec, and of the same sequence type
+    """
+    items = [x for x in original if keep(x)]
+    if len(items) == len(original):
+        return original
+    if isinstance(original, PVector):
+        return pvector(items)
+    return tuple(items) if isinstance(original, tuple) else items
+
+
+def _ordered(kept: Mapping[str, Any], original: Mapping[str, Any]) -> Mapping[str, Any]:
+    """ Kept components in the order of the spec, and of the same mapping type
+    """
+    items = [(k, v) for k, v in original.items() if k in kept]
+    if len(items) == len(original):
+        return original
+    return pmap(dict(items)) if isinstance(original, PMap) else dict(items)
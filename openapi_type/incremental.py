@@ -0,0 +1,202 @@
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from typeit.schema.errors import Invalid
+
+from . import OpenAPI, _parse_spec, _spec_node
+from .parallel import LocatedError, ParseError
+from .pointer import json_pointer, invalid_pointers
+from .values import InternPool, interning
+
+
+__all__ = ('IncrementalParser', 'ParseStats', 'SECTIONS')
+
+
+Location = Tuple[str, ...]
+
+SECTIONS: Mapping[str, str] = {
+    'schemas': 'schemas',
+    'links': 'links',
+    'parameters': 'parameters',
+    'responses': 'responses',
+    'headers': 'headers',
+    'requestBodies': 'request_bodies',
+    'securitySchemes': 'security_schemes',
+}
+""" Serialized keys of ``components`` members, with the attributes of ``Components`` they are parsed into
+"""
+
+
+class ParseStats(NamedTuple):
+    reparsed: int
+    """ Entries of ``paths`` and members of ``components`` parsed by the last call
+    """
+    total: int
+    skeleton: bool
+    """ Whether the rest of the spec was parsed too
+    """
+
+
+class _Entry(NamedTuple):
+    raw: Any
+    key: Any
+    value: Any
+
+
+class _Section(NamedTuple):
+    raw: Mapping[str, Any]
+    entries: Dict[str, _Entry]
+    parsed: Dict[Any, Any]
+
+
+class IncrementalParser:
+    """ Parses successive versions of a spec, e.g. as it is being edited. Every entry of ``paths``
+    and every member of ``components`` is re-parsed only if its raw data changed since the previous version;
+    parsed values of unchanged entries are reused as they are. The rest of the spec is small,
+    and it is re-parsed whenever any of it changes. The result is equal to the one of ``parse_spec(data)``.
+
+    Raw entries are compared by identity first, so loaders that reuse unchanged subtrees of the previous
+    document make the comparison nearly free. The data of the last version is kept for the comparison,
+    so every version has to be a new document rather than the previous one modified in place.
+
+    >>> parser = IncrementalParser()
+    >>> spec = parser.parse(data)
+    >>> spec = parser.parse(edited_data)
+    >>> parser.stats
+    ParseStats(reparsed=1, total=10000, skeleton=False)
+    """
+    def __init__(self, pool: Optional[InternPool] = None) -> None:
+        self.spec: Optional[OpenAPI] = None
+        """ The last successfully parsed spec
+        """
+        self.stats = ParseStats(0, 0, False)
+        self._pool = InternPool() if pool is None else pool
+        self._skeleton: Any = None
+        self._parsed_skeleton: Optional[OpenAPI] = None
+        self._sections: Dict[Location, _Section] = {}
+
+    def parse(self, data: Mapping[str, Any]) -> OpenAPI:
+        """ Parses the next version of the spec. Invalid entries are reported with ``ParseError``,
+        pointing to their location in ``data``, and the state of the parser stays at the previous version.
+        """
+        split = _split(data, self._sections)
+        if split is None:
+            # let the strict parser report the error
+            with interning(self._pool):
+                spec = _parse_spec(data)
+            self._reset(spec)
+            return spec
+        skeleton, raw_sections = split
+
+        with interning(self._pool):
+            parsed_skeleton = self._parsed_skeleton
+            reparse_skeleton = parsed_skeleton is None or not _same(skeleton, self._skeleton)
+            if reparse_skeleton:
+                parsed_skeleton = _parse_spec(skeleton)
+
+            sections: Dict[Location, _Section] = {}
+            errors: List[LocatedError] = []
+            reparsed = total = 0
+            for location, raw in raw_sections.items():
+                total += len(raw)
+                previous = self._sections.get(location)
+                if previous is not None and previous.raw is raw:
+                    sections[location] = previous
+                    continue
+                known = {} if previous is None else previous.entries
+                if previous is not None and list(raw) == list(previous.raw):
+                    # the same keys, in the same order: only the values that are not shared may have changed
+                    entries = dict(known)
+                    parsed = dict(previous.parsed)
+                    keys = [k for k, a, b in zip(raw, raw.values(), previous.raw.values()) if a is not b]
+                else:
+                    entries, parsed, keys = {}, {}, list(raw)
+                mapping_type = _mapping_type(location)
+                for key in keys:
+                    value = raw[key]
+                    entry = known.get(key)
+                    if entry is not None and _same(entry.raw, value):
+                        entries[key] = entry
+                        parsed[entry.key] = entry.value
+                        continue
+                    reparsed += 1
+                    try:
+                        entry = entries[key] = _Entry(value, mapping_type.key_node.deserialize(key),
+                                                      mapping_type.value_node.deserialize(value))
+                    except Invalid as e:
+                        prefix = json_pointer([*location, key])
+                        errors.extend(LocatedError(pointer=prefix + pointer, reason=reason)
+                                      for pointer, reason in invalid_pointers(e, value))
+                    else:
+                        parsed[entry.key] = entry.value
+                sections[location] = _Section(raw, entries, parsed)
+
+        if errors:
+            raise ParseError(errors, data)
+
+        assert parsed_skeleton is not None
+        spec = _splice(parsed_skeleton, sections)
+        self.spec = spec
+        self.stats = ParseStats(reparsed, total, reparse_skeleton)
+        self._skeleton = skeleton
+        self._parsed_skeleton = parsed_skeleton
+        self._sections = sections
+        return spec
+
+    def _reset(self, spec: OpenAPI) -> None:
+        self.spec = spec
+        self.stats = ParseStats(0, 0, True)
+        self._skeleton = None
+        self._parsed_skeleton = None
+        self._sections = {}
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or a == b
+
+
+def _is_splittable(value: Any, previous: Optional['_Section']) -> bool:
+    if not isinstance(value, Mapping):
+        return False
+    if previous is not None and (value is previous.raw or value.keys() == previous.raw.keys()):
+        return True
+    return all(isinstance(k, str) for k in value)
+
+
+def _split(data: Mapping[str, Any],
+           previous: Mapping[Location, '_Section']) -> Optional[Tuple[Mapping[str, Any], Dict[Location, Any]]]:
+    """ Separates the entries of ``paths`` and the members of ``components`` from the rest of the spec
+    """
+    raw_paths = data.get('paths')
+    if not _is_splittable(raw_paths, previous.get(('paths',))):
+        return None
+    sections: Dict[Location, Any] = {('paths',): raw_paths}
+    skeleton = {**data, 'paths': {}}
+    raw_components = data.get('components')
+    if isinstance(raw_components, Mapping):
+        components = dict(raw_components)
+        for key in SECTIONS:
+            # sections that cannot be split are left for the strict parser to report
+            location = ('components', key)
+            if key in raw_components and _is_splittable(raw_components[key], previous.get(location)):
+                sections[location] = raw_components[key]
+                components[key] = {}
+        skeleton['components'] = components
+    return skeleton, sections
+
+
+def _mapping_type(location: Location) -> Any:
+    if location == ('paths',):
+        return _spec_node()['paths'].typ
+    return _spec_node()['components'][location[1]].typ
+
+
+def _splice(spec: OpenAPI, sections: Mapping[Location, _Section]) -> OpenAPI:
+    components = {}
+    for location, section in sections.items():
+        if location == ('paths',):
+            spec = spec._replace(paths=section.parsed)
+        else:
+            components[SECTIONS[location[1]]] = section.parsed
+    if components:
+        spec = spec._replace(components=spec.components._replace(**components))
+    return spec
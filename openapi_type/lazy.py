@@ -0,0 +1,83 @@
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from typeit.schema.errors import errors_aware_constructor
+
+from . import OpenAPI, PathItem, parse_spec, _spec_node
+from .values import InternPool, interning
+
+
+__all__ = ('LazyPaths', 'parse_spec_lazy', 'force')
+
+
+class LazyPaths(Mapping[str, PathItem]):
+    """ A mapping of path templates to ``PathItem``, which keeps every item as raw data
+    until the item is accessed for the first time. Parsed items are memoized,
+    and share interned values with the rest of the spec through ``pool``.
+    """
+    __slots__ = ('_raw', '_parsed', '_pool')
+
+    def __init__(self, raw: Mapping[str, Any], pool: InternPool) -> None:
+        self._raw = raw
+        self._parsed: Dict[str, PathItem] = {}
+        self._pool = pool
+
+    def __getitem__(self, path: str) -> PathItem:
+        try:
+            return self._parsed[path]
+        except KeyError:
+            pass
+        with interning(self._pool):
+            rv = self._parsed[path] = errors_aware_constructor(_path_item_node().deserialize, self._raw[path])
+        return rv
+
+    def __contains__(self, path: object) -> bool:
+        # the inherited check would parse the item
+        return path in self._raw
+
+    def get(self, path: str, default: Any = None) -> Any:
+        if path not in self._raw:
+            return default
+        return self[path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f'LazyPaths(parsed={len(self._parsed)}, total={len(self._raw)})'
+
+    def force(self) -> Dict[str, PathItem]:
+        """ Parses all remaining items and returns the same mapping as the strict ``parse_spec`` does
+        """
+        return {k: self[k] for k in self._raw}
+
+    def __reduce__(self):
+        return (dict, (self.force(),))
+
+
+def _path_item_node() -> Any:
+    return _spec_node()['paths'].typ.value_node
+
+
+def parse_spec_lazy(data: Mapping[str, Any], pool: Optional[InternPool] = None) -> OpenAPI:
+    """ Same as ``parse_spec``, except that ``OpenAPI.paths`` is a ``LazyPaths`` mapping:
+    the top-level structure and ``components`` are validated immediately,
+    every ``PathItem`` is parsed on first access.
+    """
+    pool = InternPool() if pool is None else pool
+    raw_paths = data.get('paths')
+    if not isinstance(raw_paths, Mapping) or not all(isinstance(k, str) for k in raw_paths):
+        # let the strict parser report the error
+        return parse_spec(data, pool=pool)
+    spec = parse_spec({**data, 'paths': {}}, pool=pool)
+    return spec._replace(paths=LazyPaths(raw_paths, pool))
+
+
+def force(spec: OpenAPI) -> OpenAPI:
+    """ Returns the spec with all lazily parsed parts parsed, so that it is equal to the output of ``parse_spec``
+    """
+    if isinstance(spec.paths, LazyPaths):
+        return spec._replace(paths=spec.paths.force())
+    return spec
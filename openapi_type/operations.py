@@ -0,0 +1,177 @@
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from . import OpenAPI, Operation, PathItem, Reference, RequestBody, Response
+from .resolver import Resolver, UnresolvedReference, ReferenceCycle
+from .routing import METHODS
+from .values import ContentTypeTag, _content_type_tag
+
+
+__all__ = (
+    'OperationKey',
+    'OperationIndex',
+)
+
+
+class OperationKey(NamedTuple):
+    template: str
+    """ Key of ``OpenAPI.paths``
+    """
+    method: str
+    """ Name of the ``PathItem`` field, e.g. ``get``
+    """
+
+
+# ordered sets of operation keys
+_Keys = Dict[OperationKey, None]
+
+
+class OperationIndex:
+    """ Indexes operations of a spec by ``operation_id``, tag, method, and media types of requests and responses.
+    All lookups are dictionary lookups; operation ids used by more than one operation are reported
+    by ``duplicate_ids``.
+
+    When a spec is rebuilt from a previous one, e.g. with ``spec._replace(paths=pmap(spec.paths).set(...))``
+    or with an evolver of the paths, ``update()`` reindexes only the path items that are not the same objects
+    as before.
+    """
+    def __init__(self, spec: OpenAPI) -> None:
+        self.spec = spec
+        self._resolver = Resolver(spec)
+        self._paths: Dict[str, PathItem] = {}
+        self._ids: Dict[str, _Keys] = {}
+        self._tags: Dict[str, _Keys] = {}
+        self._methods: Dict[str, _Keys] = {}
+        self._consumes: Dict[ContentTypeTag, _Keys] = {}
+        self._produces: Dict[ContentTypeTag, _Keys] = {}
+        self._duplicate_ids: Dict[str, None] = {}
+        self._indexed: Dict[str, List[Tuple[Dict[Any, _Keys], Any, OperationKey]]] = {}
+        for template, item in spec.paths.items():
+            self.set_path(template, item)
+
+    def __getitem__(self, key: OperationKey) -> Operation:
+        rv = getattr(self._paths[key.template], key.method) if key.template in self._paths else None
+        if rv is None:
+            raise KeyError(key)
+        return rv
+
+    def __len__(self) -> int:
+        return sum(len(x) for x in self._methods.values())
+
+    def __iter__(self) -> Iterator[OperationKey]:
+        for template, item in self._paths.items():
+            for key, _ in _operations(template, item):
+                yield key
+
+    def by_id(self, operation_id: str) -> Optional[OperationKey]:
+        """ Returns the first operation with ``operation_id``, see ``duplicate_ids`` for ids used more than once
+        """
+        keys = self._ids.get(operation_id)
+        return next(iter(keys)) if keys else None
+
+    def tagged(self, tag: str) -> Sequence[OperationKey]:
+        return list(self._tags.get(tag, ()))
+
+    def with_method(self, method: str) -> Sequence[OperationKey]:
+        return list(self._methods.get(method.lower(), ()))
+
+    def consuming(self, media_type: ContentTypeTag) -> Sequence[OperationKey]:
+        """ Operations that accept request bodies of ``media_type``
+        """
+        return list(self._consumes.get(media_type, ()))
+
+    def producing(self, media_type: ContentTypeTag) -> Sequence[OperationKey]:
+        """ Operations that respond with ``media_type``
+        """
+        return list(self._produces.get(media_type, ()))
+
+    @property
+    def duplicate_ids(self) -> Mapping[str, Sequence[OperationKey]]:
+        """ Operation ids that are used by more than one operation, which the spec does not allow
+        """
+        return {x: list(self._ids[x]) for x in self._duplicate_ids}
+
+    def update(self, spec: OpenAPI) -> None:
+        """ Brings the index in line with ``spec``, reindexing only the path items that changed
+        """
+        if spec.components is not self.spec.components:
+            # responses of operations may refer to components that changed
+            self._resolver = Resolver(spec)
+            changed = set(self._paths) | set(spec.paths)
+        else:
+            changed = {k for k, v in spec.paths.items() if self._paths.get(k) is not v}
+            changed.update(k for k in self._paths if k not in spec.paths)
+        self.spec = spec
+        for template in changed:
+            if template in spec.paths:
+                self.set_path(template, spec.paths[template])
+            else:
+                self.remove_path(template)
+
+    def set_path(self, template: str, item: PathItem) -> None:
+        """ Indexes ``item`` in place of the previous item of ``template``, if any
+        """
+        self.remove_path(template)
+        self._paths[template] = item
+        entries = self._indexed[template] = [
+            (index, value, key)
+            for key, operation in _operations(template, item)
+            for index, value in self._entries(key, operation)
+        ]
+        for index, value, key in entries:
+            keys = index.setdefault(value, {})
+            keys[key] = None
+            if index is self._ids and len(keys) > 1:
+                self._duplicate_ids[value] = None
+
+    def remove_path(self, template: str) -> None:
+        if self._paths.pop(template, None) is None:
+            return
+        # entries are removed as they were indexed, even if referenced components changed since
+        for index, value, key in self._indexed.pop(template):
+            keys = index[value]
+            del keys[key]
+            if not keys:
+                del index[value]
+            if index is self._ids and len(keys) < 2:
+                self._duplicate_ids.pop(value, None)
+
+    def _entries(self, key: OperationKey, operation: Operation) -> Iterator[Tuple[Dict[Any, _Keys], Any]]:
+        yield self._methods, key.method
+        if operation.operation_id:
+            yield self._ids, operation.operation_id
+        for tag in operation.tags:
+            yield self._tags, tag
+        request_body = self._resolve(operation.request_body)
+        if isinstance(request_body, RequestBody):
+            for media_type in request_body.content:
+                yield self._consumes, media_type
+        elif isinstance(request_body, Mapping) and isinstance(request_body.get('content'), Mapping):
+            # request bodies of components are kept as raw data
+            for raw in request_body['content']:
+                if isinstance(raw, str):
+                    yield self._consumes, _content_type_tag(raw)
+        produces: Dict[ContentTypeTag, None] = {}
+        for response in operation.responses.values():
+            response = self._resolve(response)
+            if isinstance(response, Response):
+                produces.update(dict.fromkeys(response.content))
+        for media_type in produces:
+            yield self._produces, media_type
+
+
+    def _resolve(self, value: Any) -> Any:
+        """ The target of a reference, or ``None`` for a dangling reference, which contributes nothing to the index
+        """
+        if isinstance(value, Reference):
+            try:
+                return self._resolver.resolve(value)
+            except (UnresolvedReference, ReferenceCycle):
+                return None
+        return value
+
+
+def _operations(template: str, item: PathItem) -> Iterator[Tuple[OperationKey, Operation]]:
+    for method in METHODS:
+        operation = getattr(item, method)
+        if operation is not None:
+            yield OperationKey(template, method), operation
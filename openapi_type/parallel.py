@@ -0,0 +1,145 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from typeit.schema.errors import Error, Invalid
+
+from . import OpenAPI, _parse_spec, _spec_node
+from .values import InternPool, interning
+from .pointer import json_pointer, invalid_pointers
+
+
+__all__ = ('parse_parallel', 'ParseError', 'LocatedError')
+
+
+_CHUNK_LOCATIONS = {
+    'paths': ('paths',),
+    'schemas': ('components', 'schemas'),
+}
+CHUNKS_PER_WORKER = 4
+
+
+class LocatedError(NamedTuple):
+    pointer: str
+    """ JSON pointer to the invalid value in the original data
+    """
+    reason: str
+
+    def __repr__(self) -> str:
+        return f'{self.pointer}: {self.reason}'
+
+
+class ParseError(Error):
+    """ Reports invalid entries of a spec parsed in chunks. It is a typeit ``Error``, like the errors
+    of ``parse_spec(data)``, but it has no single ``validation_error``: it iterates over ``LocatedError`` items
+    instead of ``InvalidData``.
+    """
+    def __init__(self, errors: Sequence[LocatedError], sample_data: Any = None) -> None:
+        super().__init__(validation_error=None, sample_data=sample_data)
+        self.errors = errors
+
+    def __iter__(self) -> Iterator[LocatedError]:
+        return iter(self.errors)
+
+    def __repr__(self) -> str:
+        return ''.join(f'\n({i}) {x!r}' for i, x in enumerate(self.errors, start=1))
+
+    __str__ = __repr__
+
+
+def _chunk_node(kind: str) -> Any:
+    if kind == 'paths':
+        return _spec_node()['paths'].typ.value_node
+    return _spec_node()['components']['schemas'].typ.value_node
+
+
+ChunkResult = Tuple[List[Tuple[str, Any]], List[LocatedError]]
+
+
+def _parse_chunk(kind: str, items: List[Tuple[str, Any]], pool: Optional[InternPool] = None) -> ChunkResult:
+    node = _chunk_node(kind)
+    location = _CHUNK_LOCATIONS[kind]
+    parsed = []
+    errors: List[LocatedError] = []
+    with interning(InternPool() if pool is None else pool):
+        for key, value in items:
+            try:
+                parsed.append((key, node.deserialize(value)))
+            except Invalid as e:
+                prefix = json_pointer([*location, key])
+                errors.extend(
+                    LocatedError(pointer=prefix + pointer, reason=reason)
+                    for pointer, reason in invalid_pointers(e, value)
+                )
+    return parsed, errors
+
+
+def _chunks(mapping: Mapping[str, Any], size: int) -> Iterator[List[Tuple[str, Any]]]:
+    items = iter(mapping.items())
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _is_splittable(value: Any) -> bool:
+    return isinstance(value, Mapping) and all(isinstance(k, str) for k in value)
+
+
+def _split(data: Mapping[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Mapping[str, Any]]]]:
+    """ Separates ``paths`` and ``components.schemas`` from the rest of the spec,
+    unless they are not mappings of strings, in which case the serial parser has to report the error
+    """
+    raw_paths: Any = data.get('paths')
+    raw_components: Any = data.get('components')
+    raw_schemas: Any = raw_components.get('schemas') if isinstance(raw_components, Mapping) else None
+    if not _is_splittable(raw_paths) or not (raw_schemas is None or _is_splittable(raw_schemas)):
+        return None
+
+    skeleton = {**data, 'paths': {}}
+    sections = {'paths': raw_paths}
+    if raw_schemas is not None:
+        skeleton['components'] = {**raw_components, 'schemas': {}}
+        sections['schemas'] = raw_schemas
+    return skeleton, sections
+
+
+def _join(spec: OpenAPI, parsed: Mapping[str, Dict[str, Any]]) -> OpenAPI:
+    """ Puts the sections separated by ``_split`` back into the parsed rest of the spec
+    """
+    spec = spec._replace(paths=parsed['paths'])
+    if 'schemas' in parsed:
+        spec = spec._replace(components=spec.components._replace(schemas=parsed['schemas']))
+    return spec
+
+
+def parse_parallel(data: Mapping[str, Any], workers: int) -> OpenAPI:
+    """ Parses ``paths`` and ``components.schemas`` in chunks across a process pool,
+    and the rest of the spec in the current process. The result is equal to the one of ``parse_spec(data)``.
+    Invalid path items and schemas are reported with ``ParseError``, pointing to their location in ``data``.
+    """
+    split = _split(data)
+    if split is None:
+        return _parse_spec(data)
+    skeleton, sections = split
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures: List[Tuple[str, 'Future[ChunkResult]']] = []
+        for kind, raw in sections.items():
+            size = max(1, -(-len(raw) // (workers * CHUNKS_PER_WORKER)))
+            futures.extend((kind, pool.submit(_parse_chunk, kind, chunk)) for chunk in _chunks(raw, size))
+
+        # the rest of the spec is parsed while the pool is busy
+        spec = _parse_spec(skeleton)
+
+        parsed: Dict[str, Dict[str, Any]] = {kind: {} for kind in sections}
+        errors: List[LocatedError] = []
+        for kind, future in futures:
+            chunk_parsed, chunk_errors = future.result()
+            parsed[kind].update(chunk_parsed)
+            errors.extend(chunk_errors)
+
+    if errors:
+        raise ParseError(errors, data)
+    return _join(spec, parsed)
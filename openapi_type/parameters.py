@@ -0,0 +1,403 @@
+import re
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, unquote_plus
+
+from . import (
+    Operation, OperationParameter, ParamLocation, ParamStyle, Reference,
+    StringValue, IntegerValue, FloatValue, BooleanValue, ArrayValue, ObjectValue, InlinedObjectValue,
+)
+from .resolver import Resolver
+
+
+__all__ = (
+    'ParameterError',
+    'DecodedParameters',
+    'ParameterDecoder',
+    'string_decoder',
+    'parse_query',
+)
+
+
+class ParameterError(ValueError):
+    def __init__(self, location: ParamLocation, name: str, reason: str) -> None:
+        super().__init__(f'{location.value} parameter {name!r}: {reason}')
+        self.location = location
+        self.name = name
+        self.reason = reason
+
+
+class DecodedParameters(NamedTuple):
+    path: Mapping[str, Any]
+    query: Mapping[str, Any]
+    header: Mapping[str, Any]
+    cookie: Mapping[str, Any]
+
+
+DEFAULT_STYLES: Mapping[ParamLocation, ParamStyle] = {
+    ParamLocation.PATH: ParamStyle.SIMPLE,
+    ParamLocation.QUERY: ParamStyle.FORM,
+    ParamLocation.HEADER: ParamStyle.SIMPLE,
+    ParamLocation.COOKIE: ParamStyle.FORM,
+}
+""" https://swagger.io/specification/#parameter-style
+"""
+
+
+Convert = Callable[[str], Any]
+StringDecoder = Callable[[str], Any]
+QueryDecoder = Callable[[Mapping[str, List[str]]], Any]
+
+
+class _Shape(NamedTuple):
+    """ What a parameter value decodes to, derived from its schema once
+    """
+    convert: Convert
+    """ Converts a primitive value, or every item of an array
+    """
+    is_array: bool = False
+    is_object: bool = False
+    properties: Mapping[str, Convert] = {}
+    """ Converters of the declared object properties; undeclared properties are kept as strings
+    """
+
+
+def _boolean(value: str) -> bool:
+    if value == 'true':
+        return True
+    if value == 'false':
+        return False
+    raise ValueError(f'{value!r} is not a boolean')
+
+
+_INTEGER = re.compile(r'-?[0-9]+')
+_NUMBER = re.compile(r'-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?')
+
+
+def _integer(value: str) -> int:
+    # int() also accepts surrounding whitespace, underscores and non-ASCII digits
+    if _INTEGER.fullmatch(value) is None:
+        raise ValueError(f'{value!r} is not an integer')
+    return int(value)
+
+
+def _number(value: str) -> float:
+    # float() also accepts 'nan', 'inf', surrounding whitespace, underscores and non-ASCII digits
+    if _NUMBER.fullmatch(value) is None:
+        raise ValueError(f'{value!r} is not a number')
+    return float(value)
+
+
+def _enum(allowed: FrozenSet[str]) -> Convert:
+    def convert(value: str) -> str:
+        if value not in allowed:
+            raise ValueError(f'{value!r} is not one of {sorted(allowed)}')
+        return value
+    return convert
+
+
+def _convert(schema: Any) -> Convert:
+    if isinstance(schema, IntegerValue):
+        return _integer
+    if isinstance(schema, FloatValue):
+        return _number
+    if isinstance(schema, BooleanValue):
+        return _boolean
+    if isinstance(schema, StringValue) and schema.enum:
+        return _enum(frozenset(schema.enum))
+    return str
+
+
+def _shape(schema: Any, resolver: Optional[Resolver]) -> _Shape:
+    schema = _resolve(schema, resolver)
+    if isinstance(schema, ArrayValue):
+        return _Shape(_convert(_resolve(schema.items, resolver)), is_array=True)
+    if isinstance(schema, (ObjectValue, InlinedObjectValue)):
+        return _Shape(str, is_object=True, properties={
+            name: _convert(_resolve(x, resolver)) for name, x in schema.properties.items()
+        })
+    if getattr(schema, 'type', None) == 'object':
+        return _Shape(str, is_object=True)
+    return _Shape(_convert(schema))
+
+
+def _resolve(value: Any, resolver: Optional[Resolver]) -> Any:
+    if isinstance(value, Reference):
+        if resolver is None:
+            raise ValueError(f'A resolver is required for {value.ref}')
+        return resolver.resolve(value)
+    return value
+
+
+def _style(param: OperationParameter) -> Tuple[ParamStyle, bool]:
+    style = DEFAULT_STYLES[param.in_] if param.style is None else param.style
+    explode = style is ParamStyle.FORM if param.explode is None else param.explode
+    return style, explode
+
+
+def _object(shape: _Shape, pairs: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    properties = shape.properties
+    return {k: properties.get(k, str)(v) for k, v in pairs}
+
+
+def _pairs(parts: Sequence[str]) -> Iterable[Tuple[str, str]]:
+    """ ``['role', 'admin', 'firstName', 'Alex']`` as key-value pairs
+    """
+    if len(parts) % 2:
+        raise ValueError('Expected key-value pairs')
+    return zip(parts[::2], parts[1::2])
+
+
+def _assignments(parts: Sequence[str]) -> Iterable[Tuple[str, str]]:
+    """ ``['role=admin', 'firstName=Alex']`` as key-value pairs
+    """
+    for x in parts:
+        k, sep, v = x.partition('=')
+        if not sep:
+            raise ValueError(f'Expected key=value, got {x!r}')
+        yield k, v
+
+
+def _split(value: str, delimiter: str) -> List[str]:
+    return value.split(delimiter) if value else []
+
+
+def _delimited(shape: _Shape, delimiter: str, explode: bool) -> StringDecoder:
+    """ Values of the ``simple`` and ``form`` styles, as well as of the ``label`` style after its prefix
+    """
+    convert = shape.convert
+    if shape.is_array:
+        return lambda value: [convert(x) for x in _split(value, delimiter)]
+    if shape.is_object:
+        if explode:
+            return lambda value: _object(shape, _assignments(_split(value, delimiter)))
+        return lambda value: _object(shape, _pairs(_split(value, delimiter)))
+    return convert
+
+
+def string_decoder(param: OperationParameter, resolver: Optional[Resolver] = None) -> StringDecoder:
+    """ Compiles a decoder of a single raw value of ``param``: a path capture, a header, a cookie,
+    or a non-exploded query value. Raises ``ValueError`` when the value does not match the schema of ``param``.
+    """
+    style, explode = _style(param)
+    shape = _shape(param.schema, resolver)
+
+    if style is ParamStyle.LABEL:
+        decode = _delimited(shape, '.' if explode else ',', explode)
+
+        def label(value: str) -> Any:
+            if not value.startswith('.'):
+                raise ValueError(f'Expected a label value, got {value!r}')
+            return decode(value[1:])
+        return label
+
+    if style is ParamStyle.MATRIX:
+        return _matrix(param.name, shape, explode)
+
+    if style is ParamStyle.SPACE_DELIMITED:
+        return _delimited(shape, ' ', explode)
+    if style is ParamStyle.PIPE_DELIMITED:
+        return _delimited(shape, '|', explode)
+    return _delimited(shape, ',', explode)
+
+
+def _matrix(name: str, shape: _Shape, explode: bool) -> StringDecoder:
+    prefix = f';{name}='
+    convert = shape.convert
+
+    def parameters(value: str) -> List[str]:
+        if not value.startswith(';'):
+            raise ValueError(f'Expected a matrix value, got {value!r}')
+        return value[1:].split(';')
+
+    def strip(x: str) -> str:
+        k, sep, v = x.partition('=')
+        if k != name or not sep:
+            raise ValueError(f'Expected {name}=value, got {x!r}')
+        return v
+
+    if shape.is_array and explode:
+        return lambda value: [convert(strip(x)) for x in parameters(value)]
+    if shape.is_object and explode:
+        return lambda value: _object(shape, _assignments(parameters(value)))
+
+    decode = _delimited(shape, ',', False)
+
+    def matrix(value: str) -> Any:
+        if not value.startswith(prefix):
+            raise ValueError(f'Expected {prefix}value, got {value!r}')
+        return decode(value[len(prefix):])
+    return matrix
+
+
+_Missing = object()
+
+
+def _query_decoder(param: OperationParameter, resolver: Optional[Resolver], declared: frozenset) -> QueryDecoder:
+    """ Compiles a decoder of ``param`` from the query string split into a mapping of keys to their values.
+    Returns ``_Missing`` if the parameter is absent.
+    """
+    style, explode = _style(param)
+    shape = _shape(param.schema, resolver)
+    name = param.name
+
+    if style is ParamStyle.DEEP_OBJECT:
+        if shape.properties:
+            keys = [(f'{name}[{k}]', k, convert) for k, convert in shape.properties.items()]
+
+            def deep_object(values: Mapping[str, List[str]]) -> Any:
+                rv = {k: convert(values[key][0]) for key, k, convert in keys if key in values}
+                return rv if rv else _Missing
+            return deep_object
+
+        prefix = f'{name}['
+
+        def free_form_deep_object(values: Mapping[str, List[str]]) -> Any:
+            rv = {k[len(prefix):-1]: v[0] for k, v in values.items() if k.startswith(prefix) and k.endswith(']')}
+            return rv if rv else _Missing
+        return free_form_deep_object
+
+    if explode and shape.is_array:
+        convert = shape.convert
+
+        def exploded_array(values: Mapping[str, List[str]]) -> Any:
+            try:
+                items = values[name]
+            except KeyError:
+                return _Missing
+            return [convert(x) for x in items]
+        return exploded_array
+
+    if explode and shape.is_object:
+        # every property is a query parameter of its own
+        if shape.properties:
+            properties = list(shape.properties.items())
+
+            def exploded_object(values: Mapping[str, List[str]]) -> Any:
+                rv = {k: convert(values[k][0]) for k, convert in properties if k in values}
+                return rv if rv else _Missing
+            return exploded_object
+
+        def free_form_object(values: Mapping[str, List[str]]) -> Any:
+            rv = {k: v[0] for k, v in values.items() if k not in declared}
+            return rv if rv else _Missing
+        return free_form_object
+
+    decode = string_decoder(param, resolver)
+
+    def single(values: Mapping[str, List[str]]) -> Any:
+        try:
+            value = values[name][0]
+        except KeyError:
+            return _Missing
+        return decode(value)
+    return single
+
+
+def parse_query(query: str) -> Dict[str, List[str]]:
+    """ Splits a raw query string into keys and their values, in one pass
+    """
+    rv: Dict[str, List[str]] = {}
+    for pair in query.split('&'):
+        if not pair:
+            continue
+        k, _, v = pair.partition('=')
+        k = unquote_plus(k) if '%' in k or '+' in k else k
+        v = unquote_plus(v) if '%' in v or '+' in v else v
+        try:
+            rv[k].append(v)
+        except KeyError:
+            rv[k] = [v]
+    return rv
+
+
+def parse_cookies(cookies: str) -> Dict[str, str]:
+    rv = {}
+    for pair in cookies.split(';'):
+        k, sep, v = pair.strip().partition('=')
+        if sep:
+            rv[k] = unquote(v)
+    return rv
+
+
+_Compiled = List[Tuple[str, str, bool, Callable[[Any], Any]]]
+""" Names of parameters in raw requests and in decoded parameters, whether they are required, and their decoders
+"""
+
+
+class ParameterDecoder:
+    """ Decodes parameters of an operation from a raw request, according to the style, explode and schema
+    of every parameter. Decoders of individual parameters are compiled once, when the decoder is created:
+
+    >>> decoder = ParameterDecoder.for_operation(spec.paths['/pets'].get, resolver)
+    >>> decoder.decode(query='tags=dog&tags=cat&limit=10').query
+    {'tags': ['dog', 'cat'], 'limit': 10}
+    """
+    def __init__(self, parameters: Iterable[Union[OperationParameter, Reference]],
+                 resolver: Optional[Resolver] = None) -> None:
+        params: List[OperationParameter] = [_resolve(x, resolver) for x in parameters]
+        declared = frozenset(x.name for x in params if x.in_ is ParamLocation.QUERY)
+        self.parameters = params
+        self._path: _Compiled = []
+        self._query: _Compiled = []
+        self._header: _Compiled = []
+        self._cookie: _Compiled = []
+        for param in params:
+            if param.in_ is ParamLocation.QUERY:
+                compiled = (param.name, param.name, param.required, _query_decoder(param, resolver, declared))
+                self._query.append(compiled)
+            elif param.in_ is ParamLocation.PATH:
+                self._path.append((param.name, param.name, True, string_decoder(param, resolver)))
+            elif param.in_ is ParamLocation.HEADER:
+                # header names are case-insensitive
+                self._header.append((param.name.lower(), param.name, param.required, string_decoder(param, resolver)))
+            else:
+                self._cookie.append((param.name, param.name, param.required, string_decoder(param, resolver)))
+
+    @classmethod
+    def for_operation(cls, operation: Operation, resolver: Optional[Resolver] = None) -> 'ParameterDecoder':
+        return cls(operation.parameters, resolver)
+
+    def decode(self,
+               query: str = '',
+               headers: Optional[Mapping[str, str]] = None,
+               cookies: str = '',
+               path: Optional[Mapping[str, str]] = None) -> DecodedParameters:
+        """ Decodes the raw query string, headers, the raw ``Cookie`` header and the path captures
+        (e.g. ``Route.params`` of the router, before conversion). Raises ``ParameterError``.
+        """
+        rv_query: Dict[str, Any] = {}
+        if self._query:
+            values = parse_query(query)
+            for _, name, required, decode in self._query:
+                try:
+                    value = decode(values)
+                except ValueError as e:
+                    raise ParameterError(ParamLocation.QUERY, name, str(e)) from None
+                if value is _Missing:
+                    if required:
+                        raise ParameterError(ParamLocation.QUERY, name, 'missing')
+                    continue
+                rv_query[name] = value
+
+        rv_header = self._decode(ParamLocation.HEADER, self._header,
+                                 {k.lower(): v for k, v in headers.items()} if self._header and headers else {})
+        rv_cookie = self._decode(ParamLocation.COOKIE, self._cookie,
+                                 parse_cookies(cookies) if self._cookie and cookies else {})
+        rv_path = self._decode(ParamLocation.PATH, self._path, path or {})
+        return DecodedParameters(path=rv_path, query=rv_query, header=rv_header, cookie=rv_cookie)
+
+    @staticmethod
+    def _decode(location: ParamLocation, compiled: _Compiled, values: Mapping[str, str]) -> Dict[str, Any]:
+        rv = {}
+        for key, name, required, decode in compiled:
+            try:
+                raw = values[key]
+            except KeyError:
+                if required:
+                    raise ParameterError(location, name, 'missing') from None
+                continue
+            try:
+                rv[name] = decode(raw)
+            except ValueError as e:
+                raise ParameterError(location, name, str(e)) from None
+        return rv
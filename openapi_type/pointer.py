@@ -0,0 +1,62 @@
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from colander import interpolate
+from typeit.schema.errors import Invalid
+from typeit.schema.types import TypedMapping
+
+
+__all__ = ('json_pointer', 'invalid_pointers')
+
+
+def json_pointer(parts: Iterable[Union[str, int]]) -> str:
+    """ Builds an RFC 6901 JSON pointer, e.g. ``['paths', '/pets/{id}', 'get']`` becomes ``/paths/~1pets~1{id}/get``
+    """
+    return ''.join('/' + str(x).replace('~', '~0').replace('/', '~1') for x in parts)
+
+
+def _child(data: Any, key: Union[str, int]) -> Any:
+    try:
+        return data[key]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _find_key(mapping: Mapping[str, Any], value: Any) -> Optional[str]:
+    """ Finds the key of the value that failed to deserialize; the value reported in the error
+    is not necessarily the same object as the one in the original data, hence the equality check
+    """
+    for k, v in mapping.items():
+        if v is value:
+            return k
+    for k, v in mapping.items():
+        if v == value:
+            return k
+    return None
+
+
+def invalid_pointers(error: Invalid, data: Any) -> Iterator[Tuple[str, str]]:
+    """ Yields ``(json_pointer, reason)`` pairs for every failure reported by ``error``,
+    raised when ``data`` was deserialized.
+
+    Unlike the dot-separated paths of ``Invalid.asdict()``, pointers include the keys of mappings,
+    which typeit reports only in error messages.
+    """
+    for path in error.paths():
+        parts: List[Union[str, int]] = []
+        messages: List[str] = []
+        current = data
+        for i, exc in enumerate(path):
+            # the name of the root node is not a part of the data
+            key = exc.pos if exc.positional else exc.node.name
+            if i and key != '' and key is not None:
+                parts.append(key)
+                current = _child(current, key)
+            if isinstance(exc.node.typ, TypedMapping) and isinstance(current, Mapping):
+                key = _find_key(current, exc.value)
+                if key is not None:
+                    parts.append(key)
+                    current = current[key]
+        for exc in path:
+            if exc.msg:
+                messages.extend(str(x) for x in interpolate(exc.messages()))
+        yield json_pointer(parts), '; '.join(messages)
@@ -0,0 +1,68 @@
+import gc
+from typing import Any, Mapping, Optional
+
+from . import OpenAPI, parse_spec
+from .values import InternPool
+
+
+__all__ = ('parse_shared', 'freeze', 'unique_memory')
+
+
+def parse_shared(data: Mapping[str, Any], pool: Optional[InternPool] = None) -> OpenAPI:
+    """ Parses a spec in the parent process of prefork workers (e.g. in the config of gunicorn with ``preload_app``),
+    so that the workers keep sharing its memory with the parent instead of copying it page by page.
+
+    The garbage collector is disabled before the parse and stays disabled, so that collections do not free objects
+    in between the objects of the spec and leave holes that the workers would fill later, writing to shared pages.
+    Call ``freeze()`` right before forking the workers, and ``gc.enable()`` early in every worker
+    (e.g. in the ``post_fork`` hook of gunicorn). Workers still copy the pages of the objects they use,
+    since reference counting writes to them. If the parse fails, the collector is enabled again.
+
+    >>> spec = parse_shared(load_data(buf))
+    >>> freeze()
+    >>> # fork the workers
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return parse_spec(data, pool=pool)
+    except BaseException:
+        # the app will not fork workers with this spec
+        if enabled:
+            gc.enable()
+        raise
+
+
+def freeze() -> None:
+    """ Moves every object of the process into the permanent generation of the garbage collector,
+    which collections skip. Without it, the first full collection in every forked worker writes to the header
+    of every object of the spec, and copies every page of it.
+
+    Call it right before forking, with the garbage collector disabled since the spec was parsed: objects allocated
+    after the freeze are not shared as well, and a collection before it would free objects in between shared ones.
+    The trade-off is that cyclic garbage made since the collector was disabled is frozen too, and never freed;
+    collect it before ``parse_shared()`` rather than after.
+
+    Raises ``RuntimeError`` if the garbage collector is enabled, since it may have left holes already.
+    """
+    if gc.isenabled():
+        raise RuntimeError('The garbage collector is enabled; parse the spec with parse_shared() '
+                           'and freeze right before forking')
+    gc.freeze()
+
+
+def unique_memory() -> Optional[int]:
+    """ Unique set size (USS) of the current process, in bytes: memory that is not shared with any other process,
+    such as the pages that a forked worker copied from its parent. Available on Linux only.
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    rv = 0
+    for line in lines:
+        name, _, value = line.partition(':')
+        if name in ('Private_Clean', 'Private_Dirty'):
+            rv += int(value.split()[0]) * 1024
+    return rv
@@ -0,0 +1,293 @@
+import sys
+import threading
+import time
+from collections import abc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import colander
+from typeit.schema.types import ForwardReferenceType, Structure, TypedMapping, Union as UnionSchema
+
+from . import _spec_node
+from .custom_types import iter_schema_nodes
+from .pointer import json_pointer
+
+
+__all__ = ('Profile', 'ProfileEntry', 'profile')
+
+
+class ProfileEntry(NamedTuple):
+    name: str
+    """ A type of the schema graph, or a JSON pointer prefix
+    """
+    calls: int
+    seconds: float
+    """ Time spent in the calls, including nested calls; calls nested in other calls of the same entry
+    are counted once
+    """
+    own_seconds: float
+    """ Time spent in the calls, excluding nested calls of other nodes of the schema graph
+    """
+    blocks: int
+    """ Net change of the number of allocated memory blocks, including nested calls
+    """
+    own_blocks: int
+
+
+class _Stats:
+    __slots__ = ('calls', 'seconds', 'own_seconds', 'blocks', 'own_blocks', 'active')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.own_seconds = 0.0
+        self.blocks = 0
+        self.own_blocks = 0
+        self.active = 0
+
+
+class _Frame:
+    """ Time and allocations of the nested calls of a call in progress
+    """
+    __slots__ = ('seconds', 'blocks')
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.blocks = 0
+
+
+class _Item:
+    """ Marks nodes of mapping values and sequence items, which are located by their keys in the enclosing data
+    """
+
+
+_ITEM = _Item()
+
+Key = Union[str, int]
+
+Segment = Union[None, str, _Item]
+
+Tables = Tuple[Dict[str, _Stats], Dict[Tuple[Key, ...], _Stats]]
+
+
+class _ThreadState(threading.local):
+    """ Stacks of the calls in progress and stats of the calls made, separate in every thread
+    """
+    def __init__(self, tables: List[Tables], lock: threading.Lock) -> None:
+        self.types: Dict[str, _Stats] = {}
+        self.pointers: Dict[Tuple[Key, ...], _Stats] = {}
+        self.path: List[Key] = []
+        self.keys: List[Dict[int, Key]] = []
+        self.frames: List[_Frame] = []
+        with lock:
+            tables.append((self.types, self.pointers))
+
+
+class Profile:
+    """ Call counts, time and allocations of ``parse_spec`` and ``serialize_spec``, recorded per type
+    of the schema graph (``OpenAPI``, ``DispatchingUnion[...]``, ``RefSchema`` and so on)
+    and per JSON pointer prefix of the data, up to ``depth`` segments.
+
+    Times include the overhead of the profiler, so they are meant to be compared with each other,
+    rather than with the time of an unprofiled parse. Calls made in several threads are recorded per thread
+    and summed up, so the times may add up to more than the wall-clock time.
+    """
+    def __init__(self, depth: int = 3) -> None:
+        self.depth = depth
+        self._tables: List[Tables] = []
+        self._state = _ThreadState(self._tables, threading.Lock())
+
+    def types(self) -> List[ProfileEntry]:
+        """ Entries of types, by own time, the most expensive first
+        """
+        return _ranked(_entries([types for types, _ in self._tables], str))
+
+    def pointers(self) -> List[ProfileEntry]:
+        """ Entries of pointer prefixes, by time, the most expensive first. Time of a prefix covers
+        every call at the locations under it, except for the calls under longer prefixes, which are reported
+        separately only if they are not deeper than ``depth``.
+        """
+        return _ranked(_entries([pointers for _, pointers in self._tables], json_pointer), 'seconds')
+
+    def report(self, limit: int = 20) -> str:
+        """ Ranked tables of the most expensive types and pointer prefixes
+        """
+        lines = []
+        for title, entries in (('Type', self.types()), ('Location', self.pointers())):
+            lines.append(f'{"calls":>9} {"total ms":>10} {"own ms":>10} {"blocks":>9} {"own blocks":>10}  {title}')
+            lines.extend(
+                f'{x.calls:>9} {x.seconds * 1000:>10.1f} {x.own_seconds * 1000:>10.1f} '
+                f'{x.blocks:>9} {x.own_blocks:>10}  {x.name or "/"}'
+                for x in entries[:limit]
+            )
+            if len(entries) > limit:
+                lines.append(f'... {len(entries) - limit} more')
+            lines.append('')
+        return '\n'.join(lines)
+
+    def _wrap(self, method: Callable[[Any], Any], label: str, segment: Segment, keyed: bool) -> Callable[..., Any]:
+        def wrapper(value: Any = colander.null) -> Any:
+            return self._call(method, value, label, segment, keyed)
+        return wrapper
+
+    def _call(self, method: Callable[[Any], Any], value: Any, label: str, segment: Segment, keyed: bool) -> Any:
+        state = self._state
+        path, keys, frames = state.path, state.keys, state.frames
+        if segment is not None:
+            if isinstance(segment, _Item):
+                path.append(keys[-1].get(id(value), '*') if keys else '*')
+            else:
+                path.append(segment)
+        if keyed:
+            keys.append(_keys(value))
+        stats = [self._stats(state.types, label), self._stats(state.pointers, tuple(path[:self.depth]))]
+        for x in stats:
+            x.active += 1
+        frame = _Frame()
+        frames.append(frame)
+
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            return method(value)
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = sys.getallocatedblocks() - blocks
+
+            frames.pop()
+            if frames:
+                parent = frames[-1]
+                parent.seconds += elapsed
+                parent.blocks += allocated
+            for x in stats:
+                x.calls += 1
+                x.own_seconds += elapsed - frame.seconds
+                x.own_blocks += allocated - frame.blocks
+                x.active -= 1
+                if not x.active:
+                    x.seconds += elapsed
+                    x.blocks += allocated
+            if keyed:
+                keys.pop()
+            if segment is not None:
+                path.pop()
+
+    @staticmethod
+    def _stats(stats: Dict[Any, _Stats], key: Any) -> _Stats:
+        try:
+            return stats[key]
+        except KeyError:
+            rv = stats[key] = _Stats()
+            return rv
+
+
+_active: Optional[Profile] = None
+
+
+@contextmanager
+def profile(depth: int = 3) -> Iterator[Profile]:
+    """ Records the parses and serializations made within the block, in any thread, and sums them up.
+    The schema graph is instrumented on entering the block and restored on leaving it,
+    so nothing is recorded, and nothing is paid for, outside of it.
+
+    >>> with profile() as p:
+    ...     spec = parse_spec(data)
+    >>> print(p.report())
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError('Profiling is already active')
+    rv = _active = Profile(depth)
+    nodes = list(iter_schema_nodes(_spec_node()))
+    segments = _segments(nodes)
+    try:
+        for node in nodes:
+            segment = segments.get(id(node))
+            keyed = isinstance(node.typ, (TypedMapping, colander.Sequence))
+            label = _label(node)
+            node.deserialize = rv._wrap(node.deserialize, label, segment, keyed)
+            node.serialize = rv._wrap(node.serialize, label, segment, keyed)
+        yield rv
+    finally:
+        for node in nodes:
+            node.__dict__.pop('deserialize', None)
+            node.__dict__.pop('serialize', None)
+        _active = None
+
+
+def _segments(nodes: List[Any]) -> Dict[int, Segment]:
+    """ Segments of the JSON pointers that nodes add to the location of the data they are given.
+    The root, union variants, mapping keys and referenced nodes stay at the location of their parent.
+    """
+    rv: Dict[int, Segment] = {}
+    for node in nodes:
+        typ = node.typ
+        if isinstance(typ, TypedMapping):
+            rv.setdefault(id(typ.value_node), _ITEM)
+        elif isinstance(typ, colander.Sequence):
+            for child in node.children:
+                rv.setdefault(id(child), _ITEM)
+        elif isinstance(typ, Structure):
+            for child in node.children:
+                rv.setdefault(id(child), child.name)
+    return rv
+
+
+def _keys(value: Any) -> Dict[int, Key]:
+    """ Keys of the items of a mapping or a sequence, by the identities of the items.
+    Equal primitive values may be the same object, in which case they are attributed to one of the keys.
+    """
+    if isinstance(value, abc.Mapping):
+        return {id(v): k for k, v in value.items()}
+    if isinstance(value, abc.Collection) and not isinstance(value, (str, bytes)):
+        return {id(v): i for i, v in enumerate(value)}
+    return {}
+
+
+def _short(node: Any) -> str:
+    typ = node.typ
+    if isinstance(typ, Structure):
+        return typ.typ.__name__
+    if isinstance(typ, ForwardReferenceType):
+        return _short(typ.ref_registry[typ.ref])
+    return type(typ).__name__
+
+
+def _label(node: Any) -> str:
+    typ = node.typ
+    if isinstance(typ, UnionSchema):
+        variants = [_short(x) for _, x in typ.variant_nodes]
+        if len(variants) > 4:
+            variants[3:] = ['...']
+        args = variants
+    elif isinstance(typ, TypedMapping):
+        args = [_short(typ.key_node), _short(typ.value_node)]
+    elif isinstance(typ, colander.Sequence):
+        args = [_short(x) for x in node.children]
+    elif isinstance(typ, ForwardReferenceType):
+        args = [_short(node)]
+    else:
+        return _short(node)
+    return f'{type(typ).__name__}[{", ".join(args)}]'
+
+
+def _entries(tables: List[Dict[Any, _Stats]], name: Callable[[Any], str]) -> Iterator[ProfileEntry]:
+    """ Entries of the stats recorded by every thread, summed up by key
+    """
+    merged: Dict[Any, List[_Stats]] = {}
+    for table in tables:
+        for key, stats in list(table.items()):
+            merged.setdefault(key, []).append(stats)
+    for key, items in merged.items():
+        yield ProfileEntry(
+            name(key),
+            sum(x.calls for x in items),
+            sum(x.seconds for x in items),
+            sum(x.own_seconds for x in items),
+            sum(x.blocks for x in items),
+            sum(x.own_blocks for x in items),
+        )
+
+
+def _ranked(entries: Iterable[ProfileEntry], field: str = 'own_seconds') -> List[ProfileEntry]:
+    return sorted(entries, key=lambda x: getattr(x, field), reverse=True)
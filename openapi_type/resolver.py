@@ -0,0 +1,196 @@
+from collections import abc
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Sequence, Set, Tuple, Union
+
+from . import OpenAPI, Components, Reference
+from .values import Ref, RefTo, _ref
+
+
+__all__ = (
+    'Resolver',
+    'UnresolvedReference',
+    'ReferenceCycle',
+    'iter_refs',
+)
+
+
+class UnresolvedReference(LookupError):
+    """ A reference points to a component that does not exist
+    """
+
+
+class ReferenceCycle(ValueError):
+    """ A chain of references never reaches a non-reference value,
+    like in ``A: {$ref: B}, B: {$ref: A}``
+    """
+
+
+COMPONENT_LOCATIONS: Mapping[RefTo, str] = {
+    RefTo.SCHEMAS: 'schemas',
+    RefTo.LINKS: 'links',
+    RefTo.PARAMS: 'parameters',
+    RefTo.RESPONSES: 'responses',
+    RefTo.HEADERS: 'headers',
+    RefTo.REQUEST_BODIES: 'request_bodies',
+    RefTo.SECURITY_SCHEMES: 'security_schemes',
+}
+""" Components attributes that can be targeted by references
+"""
+
+
+def iter_refs(value: Any, raw: bool = False) -> Iterator[Ref]:
+    """ Yields every ``Ref`` found in a parsed value, e.g. an entire ``OpenAPI`` spec or a single ``SchemaType``.
+    With ``raw``, also the ``$ref`` strings of raw data that parsed values keep, such as request bodies
+    and links of components.
+    """
+    pending = [value]
+    while pending:
+        x = pending.pop()
+        if isinstance(x, (str, int, float)) or x is None:
+            continue
+        if isinstance(x, Ref):
+            yield x
+        elif isinstance(x, tuple):
+            # named tuples are tuples too
+            pending.extend(x)
+        elif isinstance(x, abc.Mapping):
+            if raw:
+                ref = x.get('$ref')
+                parsed = _ref(ref) if isinstance(ref, str) else None
+                if parsed is not None:
+                    yield parsed
+            pending.extend(x.values())
+        elif isinstance(x, (abc.Sequence, frozenset, set)):
+            pending.extend(x)
+
+
+def _index(components: Components) -> Dict[Ref, Any]:
+    return {
+        Ref(location, name): target
+        for location, attr in COMPONENT_LOCATIONS.items()
+        for name, target in getattr(components, attr).items()
+    }
+
+
+class Resolver:
+    """ Resolves references of a parsed spec in constant time. Build it once per ``OpenAPI``:
+
+    >>> resolver = Resolver(spec)
+    >>> schema = resolver.resolve(Ref(RefTo.SCHEMAS, 'Pet'))
+    """
+    def __init__(self, spec: OpenAPI) -> None:
+        self.index: Mapping[Ref, Any] = _index(spec.components)
+        """ Component targets of every possible reference, as they appear in the spec
+        """
+        self._spec = spec
+        self._used: Union[None, FrozenSet[Ref]] = None
+        self._resolved: Dict[Ref, Any] = {}
+        self._cycles: Union[None, Sequence[FrozenSet[Ref]]] = None
+
+    @property
+    def used(self) -> FrozenSet[Ref]:
+        """ References found anywhere in the spec. Finding them takes a walk over the entire spec,
+        which is done on first access, so that resolving references stays cheap to set up.
+        """
+        if self._used is None:
+            self._used = frozenset(iter_refs(self._spec))
+        return self._used
+
+    @property
+    def dangling(self) -> FrozenSet[Ref]:
+        """ References found in the spec that do not point to any component
+        """
+        return frozenset(x for x in self.used if x not in self.index)
+
+    def __contains__(self, ref: Ref) -> bool:
+        return ref in self.index
+
+    def __getitem__(self, ref: Ref) -> Any:
+        """ Returns the component the reference points to, which may be another ``Reference``
+        """
+        try:
+            return self.index[ref]
+        except KeyError:
+            raise UnresolvedReference(ref) from None
+
+    def resolve(self, ref: Union[Ref, Reference]) -> Any:
+        """ Returns the first non-reference component reached by following ``ref``.
+        Results are memoized per resolver.
+        """
+        if isinstance(ref, Reference):
+            ref = ref.ref
+        try:
+            return self._resolved[ref]
+        except KeyError:
+            pass
+
+        chain: List[Ref] = []
+        target: Any = ref
+        while isinstance(target, Ref):
+            if target in chain:
+                raise ReferenceCycle(chain + [target])
+            chain.append(target)
+            target = self[target]
+            if isinstance(target, Reference):
+                target = target.ref
+
+        for x in chain:
+            self._resolved[x] = target
+        return target
+
+    def cycles(self) -> Sequence[FrozenSet[Ref]]:
+        """ Groups of components that reference each other, directly or transitively,
+        including self-referencing components (recursive schemas).
+        """
+        if self._cycles is None:
+            edges = {ref: frozenset(x for x in iter_refs(target) if x in self.index)
+                     for ref, target in self.index.items()}
+            self._cycles = [
+                group for group in _strongly_connected(edges)
+                if len(group) > 1 or next(iter(group)) in edges[next(iter(group))]
+            ]
+        return self._cycles
+
+
+def _strongly_connected(edges: Mapping[Ref, FrozenSet[Ref]]) -> Iterator[FrozenSet[Ref]]:
+    """ Iterative Tarjan's algorithm
+    """
+    counter = 0
+    index: Dict[Ref, int] = {}
+    lowlink: Dict[Ref, int] = {}
+    stack: List[Ref] = []
+    on_stack: Set[Ref] = set()
+
+    for root in edges:
+        if root in index:
+            continue
+        work: List[Tuple[Ref, Iterator[Ref]]] = [(root, iter(edges[root]))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges[succ])))
+                    break
+                if succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    group = set()
+                    while True:
+                        x = stack.pop()
+                        on_stack.discard(x)
+                        group.add(x)
+                        if x == node:
+                            break
+                    yield frozenset(group)
@@ -0,0 +1,181 @@
+import re
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+from . import OpenAPI, Operation, OperationParameter, ParamLocation, PathItem, Reference
+from .parameters import string_decoder
+from .resolver import Resolver
+
+
+__all__ = (
+    'METHODS',
+    'Route',
+    'Router',
+    'PathParameterError',
+)
+
+
+METHODS: Sequence[str] = ('head', 'get', 'post', 'put', 'patch', 'delete', 'trace')
+""" HTTP methods in the order of the ``PathItem`` fields
+"""
+
+
+class PathParameterError(ValueError):
+    """ A path matches a template, but the value of a path parameter does not match its schema
+    """
+    def __init__(self, name: str, value: str) -> None:
+        super().__init__(f'Invalid value of path parameter {name!r}: {value!r}')
+        self.name = name
+        self.value = value
+
+
+class Route(NamedTuple):
+    template: str
+    """ Key of ``OpenAPI.paths`` that matched
+    """
+    path_item: PathItem
+    operation: Optional[Operation]
+    """ Operation of the requested method, ``None`` if the path item does not define it
+    """
+    params: Mapping[str, Any]
+    """ Path parameters, decoded according to the style and the schema of the operation parameters
+    """
+
+
+Converter = Callable[[str], Any]
+
+
+class _Node:
+    __slots__ = ('literals', 'variable', 'patterns', 'template')
+
+    def __init__(self) -> None:
+        self.literals: Dict[str, _Node] = {}
+        self.variable: Optional[_Node] = None
+        """ Child for segments that are a single template expression, like ``{id}``
+        """
+        self.patterns: List[Tuple[Any, _Node]] = []
+        """ Children for segments that mix literals and template expressions, like ``{id}.json``
+        """
+        self.template: Optional[str] = None
+
+
+_expression = re.compile(r'{([^{}]+)}')
+
+
+def _segments(path: str) -> List[str]:
+    return path.split('/')[1:] if path.startswith('/') else path.split('/')
+
+
+class Router:
+    """ Matches request paths against the templates of ``OpenAPI.paths`` through a trie of path segments,
+    so that the cost of matching depends on the number of segments rather than on the number of templates.
+
+    Following the spec, concrete segments take precedence over templated ones:
+    ``/users/me`` is matched before ``/users/{id}`` regardless of their order in the spec.
+
+    >>> router = Router(spec)
+    >>> route = router.match('GET', '/users/42')
+    >>> route.template, route.params
+    ('/users/{id}', {'id': 42})
+    """
+    def __init__(self, spec: OpenAPI, resolver: Optional[Resolver] = None) -> None:
+        self.spec = spec
+        self.resolver = Resolver(spec) if resolver is None else resolver
+        self._root = _Node()
+        self._names: Dict[str, Tuple[str, ...]] = {}
+        self._converters: Dict[Tuple[str, str], Mapping[str, Converter]] = {}
+        for template in spec.paths:
+            self.add(template)
+
+    def add(self, template: str) -> None:
+        """ Adds a template of ``OpenAPI.paths`` to the trie
+        """
+        node = self._root
+        names: List[str] = []
+        for segment in _segments(template):
+            found = _expression.findall(segment)
+            if not found:
+                node = node.literals.setdefault(segment, _Node())
+            elif _expression.fullmatch(segment):
+                if node.variable is None:
+                    node.variable = _Node()
+                node = node.variable
+            else:
+                pattern = re.compile(''.join(
+                    '(.+?)' if i % 2 else re.escape(x) for i, x in enumerate(_expression.split(segment))
+                ))
+                for existing, child in node.patterns:
+                    if existing.pattern == pattern.pattern:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.patterns.append((pattern, child))
+                    node = child
+            names.extend(found)
+        if node.template is None:
+            # templates that differ only in parameter names are ambiguous, the first one wins
+            node.template = template
+        self._names[template] = tuple(names)
+
+    def match(self, method: str, path: str) -> Optional[Route]:
+        """ Returns the route of ``path``, or ``None`` if no template matches it.
+        Raises ``PathParameterError`` if a parameter cannot be converted to the type of its schema.
+        """
+        segments = [unquote(x) for x in _segments(path.split('?', 1)[0])]
+        found = _find(self._root, segments, 0, [])
+        if found is None:
+            return None
+        template, values = found
+        path_item = self.spec.paths[template]
+        operation = getattr(path_item, method.lower(), None) if method.lower() in METHODS else None
+        params = dict(zip(self._names[template], values))
+        if operation is not None:
+            for name, convert in self._operation_converters(template, method.lower(), operation).items():
+                if name in params:
+                    try:
+                        params[name] = convert(params[name])
+                    except ValueError:
+                        raise PathParameterError(name, params[name]) from None
+        return Route(template=template, path_item=path_item, operation=operation, params=params)
+
+    def _operation_converters(self, template: str, method: str, operation: Operation) -> Mapping[str, Converter]:
+        try:
+            return self._converters[(template, method)]
+        except KeyError:
+            pass
+        rv = {}
+        for param in operation.parameters:
+            if isinstance(param, Reference):
+                param = self.resolver.resolve(param)
+            if isinstance(param, OperationParameter) and param.in_ is ParamLocation.PATH:
+                rv[param.name] = string_decoder(param, self.resolver)
+        self._converters[(template, method)] = rv
+        return rv
+
+
+def _find(node: _Node, segments: List[str], i: int, values: List[str]) -> Optional[Tuple[str, List[str]]]:
+    """ Depth-first search that tries concrete segments first, then template expressions
+    """
+    if i == len(segments):
+        if node.template is None:
+            return None
+        return node.template, values
+
+    segment = segments[i]
+    child = node.literals.get(segment)
+    if child is not None:
+        rv = _find(child, segments, i + 1, values)
+        if rv is not None:
+            return rv
+    if node.variable is not None and segment:
+        rv = _find(node.variable, segments, i + 1, values + [segment])
+        if rv is not None:
+            return rv
+    for pattern, child in node.patterns:
+        m = pattern.fullmatch(segment)
+        if m is not None:
+            rv = _find(child, segments, i + 1, values + list(m.groups()))
+            if rv is not None:
+                return rv
+    return None
@@ -0,0 +1,375 @@
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from . import (
+    OpenAPI, Operation, Reference, RequestBody, Response, HTTPCode,
+    StringValue, IntegerValue, FloatValue, BooleanValue,
+    ObjectValue, InlinedObjectValue, ObjectWithAdditionalProperties, ArrayValue,
+    ProductSchemaType, UnionSchemaTypeAny, UnionSchemaTypeOne, ResponseRef,
+)
+from .pointer import json_pointer
+from .resolver import Resolver
+from .values import ContentTypeTag, EmptyValue, Ref
+
+
+__all__ = (
+    'Validator',
+    'InvalidPayload',
+    'ValidatorCompiler',
+)
+
+
+Validator = Callable[[Any], None]
+""" Checks a payload, as loaded from JSON, and raises ``InvalidPayload`` if it does not match the schema
+"""
+
+
+class InvalidPayload(ValueError):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.parts: List[Union[str, int]] = []
+        """ Location of the invalid value, from the innermost key outwards
+        """
+
+    @property
+    def pointer(self) -> str:
+        """ JSON pointer to the invalid value within the payload
+        """
+        return json_pointer(reversed(self.parts))
+
+    def __str__(self) -> str:
+        return f'{self.pointer}: {self.reason}'
+
+
+def _accept_any(value: Any) -> None:
+    pass
+
+
+class ValidatorCompiler:
+    """ Compiles schemas of a parsed spec into validators of payloads. References are resolved
+    at compile time, and every schema and every referenced component is compiled once per compiler:
+
+    >>> compiler = ValidatorCompiler(spec)
+    >>> validate = compiler.request_body(spec.paths['/pets'].post)[ContentTypeTag('application/json', None)]
+    >>> validate({'name': 'Rex'})
+    """
+    def __init__(self, spec: OpenAPI, resolver: Optional[Resolver] = None) -> None:
+        self.spec = spec
+        self.resolver = Resolver(spec) if resolver is None else resolver
+        # keyed by id(), since parsed schemas contain plain dicts and are not hashable;
+        # the schema is kept alongside its validator, so that the id is not reused while cached
+        self._compiled: Dict[int, Tuple[Any, Validator]] = {}
+        self._refs: Dict[Ref, Validator] = {}
+        self._pending: List[Tuple[Ref, Any, List[Validator]]] = []
+
+    def compile(self, schema: Any) -> Validator:
+        """ Returns the validator of ``schema``, which is any ``SchemaType`` value of the spec
+        """
+        try:
+            rv = self._schema(schema)
+            # referenced components are compiled iteratively rather than recursively,
+            # since chains of references can be as long as the list of components
+            while self._pending:
+                ref, target, cell = self._pending.pop()
+                cell.append(self._schema(target))
+                # validators compiled from now on call the target directly
+                self._refs[ref] = cell[0]
+        except BaseException:
+            # validators compiled so far may refer to components that were not compiled
+            self._compiled.clear()
+            self._refs.clear()
+            self._pending.clear()
+            raise
+        return rv
+
+    def _schema(self, schema: Any) -> Validator:
+        try:
+            return self._compiled[id(schema)][1]
+        except KeyError:
+            pass
+        rv = self._compile(schema)
+        self._compiled[id(schema)] = (schema, rv)
+        return rv
+
+    def request_body(self, operation: Operation) -> Mapping[ContentTypeTag, Validator]:
+        """ Validators of the request body of ``operation`` per media type.
+        Bodies referenced from ``components.requestBodies`` are not supported, since the spec keeps them unparsed.
+        """
+        body = operation.request_body
+        if not isinstance(body, RequestBody):
+            return {}
+        return {tag: self.compile(media.schema) for tag, media in body.content.items()}
+
+    def responses(self, operation: Operation) -> Mapping[Tuple[HTTPCode, ContentTypeTag], Validator]:
+        """ Validators of the responses of ``operation`` per status code and media type
+        """
+        rv = {}
+        for code, response in operation.responses.items():
+            if isinstance(response, Reference):
+                response = self.resolver.resolve(response)
+            if not isinstance(response, Response):
+                continue
+            for tag, media in response.content.items():
+                if media.schema is not None:
+                    rv[(code, tag)] = self.compile(media.schema)
+        return rv
+
+    def _compile(self, schema: Any) -> Validator:
+        if isinstance(schema, Reference):
+            return self._compile_ref(schema.ref)
+        if isinstance(schema, StringValue):
+            return _compile_string(schema)
+        if isinstance(schema, IntegerValue):
+            return _compile_integer(schema)
+        if isinstance(schema, FloatValue):
+            return _check_number
+        if isinstance(schema, BooleanValue):
+            return _check_boolean
+        if isinstance(schema, (ObjectValue, InlinedObjectValue)):
+            return _compile_object(
+                [(name, self._schema(x)) for name, x in schema.properties.items()],
+                frozenset(schema.required),
+            )
+        if isinstance(schema, ObjectWithAdditionalProperties):
+            return self._compile_additional_properties(schema.additional_properties)
+        if isinstance(schema, ArrayValue):
+            return _compile_array(self._schema(schema.items))
+        if isinstance(schema, ProductSchemaType):
+            return _compile_all_of([self._schema(x) for x in schema.all_of])
+        if isinstance(schema, UnionSchemaTypeAny):
+            return _compile_any_of([self._schema(x) for x in schema.any_of])
+        if isinstance(schema, UnionSchemaTypeOne):
+            return _compile_one_of([self._schema(x) for x in schema.one_of])
+        if isinstance(schema, (EmptyValue, ResponseRef)) or schema is None:
+            return _accept_any
+        raise TypeError(f'Unsupported schema type: {type(schema).__name__}')
+
+    def _compile_ref(self, ref: Ref) -> Validator:
+        try:
+            return self._refs[ref]
+        except KeyError:
+            pass
+        target = self.resolver.resolve(ref)
+        try:
+            rv = self._compiled[id(target)][1]
+        except KeyError:
+            # the target is compiled later, recursive schemas reach it through the cell
+            cell: List[Validator] = []
+
+            def rv(value: Any) -> None:
+                cell[0](value)
+
+            self._pending.append((ref, target, cell))
+        self._refs[ref] = rv
+        return rv
+
+    def _compile_additional_properties(self, additional: Any) -> Validator:
+        if additional is None or additional is True:
+            return _check_object
+        if additional is False:
+            return _check_empty_object
+        check_value = self._schema(additional)
+
+        def validate(value: Any) -> None:
+            if type(value) is not dict:
+                raise InvalidPayload(f'Expected an object, got {_kind(value)}')
+            for k, v in value.items():
+                try:
+                    check_value(v)
+                except InvalidPayload as e:
+                    e.parts.append(k)
+                    raise
+        return validate
+
+
+def _kind(value: Any) -> str:
+    return type(value).__name__
+
+
+def _compile_string(schema: StringValue) -> Validator:
+    enum = frozenset(schema.enum)
+    search = re.compile(schema.pattern).search if schema.pattern is not None else None
+
+    if not enum and search is None:
+        return _check_string
+
+    def validate(value: Any) -> None:
+        if type(value) is not str:
+            raise InvalidPayload(f'Expected a string, got {_kind(value)}')
+        if enum and value not in enum:
+            raise InvalidPayload(f'{value!r} is not one of {sorted(enum)}')
+        if search is not None and search(value) is None:
+            raise InvalidPayload(f'{value!r} does not match {schema.pattern!r}')
+    return validate
+
+
+def _compile_integer(schema: IntegerValue) -> Validator:
+    minimum, maximum = schema.minimum, schema.maximum
+
+    if minimum is None and maximum is None:
+        return _check_integer
+
+    def validate(value: Any) -> None:
+        if type(value) is not int:
+            raise InvalidPayload(f'Expected an integer, got {_kind(value)}')
+        if minimum is not None and value < minimum:
+            raise InvalidPayload(f'{value} is less than the minimum of {minimum}')
+        if maximum is not None and value > maximum:
+            raise InvalidPayload(f'{value} is greater than the maximum of {maximum}')
+    return validate
+
+
+def _check_string(value: Any) -> None:
+    if type(value) is not str:
+        raise InvalidPayload(f'Expected a string, got {_kind(value)}')
+
+
+def _check_integer(value: Any) -> None:
+    if type(value) is not int:
+        raise InvalidPayload(f'Expected an integer, got {_kind(value)}')
+
+
+def _check_number(value: Any) -> None:
+    t = type(value)
+    if t is not float and t is not int:
+        raise InvalidPayload(f'Expected a number, got {_kind(value)}')
+
+
+def _check_boolean(value: Any) -> None:
+    if type(value) is not bool:
+        raise InvalidPayload(f'Expected a boolean, got {_kind(value)}')
+
+
+def _check_object(value: Any) -> None:
+    if type(value) is not dict:
+        raise InvalidPayload(f'Expected an object, got {_kind(value)}')
+
+
+def _check_array(value: Any) -> None:
+    if type(value) is not list:
+        raise InvalidPayload(f'Expected an array, got {_kind(value)}')
+
+
+_TYPE_CHECKS: Mapping[Validator, type] = {
+    _check_string: str,
+    _check_integer: int,
+    _check_boolean: bool,
+    _check_object: dict,
+    _check_array: list,
+}
+""" Validators that are equivalent to comparing the exact type of a value
+"""
+
+
+def _check_empty_object(value: Any) -> None:
+    _check_object(value)
+    if value:
+        raise InvalidPayload(f'Unexpected properties: {sorted(value)}')
+
+
+def _compile_object(properties: Sequence[Tuple[str, Validator]], required: frozenset) -> Validator:
+    # properties that only need a type check are checked inline, without calling their validators
+    typed = tuple((name, _TYPE_CHECKS[check], check) for name, check in properties if check in _TYPE_CHECKS)
+    nested = tuple((name, check) for name, check in properties
+                   if check not in _TYPE_CHECKS and check is not _accept_any)
+
+    def validate(value: Any) -> None:
+        if type(value) is not dict:
+            raise InvalidPayload(f'Expected an object, got {_kind(value)}')
+        if required and not required.issubset(value):
+            raise InvalidPayload(f'Missing required properties: {sorted(required.difference(value))}')
+        get = value.get
+        for name, expected, check in typed:
+            x = get(name, _missing)
+            if x is not _missing and type(x) is not expected:
+                _fail_at(check, x, name)
+        for name, check in nested:
+            x = get(name, _missing)
+            if x is not _missing:
+                try:
+                    check(x)
+                except InvalidPayload as e:
+                    e.parts.append(name)
+                    raise
+    return validate
+
+
+_missing = object()
+
+
+def _fail_at(check: Validator, value: Any, key: Union[str, int]) -> None:
+    """ Raises the error of ``check``, located at ``key``
+    """
+    try:
+        check(value)
+    except InvalidPayload as e:
+        e.parts.append(key)
+        raise
+
+
+def _compile_array(check_item: Validator) -> Validator:
+    if check_item is _accept_any:
+        return _check_array
+
+    def validate(value: Any) -> None:
+        if type(value) is not list:
+            raise InvalidPayload(f'Expected an array, got {_kind(value)}')
+        for i, item in enumerate(value):
+            try:
+                check_item(item)
+            except InvalidPayload as e:
+                e.parts.append(i)
+                raise
+    return validate
+
+
+def _compile_all_of(checks: Sequence[Validator]) -> Validator:
+    checks = tuple(x for x in checks if x is not _accept_any)
+    if not checks:
+        return _accept_any
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value: Any) -> None:
+        for check in checks:
+            check(value)
+    return validate
+
+
+def _compile_any_of(checks: Sequence[Validator]) -> Validator:
+    if any(x is _accept_any for x in checks):
+        return _accept_any
+    checks = tuple(checks)
+
+    def validate(value: Any) -> None:
+        reasons = []
+        for check in checks:
+            try:
+                check(value)
+            except InvalidPayload as e:
+                reasons.append(str(e))
+            else:
+                return
+        raise InvalidPayload(f'Does not match any of the schemas: {"; ".join(reasons)}')
+    return validate
+
+
+def _compile_one_of(checks: Sequence[Validator]) -> Validator:
+    checks = tuple(checks)
+
+    def validate(value: Any) -> None:
+        matched = 0
+        reasons = []
+        for check in checks:
+            try:
+                check(value)
+            except InvalidPayload as e:
+                reasons.append(str(e))
+            else:
+                matched += 1
+        if matched == 0:
+            raise InvalidPayload(f'Does not match any of the schemas: {"; ".join(reasons)}')
+        if matched > 1:
+            raise InvalidPayload(f'Matches {matched} schemas, expected exactly one')
+    return validate
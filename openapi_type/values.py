@@ -0,0 +1,159 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import NewType, NamedTuple, Optional, Dict, Iterator
+
+
+__all__ = (
+    'ContentTypeTag',
+    'Ref',
+    'EmptyValue',
+    'DispatchStats',
+    'InternPool',
+    'InternStats',
+    'interning',
+)
+
+
+ContentTypeFormat = NewType('ContentTypeFormat', str)
+MediaTypeCharset = NewType('MediaTypeCharset', str)
+
+
+class ContentTypeTag(NamedTuple):
+    format: ContentTypeFormat
+    charset: Optional[MediaTypeCharset]
+
+
+def _content_type_tag(value: str) -> ContentTypeTag:
+    """ ``application/json; charset=utf-8`` as ``ContentTypeTag``
+    """
+    media_format, *param = value.split(';')
+    charset = None
+    if param:
+        param = [x for x in param[0].split('charset=') if x.strip()]
+        if param:
+            charset = MediaTypeCharset(param[0])
+    return ContentTypeTag(format=ContentTypeFormat(media_format), charset=charset)
+
+
+class RefTo(Enum):
+    SCHEMAS          = '#/components/schemas/'
+    LINKS            = '#/components/links/'
+    PARAMS           = '#/components/parameters/'
+    RESPONSES        = '#/components/responses/'
+    HEADERS          = '#/components/headers/'
+    EXAMPLES         = '#/components/examples/'
+    REQUEST_BODIES   = '#/components/requestBodies/'
+    SECURITY_SCHEMES = '#/components/securitySchemes/'
+    CALLBACKS        = '#/components/callbacks/'
+
+
+class Ref(NamedTuple):
+    location: RefTo
+    name: str
+
+
+_REF_LOCATIONS = {x.value: x for x in RefTo}
+
+
+def _ref(value: str) -> Optional[Ref]:
+    """ ``#/components/schemas/Pet`` as ``Ref``, or ``None`` if it does not point to a component
+    """
+    prefix, sep, name = value.rpartition('/')
+    location = _REF_LOCATIONS.get(prefix + sep)
+    return None if location is None else Ref(location, name)
+
+
+class EmptyValue(NamedTuple):
+    """ Sometimes spec contains schemas like:
+    {
+        "type": "array",
+        "items": {}
+    }
+
+    In that case we need a strict type that would check that its serialized representation
+    exactly matches the empty schema value {}. This object serves that purpose.
+    """
+    pass
+
+
+class DispatchStats:
+    """ Counters of variant selection performed by ``DispatchingUnion`` nodes.
+    ``dispatched`` counts values that were accepted by the first variant matching their keys,
+    ``fallbacks`` counts values for which the ordered trial of the remaining variants had to run.
+    """
+    __slots__ = ('dispatched', 'fallbacks')
+
+    def __init__(self) -> None:
+        self.dispatched = 0
+        self.fallbacks = 0
+
+    def reset(self) -> None:
+        self.dispatched = 0
+        self.fallbacks = 0
+
+    def __repr__(self) -> str:
+        return f'DispatchStats(dispatched={self.dispatched}, fallbacks={self.fallbacks})'
+
+
+class InternStats(NamedTuple):
+    refs: int
+    content_types: int
+    strings: int
+    hits: int
+    misses: int
+
+
+class InternPool:
+    """ Shares equal ``Ref``, ``ContentTypeTag`` and string values between the nodes of parsed specs,
+    so that repeated values occupy memory once and compare by identity.
+
+    A new pool is used for every ``parse_spec`` call, unless a pool is passed explicitly,
+    in which case it can be shared across parses.
+    """
+    def __init__(self) -> None:
+        self.refs: Dict[str, Ref] = {}
+        self.content_types: Dict[str, ContentTypeTag] = {}
+        self.strings: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def string(self, value: str) -> str:
+        try:
+            rv = self.strings[value]
+        except KeyError:
+            rv = self.strings[value] = value
+            self.misses += 1
+        else:
+            self.hits += 1
+        return rv
+
+    def stats(self) -> InternStats:
+        return InternStats(
+            refs=len(self.refs),
+            content_types=len(self.content_types),
+            strings=len(self.strings),
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    def clear(self) -> None:
+        self.refs.clear()
+        self.content_types.clear()
+        self.strings.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_active_pool: ContextVar[Optional[InternPool]] = ContextVar('openapi_type_intern_pool', default=None)
+
+
+@contextmanager
+def interning(pool: InternPool) -> Iterator[InternPool]:
+    """ Makes values deserialized within the block interned by ``pool``
+    """
+    token = _active_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _active_pool.reset(token)
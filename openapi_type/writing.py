@@ -0,0 +1,152 @@
+import json
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Mapping, Tuple
+
+from typeit.schema.errors import errors_aware_constructor
+
+from . import OpenAPI, serialize_spec, _spec_node
+from .encoding import _is_binary
+
+
+__all__ = (
+    'iter_json',
+    'iter_yaml',
+    'write_json',
+    'write_yaml',
+)
+
+
+Location = Tuple[str, ...]
+# mappings of the spec that are serialized one item at a time, with the schema node of their items
+Streamed = Dict[Location, Tuple[Mapping[str, Any], Any]]
+
+
+_dumps = json.JSONEncoder(sort_keys=True, separators=(',', ':')).encode
+
+
+def _skeleton(spec: OpenAPI) -> OpenAPI:
+    """ The spec without its path items and component schemas
+    """
+    skeleton = spec._replace(paths={})
+    if spec.components is not None:
+        skeleton = skeleton._replace(components=spec.components._replace(schemas={}))
+    return skeleton
+
+
+def _streamed(spec: OpenAPI) -> Tuple[Mapping[str, Any], Streamed]:
+    """ Serializes the spec without its path items and component schemas, which are left
+    to be serialized item by item
+    """
+    node = _spec_node()
+    streamed: Streamed = {('paths',): (spec.paths, node['paths'].typ.value_node)}
+    if spec.components is not None:
+        streamed[('components', 'schemas')] = (spec.components.schemas,
+                                               node['components']['schemas'].typ.value_node)
+    return serialize_spec(_skeleton(spec)), streamed
+
+
+def _items(location: Location, streamed: Streamed) -> Iterator[Tuple[str, Any]]:
+    items, node = streamed[location]
+    for key in sorted(items):
+        yield key, errors_aware_constructor(node.serialize, items[key])
+
+
+def _contains_streamed(location: Location, streamed: Streamed) -> bool:
+    return any(x[:len(location)] == location for x in streamed)
+
+
+def iter_json(spec: OpenAPI) -> Iterator[str]:
+    """ Yields canonical JSON of the spec: compact, with sorted keys and non-ASCII characters escaped,
+    equal to ``json.dumps(serialize_spec(spec), sort_keys=True, separators=(',', ':'))``.
+    Only one path item or component schema is held in its serialized form at a time.
+    """
+    skeleton, streamed = _streamed(spec)
+    return _json(skeleton, (), streamed)
+
+
+def _json(value: Any, location: Location, streamed: Streamed) -> Iterator[str]:
+    if location in streamed:
+        yield '{'
+        for i, (key, item) in enumerate(_items(location, streamed)):
+            yield f"{',' if i else ''}{_dumps(key)}:{_dumps(item)}"
+        yield '}'
+    elif isinstance(value, dict) and _contains_streamed(location, streamed):
+        yield '{'
+        for i, key in enumerate(sorted(value)):
+            yield f"{',' if i else ''}{_dumps(key)}:"
+            yield from _json(value[key], location + (key,), streamed)
+        yield '}'
+    else:
+        yield _dumps(value)
+
+
+def _yaml_dump() -> Callable[[Any], str]:
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(
+            "Could not locate PyYAML library to write the spec as YAML. You can either install PyYAML "
+            "as a separate dependency, or use the `third_party` extra tag."
+        )
+
+    class Dumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):  # type: ignore
+        def ignore_aliases(self, data: Any) -> bool:
+            # equal values are written in full every time, rather than as anchors that depend on object identity
+            return True
+
+    # without line wrapping, every value is written the same way regardless of its nesting level
+    return partial(yaml.dump, Dumper=Dumper, sort_keys=True, default_flow_style=False, width=2 ** 31 - 1)
+
+
+def iter_yaml(spec: OpenAPI) -> Iterator[str]:
+    """ Yields canonical YAML of the spec: block style, sorted keys, no anchors and no line wrapping.
+    Only one path item or component schema is held in its serialized form at a time.
+    """
+    dump = _yaml_dump()
+    skeleton, streamed = _streamed(spec)
+    return _yaml(skeleton, (), streamed, dump, '')
+
+
+def _yaml(value: Mapping[str, Any], location: Location, streamed: Streamed, dump: Callable[[Any], str],
+          indent: str) -> Iterator[str]:
+    if location in streamed:
+        for key, item in _items(location, streamed):
+            yield _indented(dump({key: item}), indent)
+        return
+    for key in sorted(value):
+        nested = location + (key,)
+        if nested in streamed and not streamed[nested][0]:
+            yield _indented(dump({key: {}}), indent)
+        elif isinstance(value[key], dict) and _contains_streamed(nested, streamed):
+            # "key: {}\n" without the empty mapping
+            yield indent + dump({key: {}})[:-4] + '\n'
+            yield from _yaml(value[key], nested, streamed, dump, indent + '  ')
+        else:
+            yield _indented(dump({key: value[key]}), indent)
+
+
+def _indented(text: str, indent: str) -> str:
+    if not indent:
+        return text
+    return ''.join(indent + line if line.strip() else line for line in text.splitlines(keepends=True))
+
+
+def _write(chunks: Iterator[str], stream: Any) -> None:
+    if _is_binary(stream):
+        for chunk in chunks:
+            stream.write(chunk.encode('utf-8'))
+    else:
+        for chunk in chunks:
+            stream.write(chunk)
+
+
+def write_json(spec: OpenAPI, stream: Any) -> None:
+    """ Writes canonical JSON of the spec to a text or a binary stream, see ``iter_json``
+    """
+    _write(iter_json(spec), stream)
+
+
+def write_yaml(spec: OpenAPI, stream: Any) -> None:
+    """ Writes canonical YAML of the spec to a text or a binary stream, see ``iter_yaml``
+    """
+    _write(iter_yaml(spec), stream)
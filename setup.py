@@ -53,7 +53,7 @@ setup(name='openapi-type',
       author_email='maxim.avanov@gmail.com',
       url='https://github.com/avanov/openapi-type',
       keywords='typing json yaml openapi oas swagger schema serialization deserialization structured-data',
-      packages=find_packages(exclude=['tests', 'tests.*']),
+      packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
       include_package_data=True,
       zip_safe=False,
       test_suite='tests',
@@ -0,0 +1,99 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest as pt
+
+from openapi_type import parse_spec, serialize_spec
+from openapi_type.aio import parse_spec_async, serialize_spec_async
+from openapi_type.parallel import ParseError
+
+from benchmarks.generator import generate_spec
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+async def _with_ticks(coro):
+    """ Runs ``coro`` alongside a task that counts the iterations of the event loop it gets to run in
+    """
+    ticks = 0
+    done = False
+
+    async def ticker():
+        nonlocal ticks
+        while not done:
+            await asyncio.sleep(0)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = ticks
+    try:
+        rv = await coro
+        ended = ticks
+    finally:
+        done = True
+        await task
+    return rv, ended - started
+
+
+async def _blocking(data):
+    return parse_spec(data)
+
+
+def test_event_loop_latency():
+    data = generate_spec(100, n_paths=100)
+    spec = parse_spec(data)
+
+    async def main():
+        parsed, ticks = await _with_ticks(_blocking(data))
+        assert parsed == spec
+        assert ticks == 0
+        # the loop runs other tasks at least once per chunk: the skeleton, 10 chunks of paths, 10 of schemas
+        parsed, ticks = await _with_ticks(parse_spec_async(data, chunk_size=10))
+        assert parsed == spec
+        assert ticks >= 21
+        serialized, ticks = await _with_ticks(serialize_spec_async(spec, chunk_size=10))
+        assert serialized == serialize_spec(spec)
+        assert ticks >= 21
+        assert await parse_spec_async(data) == spec
+        assert await serialize_spec_async(spec) == serialize_spec(spec)
+
+    asyncio.run(main())
+
+
+def test_cancellation():
+    data = generate_spec(50, n_paths=50)
+
+    async def main():
+        with CountingExecutor(1) as executor:
+            task = asyncio.create_task(parse_spec_async(data, executor, chunk_size=1))
+            while executor.submitted < 3:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pt.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.05)
+            # no chunks are submitted after the cancellation
+            assert executor.submitted < 5
+
+    asyncio.run(main())
+
+
+def test_process_pool():
+    data = generate_spec(10, n_paths=10)
+    invalid = {**data, 'paths': {**data['paths'], '/a': {'get': {'responses': 1}}}}
+
+    async def main():
+        with ProcessPoolExecutor(2) as executor:
+            assert await parse_spec_async(data, executor, chunk_size=4) == parse_spec(data)
+            with pt.raises(ParseError) as e:
+                await parse_spec_async(invalid, executor, chunk_size=4)
+            assert [x.pointer for x in e.value] == ['/paths/~1a/get/responses']
+
+    asyncio.run(main())
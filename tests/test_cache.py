@@ -0,0 +1,43 @@
+import json
+
+from openapi_type import cache as cache_module
+from openapi_type.cache import SpecCache
+
+from .paths import CUSTOM_EXAMPLES_DIR
+
+
+def _raw(name):
+    return (CUSTOM_EXAMPLES_DIR / f'{name}.json').read_bytes()
+
+
+def test_cache_hit_skips_parsing(tmp_path, monkeypatch):
+    cache = SpecCache(tmp_path)
+    raw = _raw('petstore')
+    assert cache.get(raw) is None
+
+    spec = cache.parse(raw, json.loads)
+    assert cache.path(cache.key(raw)).exists()
+
+    def fail(_data):
+        raise AssertionError('cached spec should not be parsed again')
+    monkeypatch.setattr(cache_module, 'parse_spec', fail)
+    assert cache.parse(raw, json.loads) == spec
+
+
+def test_cache_eviction_and_corruption(tmp_path):
+    one, petstore = _raw('one'), _raw('petstore')
+    cache = SpecCache(tmp_path)
+    cache.parse(one, json.loads)
+    one_size = cache.path(cache.key(one)).stat().st_size
+
+    # only the most recently stored snapshot fits
+    cache.max_bytes = one_size
+    cache.parse(petstore, json.loads)
+    assert not cache.path(cache.key(one)).exists()
+    assert cache.path(cache.key(petstore)).exists()
+
+    cache.max_bytes = 10 * one_size
+    cache.parse(one, json.loads)
+    cache.path(cache.key(one)).write_bytes(b'garbage')
+    assert cache.get(one) is None
+    assert not cache.path(cache.key(one)).exists()
@@ -0,0 +1,80 @@
+import io
+import json
+import shutil
+import subprocess
+import sys
+
+import pytest as pt
+
+from openapi_type.cli import main
+
+from .paths import CUSTOM_EXAMPLES_DIR
+
+
+def test_check_batch(tmp_path):
+    shutil.copytree(CUSTOM_EXAMPLES_DIR, tmp_path / 'specs')
+    (tmp_path / 'specs' / 'nested').mkdir()
+    (tmp_path / 'specs' / 'nested' / 'bad.json').write_text(json.dumps({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Bad'},
+        'paths': {'/a': {'get': {'responses': 1}}},
+    }))
+
+    out = io.StringIO()
+    main(['check', str(tmp_path / 'specs' / '*.json'), '-j', '2'], out_channel=out)
+    results = [json.loads(x) for x in out.getvalue().splitlines()]
+    assert sorted(x['source'] for x in results) == sorted(str(x) for x in (tmp_path / 'specs').glob('*.json'))
+    assert all(x['ok'] for x in results)
+
+    out = io.StringIO()
+    with pt.raises(SystemExit) as e:
+        main(['check', str(tmp_path / 'specs'), '-j', '2'], out_channel=out)
+    assert e.value.code == 1
+    results = {x['source']: x for x in map(json.loads, out.getvalue().splitlines())}
+    assert len(results) == 3
+    bad = results[str(tmp_path / 'specs' / 'nested' / 'bad.json')]
+    assert not bad['ok']
+    assert [x['pointer'] for x in bad['errors']] == ['/paths/~1a/get/responses']
+
+
+def test_load_data():
+    from openapi_type.cli.load import DataFormat, sniff_format, load_data
+
+    assert sniff_format(b'\xef\xbb\xbf \n {"a": 1}') is DataFormat.JSON
+    assert sniff_format(b'a: 1') is DataFormat.YAML
+    assert sniff_format(b'{"a": 1}', 'spec.yaml') is DataFormat.YAML
+    assert load_data(b'{"a": 1}') == {'a': 1}
+    assert load_data(b'{a: 1}') == {'a': 1}
+    assert load_data(b'a: [1, 2]', 'spec.json') == {'a': [1, 2]}
+
+
+def test_check_timings():
+    out = io.StringIO()
+    main(['check', '-s', str(CUSTOM_EXAMPLES_DIR / 'one.json'), '--timings'], out_channel=out)
+    parsed, timings = out.getvalue().splitlines()
+    assert parsed == 'Successfully parsed.'
+    assert timings.startswith('Loaded in ')
+
+
+def test_startup_imports():
+    # the parser is built on first use, so neither the package nor the CLI should load typeit at import time
+    code = ('import sys, openapi_type, openapi_type.cli; '
+            'print(",".join(m for m in ("typeit", "colander", "pkg_resources") if m in sys.modules))')
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    assert out.stdout.strip() == ''
+
+
+def test_lazy_type_generator():
+    code = ('import sys, openapi_type; from openapi_type import TypeGenerator; '
+            'print("typeit" in sys.modules, TypeGenerator is sys.modules["openapi_type.custom_types"].TypeGenerator)')
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    assert out.stdout.split() == ['True', 'True']
+
+
+def test_check_profile():
+    out = io.StringIO()
+    main(['check', '-s', str(CUSTOM_EXAMPLES_DIR / 'one.json'), '--profile'], out_channel=out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == 'Successfully parsed.'
+    assert lines[1].split() == ['calls', 'total', 'ms', 'own', 'ms', 'blocks', 'own', 'blocks', 'Type']
+    assert any(x.endswith('  Location') for x in lines)
@@ -0,0 +1,75 @@
+import json
+import pickle
+
+import pytest as pt
+
+from openapi_type import parse_spec, serialize_spec
+from openapi_type.compact import CompactMap, compact
+from openapi_type.validation import InvalidPayload, ValidatorCompiler
+
+from benchmarks.generator import generate_spec
+from .test_graph import SPEC
+
+
+def test_compact_map():
+    m = CompactMap(('a', 'b'), (1, 2))
+    assert m == {'a': 1, 'b': 2} and {'b': 2, 'a': 1} == m
+    assert m == CompactMap(('b', 'a'), (2, 1)) and m != {'a': 1}
+    assert m['b'] == 2 and m.get('c') is None and 'a' in m and 'c' not in m
+    assert list(m.items()) == [('a', 1), ('b', 2)] and list(m.values()) == [1, 2] and len(m) == 2
+    with pt.raises(KeyError):
+        m['c']
+    assert pickle.loads(pickle.dumps(m)) == m
+
+
+def test_compact():
+    data = generate_spec(30, n_paths=10)
+    spec = parse_spec(data)
+    compacted = parse_spec(data, compact=True)
+    assert compacted == spec and spec == compacted
+    assert serialize_spec(compacted) == serialize_spec(spec)
+    assert parse_spec(serialize_spec(compacted)) == spec
+    assert pickle.loads(pickle.dumps(compacted)) == spec
+
+    # large mappings stay dicts, small ones share their keys
+    assert type(compacted.components.schemas) is dict
+    assert all(isinstance(x.responses, CompactMap) for item in compacted.paths.values()
+               for x in (item.get, item.post) if x is not None)
+    value = compact({'x': {'a': 1, 'b': [1]}, 'y': {'a': 2, 'b': [2]}, 'z': {'a': 1, 'b': [1]}})
+    assert value['x']._keys is value['y']._keys and value['x'] is value['z']
+
+    spec = parse_spec(SPEC, compact=True)
+    schemas = spec.components.schemas
+    assert schemas['Pet'].required is schemas['Error'].required
+    validate = ValidatorCompiler(spec).compile(schemas['Owner'])
+    validate({'pets': [{'name': 'a'}]})
+    with pt.raises(InvalidPayload):
+        validate({'pets': [{'name': 1}]})
+
+
+def test_compact_raw_data():
+    media_type = {
+        'schema': {'$ref': '#/components/schemas/Pet'},
+        'examples': {'cat': {'value': {'name': 'Tom', 'tag': 'cat'}}},
+        'encoding': {'name': {'contentType': 'text/plain'}},
+    }
+    data = {
+        **SPEC,
+        'paths': {
+            '/pets': {'post': {
+                'requestBody': {'$ref': '#/components/requestBodies/B'},
+                'responses': {'201': {'description': 'Created', 'content': {'application/json': media_type}}},
+            }},
+        },
+        'components': {**SPEC['components'], 'requestBodies': {'B': {'content': {'application/json': media_type}}}},
+    }
+    spec = parse_spec(data)
+    compacted = compact(spec)
+    assert compacted == spec
+    assert json.loads(json.dumps(serialize_spec(compacted))) == serialize_spec(spec)
+    # raw data stays as parsed, typed mappings are compacted
+    body = compacted.components.request_bodies['B']
+    assert type(body) is dict and json.loads(json.dumps(body)) == {'content': {'application/json': media_type}}
+    content = compacted.paths['/pets'].post.responses['201'].content
+    assert isinstance(compacted.paths['/pets'].post.responses, CompactMap)
+    assert type(next(iter(content.values())).examples['cat']) is dict
@@ -0,0 +1,85 @@
+from collections import abc
+
+import pytest as pt
+
+from openapi_type import Reference, parse_spec
+from openapi_type.custom_types import Ref, RefTo
+from openapi_type.deref import Cycle, DereferencedView
+from openapi_type.resolver import ReferenceCycle, UnresolvedReference, iter_refs
+
+from .test_graph import SPEC, _json, _ref
+
+
+def schema(name):
+    return Ref(RefTo.SCHEMAS, name)
+
+
+def test_dereferenced_view():
+    spec = parse_spec(SPEC)
+    view = DereferencedView(spec)
+    pets = view.spec.paths['/pets'].get
+    assert pets is view.spec.paths['/pets'].get
+    assert pets.responses['200'].content[next(iter(pets.responses['200'].content))].schema.items is view[schema('Pet')]
+    assert pets.responses['404'] is view[Ref(RefTo.RESPONSES, 'NotFound')]
+    assert [x.name for x in pets.parameters] == ['limit']
+    # components without references are shared with the spec
+    assert view[schema('Pet')] is spec.components.schemas['Pet']
+    assert view.spec.components.schemas['Owner'].properties['pets'].items is view[schema('Pet')]
+
+    # recursion is marked, rather than expanded
+    node, leaf = view[schema('Node')], view[schema('Leaf')]
+    assert node.properties['next'].one_of == [Cycle(schema('Node')), Cycle(schema('Leaf'))]
+    assert leaf.properties['parent'] == Cycle(schema('Node'))
+    assert view[leaf.properties['parent']] is node
+    assert all(isinstance(x, Cycle) for x in _references(view.spec))
+    assert view.spec.components.schemas == {k: view[schema(k)] for k in spec.components.schemas}
+
+
+def _references(value):
+    pending = [value]
+    while pending:
+        x = pending.pop()
+        if isinstance(x, (Reference, Cycle)):
+            yield x
+        elif isinstance(x, tuple):
+            pending.extend(x)
+        elif isinstance(x, abc.Mapping):
+            pending.extend(x.values())
+        elif isinstance(x, (list, frozenset)):
+            pending.extend(x)
+
+
+def test_dereferenced_edge_cases():
+    n = 3000
+    schemas = {f'S{i}': {'type': 'array', 'items': _ref(f'S{i + 1}')} for i in range(n)}
+    schemas[f'S{n}'] = {'type': 'string'}
+    schemas['Alias'] = _ref('S0')
+    schemas['Loop'] = _ref('Loop')
+    schemas['Dangling'] = {'type': 'array', 'items': _ref('Missing')}
+    spec = parse_spec({
+        **SPEC,
+        'paths': {'/things': {'get': {
+            'parameters': [_ref('Filter', 'parameters')],
+            'responses': {'200': {'description': 'OK', 'content': _json(_ref('Alias'))}},
+        }}},
+        'components': {
+            'schemas': schemas,
+            'parameters': {'Filter': {'name': 'filter', 'in': 'query', 'schema': {
+                'type': 'object', 'properties': {'name': {'type': 'string'}},
+            }}},
+        },
+    })
+    view = DereferencedView(spec)
+    # long chains of references do not exhaust the stack
+    assert view[schema('Alias')] is view[schema('S0')]
+    assert view[schema('S0')].items.items is view[schema('S2')]
+    with pt.raises(ReferenceCycle):
+        view[schema('Loop')]
+    with pt.raises(UnresolvedReference):
+        view[schema('Missing')]
+    assert view[schema('Dangling')].items == Reference(schema('Missing'))
+
+    things = view.spec.paths['/things'].get
+    # parameters with object schemas cannot be members of a set once dereferenced
+    assert things.parameters == (view[Ref(RefTo.PARAMS, 'Filter')],)
+    assert not list(iter_refs(things.responses))
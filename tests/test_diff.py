@@ -0,0 +1,200 @@
+import copy
+import io
+import json
+
+import pytest as pt
+
+from openapi_type import parse_spec, serialize_spec
+from openapi_type.cli import main
+from openapi_type.diff import ChangeKind, diff_specs
+from openapi_type.fingerprint import Fingerprints
+
+
+PET = {'type': 'object', 'required': ['name'],
+       'properties': {'name': {'type': 'string'}, 'tag': {'type': 'string'}}}
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'version': '1', 'title': 'Pets'},
+    'paths': {
+        '/pets': {
+            'get': {
+                'parameters': [
+                    {'name': 'limit', 'in': 'query', 'schema': {'type': 'integer', 'maximum': 100}},
+                    {'name': 'kind', 'in': 'query', 'schema': {'type': 'string', 'enum': ['cat', 'dog']}},
+                ],
+                'responses': {'200': {'description': 'OK', 'content': {'application/json': {
+                    'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}},
+                }}}},
+            },
+            'post': {
+                'requestBody': {'content': {'application/json': {'schema': {'$ref': '#/components/schemas/Pet'}}}},
+                'responses': {'201': {'description': 'Created'}},
+            },
+        },
+        '/pets/{id}': {
+            'delete': {'responses': {'204': {'description': 'Deleted'}}},
+        },
+    },
+    'components': {'schemas': {'Pet': PET}},
+}
+
+
+def _changed(**updates):
+    rv = copy.deepcopy(SPEC)
+    for pointer, value in updates.items():
+        *parents, key = pointer.split('.')
+        target = rv
+        for x in parents:
+            target = target[int(x)] if isinstance(target, list) else target[x]
+        target[key] = value
+    return rv
+
+
+def _changes(data):
+    return {(x.kind, x.pointer): x for x in diff_specs(parse_spec(SPEC), parse_spec(data))}
+
+
+def test_identical():
+    spec = parse_spec(SPEC)
+    assert diff_specs(spec, spec) == []
+    assert diff_specs(spec, parse_spec(serialize_spec(spec))) == []
+    assert diff_specs(spec, parse_spec(SPEC), Fingerprints()) == []
+
+
+def test_paths_and_operations():
+    data = copy.deepcopy(SPEC)
+    del data['paths']['/pets/{id}']
+    data['paths']['/pets']['put'] = data['paths']['/pets']['post']
+    del data['paths']['/pets']['post']
+    data['info']['description'] = 'All pets'
+    changes = _changes(data)
+    assert set(changes) == {
+        (ChangeKind.REMOVED, '/paths/~1pets~1{id}'),
+        (ChangeKind.REMOVED, '/paths/~1pets/post'),
+        (ChangeKind.ADDED, '/paths/~1pets/put'),
+        (ChangeKind.CHANGED, '/info/description'),
+    }
+    assert [x.pointer for x in changes.values() if x.breaking] == ['/paths/~1pets~1{id}', '/paths/~1pets/post']
+
+
+@pt.mark.parametrize('data, expected', [
+    # a new optional parameter, listed after "limit" in the serialized spec
+    (_changed(**{'paths./pets.get.parameters': SPEC['paths']['/pets']['get']['parameters'] + [
+        {'name': 'offset', 'in': 'query', 'schema': {'type': 'integer'}},
+    ]}), {(ChangeKind.ADDED, '/paths/~1pets/get/parameters/2', False)}),
+    (_changed(**{'paths./pets.get.parameters': SPEC['paths']['/pets']['get']['parameters'] + [
+        {'name': 'offset', 'in': 'query', 'required': True, 'schema': {'type': 'integer'}},
+    ]}), {(ChangeKind.ADDED, '/paths/~1pets/get/parameters/2', True)}),
+    (_changed(**{'paths./pets.get.parameters': SPEC['paths']['/pets']['get']['parameters'][:1]}),
+     {(ChangeKind.REMOVED, '/paths/~1pets/get/parameters/0', True)}),
+    # requests may send fewer values, but not more
+    (_changed(**{'paths./pets.get.parameters.0.schema.maximum': 50}),
+     {(ChangeKind.CHANGED, '/paths/~1pets/get/parameters/1/schema/maximum', True)}),
+    (_changed(**{'paths./pets.get.parameters.0.schema.maximum': 500}),
+     {(ChangeKind.CHANGED, '/paths/~1pets/get/parameters/1/schema/maximum', False)}),
+    (_changed(**{'paths./pets.get.parameters.1.schema.enum': ['cat', 'dog', 'fish']}),
+     {(ChangeKind.CHANGED, '/paths/~1pets/get/parameters/0/schema/enum', False)}),
+    (_changed(**{'paths./pets.get.parameters.1.required': True}),
+     {(ChangeKind.CHANGED, '/paths/~1pets/get/parameters/0/required', True)}),
+])
+def test_parameters(data, expected):
+    assert {(x.kind, x.pointer, x.breaking) for x in _changes(data).values()} == expected
+
+
+def test_schemas():
+    pet = copy.deepcopy(PET)
+    pet['properties']['age'] = {'type': 'integer'}
+    pet['required'] = ['name', 'age']
+    del pet['properties']['tag']
+    changes = _changes(_changed(**{'components.schemas.Pet': pet}))
+    # the schema is both written by clients and read by them
+    assert {(x.kind, x.pointer, x.breaking) for x in changes.values()} == {
+        (ChangeKind.ADDED, '/components/schemas/Pet/properties/age', True),
+        (ChangeKind.REMOVED, '/components/schemas/Pet/properties/tag', True),
+    }
+
+    response = {'type': 'array', 'items': {'type': 'string'}}
+    changes = _changes(_changed(**{
+        'paths./pets.get.responses.200.content.application/json.schema': response,
+        'paths./pets.post.requestBody.required': True,
+        'components.schemas.Owner': {'type': 'object', 'properties': {}},
+    }))
+    assert {(x.kind, x.pointer, x.breaking) for x in changes.values()} == {
+        (ChangeKind.CHANGED, '/paths/~1pets/get/responses/200/content/application~1json/schema/items', True),
+        (ChangeKind.CHANGED, '/paths/~1pets/post/requestBody/required', True),
+        (ChangeKind.ADDED, '/components/schemas/Owner', False),
+    }
+
+
+def test_cli(tmp_path):
+    data = copy.deepcopy(SPEC)
+    del data['paths']['/pets/{id}']
+    data['paths']['/pets']['get']['description'] = 'Lists pets'
+    (tmp_path / 'old.json').write_text(json.dumps(SPEC))
+    (tmp_path / 'new.json').write_text(json.dumps(data))
+
+    out = io.StringIO()
+    main(['diff', str(tmp_path / 'old.json'), str(tmp_path / 'new.json'), '--json'], out_channel=out)
+    assert [json.loads(x) for x in out.getvalue().splitlines()] == [
+        {'kind': 'removed', 'pointer': '/paths/~1pets~1{id}', 'breaking': True, 'message': 'path removed'},
+        {'kind': 'changed', 'pointer': '/paths/~1pets/get/description', 'breaking': False,
+         'message': 'value changed'},
+    ]
+
+    out = io.StringIO()
+    with pt.raises(SystemExit) as e:
+        main(['diff', str(tmp_path / 'old.json'), str(tmp_path / 'new.json'), '--breaking-only',
+              '--fail-on-breaking'], out_channel=out)
+    assert e.value.code == 1
+    assert out.getvalue().splitlines() == ['BREAKING removed /paths/~1pets~1{id}: path removed']
+
+
+REFERENCED = {
+    'openapi': '3.0.0',
+    'info': {'version': '1', 'title': 'Pets'},
+    'paths': {
+        '/pets': {
+            'get': {
+                'parameters': [{'$ref': '#/components/parameters/Lim'}],
+                'responses': {'200': {'$ref': '#/components/responses/Pets'}},
+            },
+        },
+    },
+    'components': {
+        'schemas': {},
+        'parameters': {'Lim': {'name': 'limit', 'in': 'query', 'schema': {'type': 'integer'}}},
+        'responses': {'Pets': {
+            'description': 'OK',
+            'headers': {'X-Total': {'schema': {'type': 'integer'}}},
+            'content': {'application/json': {'schema': {
+                'type': 'object', 'properties': {'name': {'type': 'string'}, 'tag': {'type': 'string'}},
+            }}},
+        }},
+    },
+}
+
+
+@pt.mark.parametrize('pointer, value, expected', [
+    ('components.parameters.Lim.required', True,
+     {(ChangeKind.CHANGED, '/components/parameters/Lim/required', True)}),
+    ('components.parameters.Lim.schema', {'type': 'integer', 'maximum': 10},
+     {(ChangeKind.CHANGED, '/components/parameters/Lim/schema/maximum', True)}),
+    ('components.parameters.Lim.name', 'max',
+     {(ChangeKind.CHANGED, '/components/parameters/Lim', True)}),
+    ('components.responses.Pets.content.application/json.schema.properties', {'name': {'type': 'string'}},
+     {(ChangeKind.REMOVED, '/components/responses/Pets/content/application~1json/schema/properties/tag', True)}),
+    ('components.responses.Pets.headers', {},
+     {(ChangeKind.REMOVED, '/components/responses/Pets/headers/X-Total', True)}),
+    ('components.responses.Pets.description', 'Pets',
+     {(ChangeKind.CHANGED, '/components/responses/Pets/description', False)}),
+])
+def test_referenced_components(pointer, value, expected):
+    data = copy.deepcopy(REFERENCED)
+    *parents, key = pointer.split('.')
+    target = data
+    for x in parents:
+        target = target[x]
+    target[key] = value
+    changes = diff_specs(parse_spec(REFERENCED), parse_spec(data))
+    assert {(x.kind, x.pointer, x.breaking) for x in changes} == expected
@@ -0,0 +1,88 @@
+import io
+import json
+
+from openapi_type import parse_spec
+from openapi_type.encoding import EncoderCompiler
+
+
+def _compiler(schemas):
+    spec = parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Encoding'},
+        'paths': {},
+        'components': {'schemas': schemas},
+    })
+    return spec, EncoderCompiler(spec)
+
+
+SCHEMAS = {
+    'Node': {
+        'type': 'object',
+        'required': ['name'],
+        'properties': {
+            'name': {'type': 'string'},
+            'weight': {'type': 'number'},
+            'active': {'type': 'boolean'},
+            'children': {'type': 'array', 'items': {'$ref': '#/components/schemas/Node'}},
+            'labels': {'type': 'object', 'additionalProperties': {'type': 'string'}},
+        },
+    },
+    'Point': {
+        'type': 'object',
+        'required': ['x', 'y', 'tags'],
+        'properties': {
+            'x': {'type': 'integer'},
+            'y': {'type': 'integer'},
+            'tags': {'type': 'array', 'items': {'type': 'string'}},
+        },
+    },
+    'Named': {'allOf': [{'$ref': '#/components/schemas/Point'},
+                        {'type': 'object', 'required': ['name'], 'properties': {'name': {'type': 'string'}}}]},
+    'Points': {'type': 'array', 'items': {'$ref': '#/components/schemas/Point'}},
+    'Id': {'oneOf': [{'type': 'integer'}, {'type': 'string'}]},
+}
+
+
+def test_encoder_output():
+    spec, compiler = _compiler(SCHEMAS)
+    schemas = spec.components.schemas
+    node = compiler.compile(schemas['Node'])
+    assert compiler.compile(schemas['Node']) is node
+
+    assert node.encode({'name': 'é', 'active': True}) == '{"name":"\\u00e9","active":true}'
+    assert node.encode({}) == '{}'
+    point = compiler.compile(schemas['Point'])
+    assert point.encode({'tags': [], 'y': 2, 'x': 1}) == '{"x":1,"y":2,"tags":[]}'
+
+    payloads = [
+        (node, {'name': 'root', 'weight': 1, 'children': [{'name': 'leaf', 'weight': 0.5, 'labels': {'a': 'b'}}]}),
+        # values that do not match their schemas are encoded as they are
+        (node, {'name': 'a', 'weight': float('nan'), 'extra': [1]}),
+        (node, {'name': 'a', 'active': 1, 'children': [{'name': None}]}),
+        (point, {'x': True, 'y': 1.5, 'tags': ['a']}),
+        (point, {'x': 1, 'y': 2}),
+        (compiler.compile(schemas['Named']), {'x': 1, 'y': 2, 'tags': ['a'], 'name': 'n'}),
+        (compiler.compile(schemas['Id']), 'a'),
+    ]
+    for encoder, payload in payloads:
+        assert json.loads(encoder.encode(payload)) == json.loads(json.dumps(payload)), payload
+
+
+def test_encoder_streaming():
+    spec, compiler = _compiler(SCHEMAS)
+    points = compiler.compile(spec.components.schemas['Points'])
+    rows = [{'x': i, 'y': -i, 'tags': [str(i)]} for i in range(1000)]
+    expected = points.encode(rows)
+    assert json.loads(expected) == rows
+
+    chunks = list(points.iter_encode(iter(rows), chunk_size=1024))
+    assert len(chunks) > 1
+    assert all(len(x) < 1024 + 64 for x in chunks)
+    assert ''.join(chunks) == expected
+    assert ''.join(points.iter_encode([])) == '[]'
+
+    text, binary = io.StringIO(), io.BytesIO()
+    points.write((x for x in rows), text)
+    points.write(rows, binary)
+    assert text.getvalue() == expected
+    assert binary.getvalue() == expected.encode()
@@ -0,0 +1,76 @@
+from openapi_type import parse_spec, serialize_spec
+from openapi_type.fingerprint import Fingerprints, duplicate_schemas
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .utils import load_spec
+
+
+PET = {'type': 'object', 'required': ['name'],
+       'properties': {'name': {'type': 'string'}, 'tag': {'type': 'string'}}}
+ADDRESS = {'type': 'object', 'properties': {'city': {'type': 'string'}, 'zip': {'type': 'string'}}}
+OWNER = {'type': 'object', 'properties': {'name': {'type': 'string'}, 'address': ADDRESS}}
+
+
+def _operation(schema):
+    return {
+        'requestBody': {'content': {'application/json': {'schema': schema}}},
+        'responses': {'200': {'description': 'OK', 'content': {'application/json': {'schema': PET}}}},
+    }
+
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'version': '1', 'title': 'Duplicates'},
+    'paths': {
+        '/owners': {'post': _operation(OWNER), 'put': _operation(OWNER)},
+        '/addresses': {'post': _operation({'type': 'array', 'items': ADDRESS})},
+    },
+    'components': {'schemas': {'Pet': PET}},
+}
+
+
+def test_fingerprints():
+    spec = load_spec(CUSTOM_EXAMPLES_DIR / 'petstore.json')
+    fingerprints = Fingerprints()
+    copy = parse_spec(serialize_spec(spec))
+    assert fingerprints.equal(copy, spec)
+    assert fingerprints(copy) == fingerprints(spec)
+    changed = spec._replace(components=spec.components._replace(schemas={
+        **spec.components.schemas, 'Extra': spec.components.schemas['Pet'],
+    }))
+    assert not fingerprints.equal(changed, spec)
+    # the same values, in a different order of keys
+    assert fingerprints({'a': 1, 'b': [1, 2]}) == fingerprints({'b': [1, 2], 'a': 1})
+    assert fingerprints([1, 2]) != fingerprints([2, 1])
+    assert fingerprints(1) != fingerprints('1') != fingerprints(True)
+
+
+def test_dedup():
+    spec = parse_spec(SPEC)
+    fingerprints = Fingerprints()
+    deduped = fingerprints.dedup(spec)
+    assert deduped == spec
+    assert fingerprints.equal(deduped, spec)
+
+    owners = deduped.paths['/owners']
+    assert owners.post is owners.put
+    pet = deduped.components.schemas['Pet']
+    response = owners.post.responses['200']
+    assert next(iter(response.content.values())).schema is pet
+    assert spec.paths['/owners'].post is not spec.paths['/owners'].put
+
+
+def test_duplicate_schemas():
+    spec = parse_spec(SPEC)
+    found = {x.pointers[0]: x for x in duplicate_schemas(spec)}
+    owner = found['/paths/~1owners/post/requestBody/content/application~1json/schema']
+    assert owner.pointers == [
+        '/paths/~1owners/post/requestBody/content/application~1json/schema',
+        '/paths/~1owners/put/requestBody/content/application~1json/schema',
+    ]
+    assert owner.component is None
+    pet = found['/paths/~1owners/post/responses/200/content/application~1json/schema']
+    assert pet.component == 'Pet'
+    assert len(pet.pointers) == 3
+    # addresses nested in the duplicated owners go with them, the one left outside is not a duplicate
+    assert len(found) == 2
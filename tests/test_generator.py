@@ -0,0 +1,11 @@
+from benchmarks.generator import generate_spec
+
+from openapi_type import parse_spec, serialize_spec
+
+
+def test_synthetic_spec():
+    data = generate_spec(20, nesting=1, ref_density=0.5, union_ratio=0.2, seed=1)
+    assert data == generate_spec(20, nesting=1, ref_density=0.5, union_ratio=0.2, seed=1)
+    oapi = parse_spec(data)
+    assert len(oapi.components.schemas) == 20
+    assert parse_spec(serialize_spec(oapi)) == oapi
@@ -0,0 +1,143 @@
+from pyrsistent import PVector, pvector
+
+from openapi_type import parse_spec, serialize_spec
+from openapi_type.custom_types import Ref, RefTo
+from openapi_type.graph import DependencyGraph, extract
+from openapi_type.operations import OperationKey
+
+
+def _ref(name, location='schemas'):
+    return {'$ref': f'#/components/{location}/{name}'}
+
+
+def _json(schema):
+    return {'application/json': {'schema': schema}}
+
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'version': '1', 'title': 'Graph'},
+    'security': [{'key': []}],
+    'tags': [{'name': 'pets'}, {'name': 'owners'}],
+    'paths': {
+        '/pets': {
+            'get': {
+                'operationId': 'listPets',
+                'tags': ['pets'],
+                'parameters': [_ref('Limit', 'parameters')],
+                'responses': {
+                    '200': {'description': 'OK', 'content': _json({'type': 'array', 'items': _ref('Pet')})},
+                    '404': _ref('NotFound', 'responses'),
+                },
+            },
+        },
+        '/owners': {
+            'post': {
+                'tags': ['owners'],
+                'security': [{'oauth': ['write']}],
+                'requestBody': {'content': _json(_ref('Owner'))},
+                'responses': {'201': {'description': 'Created'}},
+            },
+        },
+        '/nodes': {
+            'get': {'responses': {'200': {'description': 'OK', 'content': _json(_ref('Node'))}}},
+        },
+    },
+    'components': {
+        'schemas': {
+            'Pet': {'type': 'object', 'properties': {'name': {'type': 'string'}}},
+            'Owner': {'type': 'object', 'properties': {'pets': {'type': 'array', 'items': _ref('Pet')}}},
+            'Node': {'type': 'object', 'properties': {'next': {'oneOf': [_ref('Node'), _ref('Leaf')]}}},
+            'Leaf': {'type': 'object', 'properties': {'parent': _ref('Node')}},
+            'Error': {'type': 'object', 'properties': {'message': {'type': 'string'}}},
+            'Unused': {'type': 'object', 'properties': {'pet': _ref('Pet')}},
+        },
+        'parameters': {'Limit': {'name': 'limit', 'in': 'query', 'schema': {'type': 'integer'}}},
+        'responses': {'NotFound': {'description': 'Not found', 'content': _json(_ref('Error'))}},
+        'securitySchemes': {
+            'key': {'type': 'apiKey', 'name': 'key', 'in': 'header'},
+            'oauth': {'type': 'oauth2', 'flows': {}},
+        },
+    },
+}
+
+
+def schema(name):
+    return Ref(RefTo.SCHEMAS, name)
+
+
+def test_graph():
+    graph = DependencyGraph(parse_spec(SPEC))
+    pets = OperationKey('/pets', 'get')
+    key = Ref(RefTo.SECURITY_SCHEMES, 'key')
+    assert graph.dependencies(pets) == {
+        Ref(RefTo.PARAMS, 'Limit'), Ref(RefTo.RESPONSES, 'NotFound'), schema('Pet'), key,
+    }
+    assert graph.reachable([pets]) == {
+        Ref(RefTo.PARAMS, 'Limit'), Ref(RefTo.RESPONSES, 'NotFound'), schema('Pet'), schema('Error'), key,
+    }
+    # operations that have security requirements of their own do not need the default ones
+    assert graph.dependencies(OperationKey('/owners', 'post')) == {
+        schema('Owner'), Ref(RefTo.SECURITY_SCHEMES, 'oauth'),
+    }
+    assert graph.reachable([schema('Leaf')]) == {schema('Leaf'), schema('Node')}
+    assert graph.dependents(schema('Pet')) == {pets, schema('Owner'), schema('Unused')}
+    assert graph.unused() == {schema('Unused')}
+
+    order = graph.order()
+    position = {ref: i for i, group in enumerate(order) for ref in group}
+    assert frozenset({schema('Node'), schema('Leaf')}) in order
+    for group in order:
+        for ref in group:
+            assert all(position[x] <= position[ref] for x in graph.dependencies(ref))
+
+
+def test_extract():
+    spec = parse_spec(SPEC)
+    owners = extract(spec, tags=['owners'])
+    assert list(owners.paths) == ['/owners']
+    assert set(owners.components.schemas) == {'Owner', 'Pet'}
+    assert not owners.components.parameters and not owners.components.responses
+    assert set(owners.components.security_schemes) == {'key', 'oauth'}
+    assert [x.name for x in owners.tags] == ['owners']
+    assert parse_spec(serialize_spec(owners)) == owners
+
+    pets = extract(spec, operations=['listPets', OperationKey('/nodes', 'get')])
+    assert list(pets.paths) == ['/pets', '/nodes']
+    assert list(pets.components.schemas) == ['Pet', 'Node', 'Leaf', 'Error']
+    assert set(pets.components.security_schemes) == {'key'}
+    assert extract(spec, operations=list(DependencyGraph(spec).operations)).components.schemas.keys() == \
+        spec.components.schemas.keys() - {'Unused'}
+
+
+def test_raw_component_refs():
+    spec = parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Raw'},
+        'paths': {
+            '/a': {'post': {'operationId': 'a', 'requestBody': _ref('B', 'requestBodies'),
+                            'responses': {'204': {'description': 'OK'}}}},
+            '/c': {'get': {'operationId': 'c', 'responses': {'204': {'description': 'OK'}}}},
+        },
+        'components': {
+            'schemas': {'X': {'type': 'object', 'properties': {'y': {'type': 'string'}}}, 'Unused': {}},
+            'requestBodies': {'B': {'content': _json(_ref('X'))}},
+        },
+    })
+    graph = DependencyGraph(spec)
+    x, b = Ref(RefTo.SCHEMAS, 'X'), Ref(RefTo.REQUEST_BODIES, 'B')
+    # request bodies of components are raw data, with their references as '$ref' strings
+    assert graph.dependencies(b) == {x}
+    assert graph.unused() == {Ref(RefTo.SCHEMAS, 'Unused')}
+
+    extracted = extract(spec, operations=['a'])
+    assert list(extracted.components.schemas) == ['X']
+    assert list(extracted.components.request_bodies) == ['B']
+    assert parse_spec(serialize_spec(extracted)) == extracted
+
+
+def test_extract_keeps_tags_type():
+    spec = parse_spec(SPEC)
+    spec = spec._replace(tags=pvector(spec.tags))
+    assert isinstance(extract(spec, tags=['owners']).tags, PVector)
+    assert extract(spec, tags=['owners', 'pets']).tags is spec.tags
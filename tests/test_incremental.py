@@ -0,0 +1,103 @@
+import copy
+import io
+import json
+
+import pytest as pt
+
+from openapi_type import parse_spec
+from openapi_type.cli.check import watch
+from openapi_type.cli.load import IncrementalLoader
+from openapi_type.incremental import IncrementalParser, ParseStats
+from openapi_type.parallel import ParseError
+
+from benchmarks.generator import generate_spec
+
+
+def _entries(data):
+    return len(data['paths']) + sum(len(x) for x in data['components'].values())
+
+
+def test_incremental_parser():
+    data = generate_spec(30, n_paths=10)
+    parser = IncrementalParser()
+    spec = parser.parse(data)
+    assert spec == parse_spec(data)
+    total = _entries(data)
+    assert parser.stats == ParseStats(reparsed=total, total=total, skeleton=True)
+
+    edited = copy.deepcopy(data)
+    path = next(iter(edited['paths']))
+    edited['paths'][path]['summary'] = 'Edited'
+    del edited['components']['schemas'][next(iter(edited['components']['schemas']))]
+    edited['components']['parameters'] = {'Limit': {'name': 'limit', 'in': 'query', 'schema': {'type': 'integer'}}}
+    new = parser.parse(edited)
+    assert new == parse_spec(edited)
+    # the removed schema is replaced with a new parameter, in a new section of components
+    assert parser.stats == ParseStats(reparsed=2, total=total, skeleton=True)
+    # unchanged parts are reused as they are
+    other = list(data['paths'])[1]
+    assert new.paths[other] is spec.paths[other]
+
+    # every version is a new document, since the parser keeps the previous one to compare with
+    edited = copy.deepcopy(edited)
+    edited['info']['title'] = 'Edited'
+    assert parser.parse(edited) == parse_spec(edited)
+    assert parser.stats == ParseStats(reparsed=0, total=total, skeleton=True)
+    edited = copy.deepcopy(edited)
+    edited['paths'][path]['summary'] = 'Edited again'
+    assert parser.parse(edited) == parse_spec(edited)
+    assert parser.stats == ParseStats(reparsed=1, total=total, skeleton=False)
+
+
+def test_incremental_errors():
+    data = generate_spec(5, n_paths=2)
+    parser = IncrementalParser()
+    spec = parser.parse(data)
+    invalid = copy.deepcopy(data)
+    path = next(iter(invalid['paths']))
+    invalid['paths'][path] = {'get': {'responses': 1}}
+    with pt.raises(ParseError) as e:
+        parser.parse(invalid)
+    assert [x.pointer for x in e.value] == [f"/paths/{path.replace('/', '~1')}/get/responses"]
+    # the parser stays at the last valid version
+    assert parser.spec is spec
+    assert parser.parse(data) == spec
+    assert parser.stats.reparsed == 0
+
+
+def test_incremental_loader():
+    text = json.dumps(generate_spec(10, n_paths=4), indent=2)
+    loader = IncrementalLoader('spec.json')
+    data = loader.load(text.encode())
+    assert data == json.loads(text) and not loader.partial
+
+    # an edit within a single path item
+    position = text.index('"description": "') + len('"description": "')
+    edited = text[:position] + 'Ünicode ' + text[position:]
+    new = loader.load(edited.encode())
+    assert loader.partial
+    assert new == json.loads(edited)
+    assert sum(new['paths'][k] is not data['paths'][k] for k in data['paths']) == 1
+    assert new['components'] is data['components']
+
+    # the edits are tracked across versions, by their byte offsets
+    position = edited.rindex('"type": "') + len('"type": "')
+    again = edited[:position] + 'x' + edited[position:]
+    assert loader.load(again.encode()) == json.loads(again) and loader.partial
+
+    # a new path is a change outside of the existing entries
+    added = again.replace('"paths": {', '"paths": {"/new": {},', 1)
+    assert loader.load(added.encode()) == json.loads(added) and not loader.partial
+    # invalid JSON is reported by the regular loader
+    with pt.raises(Exception):
+        loader.load(added.replace('"/new": {}', '"/new": {', 1).encode())
+
+
+def test_watch(tmp_path):
+    source = tmp_path / 'spec.json'
+    data = generate_spec(5, n_paths=2)
+    source.write_text(json.dumps(data))
+    out = io.StringIO()
+    watch(source, out, interval=0.01, runs=1)
+    assert out.getvalue().startswith('Successfully parsed in ')
+    assert out.getvalue().endswith(f're-parsed {_entries(data)} of {_entries(data)} entries.\n')
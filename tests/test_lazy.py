@@ -0,0 +1,58 @@
+import json
+import pickle
+
+import pytest as pt
+from typeit.schema.errors import Error
+
+from openapi_type import parse_spec, serialize_spec, PathItem
+from openapi_type.lazy import parse_spec_lazy, force, LazyPaths
+
+from .paths import CUSTOM_EXAMPLES_DIR
+
+
+def test_lazy_paths():
+    with (CUSTOM_EXAMPLES_DIR / 'petstore.json').open() as f:
+        data = json.load(f)
+    strict = parse_spec(data)
+    lazy = parse_spec_lazy(data)
+    assert isinstance(lazy.paths, LazyPaths)
+    assert list(lazy.paths) == list(strict.paths)
+
+    item = lazy.paths['/pet']
+    assert isinstance(item, PathItem)
+    assert lazy.paths['/pet'] is item
+    assert item == strict.paths['/pet']
+
+    assert lazy == strict
+    assert force(lazy) == strict
+    assert serialize_spec(lazy) == serialize_spec(strict)
+    assert pickle.loads(pickle.dumps(lazy)) == strict
+
+
+def test_lazy_paths_errors():
+    data = {
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Lazy'},
+        'paths': {'/ok': {}, '/broken': {'get': {'responses': 1}}},
+    }
+    lazy = parse_spec_lazy(data)
+    assert lazy.paths['/ok'] == PathItem(None, None, None, None, None, None, None)
+    with pt.raises(Error):
+        lazy.paths['/broken']
+    with pt.raises(Error):
+        force(lazy)
+
+
+def test_lazy_paths_membership():
+    data = {
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Lazy'},
+        'paths': {'/ok': {}, '/broken': {'get': {'responses': 1}}},
+    }
+    paths = parse_spec_lazy(data).paths
+    assert '/ok' in paths and '/broken' in paths and '/missing' not in paths
+    assert paths.get('/missing') is None
+    assert paths.get('/missing', 1) == 1
+    assert repr(paths) == 'LazyPaths(parsed=0, total=2)'
+    assert paths.get('/ok') == PathItem(None, None, None, None, None, None, None)
+    assert repr(paths) == 'LazyPaths(parsed=1, total=2)'
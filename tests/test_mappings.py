@@ -0,0 +1,98 @@
+import json
+from functools import lru_cache
+
+import pytest as pt
+from typeit.schema.errors import Error
+
+from openapi_type import OpenAPI, overrides, parse_spec, serialize_spec
+from openapi_type.custom_types import (
+    SinglePassMapping, TypedMapping, TypeGenerator,
+    install_canonical_sets, install_dispatch, install_interning, iter_schema_nodes,
+)
+from openapi_type.pointer import invalid_pointers
+from openapi_type.values import DispatchStats
+
+from benchmarks.generator import generate_spec
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .test_graph import SPEC
+
+
+@lru_cache(maxsize=None)
+def _typed_mapping_tools():
+    """ The parser and the serializer of the package, with typeit's own ``TypedMapping``
+    """
+    parser, serializer = TypeGenerator & overrides ^ OpenAPI
+    root = parser.args[0].__self__
+    install_dispatch(root, DispatchStats())
+    install_interning(root)
+    install_canonical_sets(root)
+    assert any(type(x.typ) is TypedMapping for x in iter_schema_nodes(root))
+    assert not any(isinstance(x.typ, SinglePassMapping) for x in iter_schema_nodes(root))
+    return parser, serializer
+
+
+def _specs():
+    yield SPEC
+    for name in ('one', 'petstore'):
+        with (CUSTOM_EXAMPLES_DIR / f'{name}.json').open() as f:
+            yield json.load(f)
+    yield generate_spec(20)
+
+
+@pt.mark.parametrize('data', list(_specs()))
+def test_same_output(data):
+    parser, serializer = _typed_mapping_tools()
+    spec = parse_spec(data)
+    assert spec == parser(data)
+    assert serialize_spec(spec) == serializer(spec)
+
+
+def _invalid(path, value):
+    data = json.loads(json.dumps(SPEC))
+    *parents, key = path
+    target = data
+    for x in parents:
+        target = target[x]
+    target[key] = value
+    return data
+
+
+@pt.mark.parametrize('data', [
+    # a value of a mapping nested in other mappings
+    _invalid(['paths', '/pets', 'get', 'responses', '200', 'content', 'application/json'], 1),
+    # a mapping that is not a mapping
+    _invalid(['paths', '/pets', 'get', 'responses'], []),
+    _invalid(['components', 'schemas'], 'Pet'),
+    # a key that is not a string
+    _invalid(['components', 'schemas', 1], {'type': 'string'}),
+    # a media type of a response in the mapping of responses of components
+    _invalid(['components', 'responses', 'NotFound', 'content', 'application/json'], 'x'),
+])
+def test_same_errors(data):
+    parser, _ = _typed_mapping_tools()
+    with pt.raises(Error) as expected:
+        parser(data)
+    with pt.raises(Error) as e:
+        parse_spec(data)
+    assert e.value.validation_error.asdict() == expected.value.validation_error.asdict()
+    pointers = list(invalid_pointers(e.value.validation_error, data))
+    assert pointers == list(invalid_pointers(expected.value.validation_error, data))
+    assert pointers
+
+
+def test_error_pointers():
+    data = _invalid(['paths', '/pets', 'get', 'responses', '200', 'content', 'application/json'], 1)
+    with pt.raises(Error) as e:
+        parse_spec(data)
+    pointers = [x for x, _ in invalid_pointers(e.value.validation_error, e.value.sample_data)]
+    assert '/paths/~1pets/get/responses/200/content/application~1json' in pointers
+
+
+def test_no_copies():
+    data = {**SPEC, 'components': {**SPEC['components'], 'schemas': {'Pet': {'type': 'string', 'enum': ['a']}}}}
+    raw = json.dumps(data)
+    parse_spec(data)
+    # the input is neither copied nor changed
+    assert json.dumps(data) == raw
+    assert parse_spec(data).components.schemas['Pet'].enum == ['a']
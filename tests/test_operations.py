@@ -0,0 +1,70 @@
+from pyrsistent import pmap
+
+from openapi_type import parse_spec
+from openapi_type.operations import OperationIndex, OperationKey
+from openapi_type.values import ContentTypeTag
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .utils import load_spec
+
+
+JSON = ContentTypeTag('application/json', None)
+XML = ContentTypeTag('application/xml', None)
+
+
+def test_operation_index():
+    spec = load_spec(CUSTOM_EXAMPLES_DIR / 'petstore.json')
+    index = OperationIndex(spec)
+    assert len(index) == len(list(index))
+
+    key = index.by_id('addPet')
+    assert key == OperationKey('/pet', 'post')
+    assert index[key] is spec.paths['/pet'].post
+    assert key in index.tagged('pet')
+    assert key in index.with_method('POST')
+    assert key in index.consuming(JSON)
+    assert key in index.producing(XML)
+    assert not index.duplicate_ids
+
+    # an updated spec shares unchanged path items with the previous one
+    paths = pmap(spec.paths)
+    renamed = spec.paths['/pet/{petId}'].get._replace(operation_id='addPet', tags=frozenset(['renamed']))
+    paths = paths.set('/pet/{petId}', spec.paths['/pet/{petId}']._replace(get=renamed)).discard('/store/inventory')
+    index.update(spec._replace(paths=paths))
+
+    assert set(index.duplicate_ids['addPet']) == {key, OperationKey('/pet/{petId}', 'get')}
+    assert index.tagged('renamed') == [OperationKey('/pet/{petId}', 'get')]
+    assert index.by_id('getInventory') is None
+    assert OperationKey('/store/inventory', 'get') not in index.with_method('get')
+    assert len(index) == len(list(index))
+
+    index.update(spec)
+    assert not index.duplicate_ids
+    assert index.by_id('getInventory') == OperationKey('/store/inventory', 'get')
+    assert not index.tagged('renamed')
+
+
+def test_referenced_bodies_and_responses():
+    spec = parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Refs'},
+        'paths': {
+            '/pets': {
+                'post': {
+                    'operationId': 'addPet',
+                    'requestBody': {'$ref': '#/components/requestBodies/Pet'},
+                    'responses': {'201': {'$ref': '#/components/responses/Missing'}},
+                },
+            },
+        },
+        'components': {
+            'schemas': {},
+            'requestBodies': {'Pet': {'content': {'application/json; charset=utf-8': {'schema': {}}}}},
+        },
+    })
+    # dangling references are skipped rather than reported
+    index = OperationIndex(spec)
+    key = OperationKey('/pets', 'post')
+    assert index.by_id('addPet') == key
+    assert index.consuming(ContentTypeTag('application/json', 'utf-8')) == [key]
+    assert not index.producing(JSON)
@@ -0,0 +1,41 @@
+import pytest as pt
+from typeit.schema.errors import Error
+
+from openapi_type import parse_spec
+from openapi_type.parallel import ParseError
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .utils import load_spec
+
+
+def test_parallel_equals_serial():
+    import json
+    with (CUSTOM_EXAMPLES_DIR / 'petstore.json').open() as f:
+        data = json.load(f)
+    assert parse_spec(data, workers=2) == parse_spec(data)
+
+
+def test_parallel_error_pointer():
+    data = {
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Parallel'},
+        'paths': {'/a/{id}': {'get': {'responses': 1}}},
+        'components': {'schemas': {'Ok': {'type': 'string'}}},
+    }
+    with pt.raises(ParseError) as e:
+        parse_spec(data, workers=2)
+    assert [x.pointer for x in e.value] == ['/paths/~1a~1{id}/get/responses']
+
+
+def test_parallel_error_type():
+    data = {
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Parallel'},
+        'paths': {'/a': {'get': {'responses': 1}}},
+    }
+    # the same exception type as the serial parser raises, whatever the number of workers
+    for workers in (1, 2):
+        with pt.raises(Error) as e:
+            parse_spec(data, workers=workers)
+    assert isinstance(e.value, ParseError)
+    assert e.value.sample_data is data
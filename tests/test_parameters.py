@@ -0,0 +1,80 @@
+import pytest as pt
+from pyrsistent import pmap
+
+from openapi_type import (
+    OperationParameter, ParamLocation, ParamStyle,
+    IntegerValue, FloatValue, StringValue, BooleanValue, ArrayValue, ObjectValue,
+)
+from openapi_type.parameters import ParameterDecoder, ParameterError, string_decoder
+
+
+PRIMITIVE = IntegerValue(type='integer')
+ARRAY = ArrayValue(type='array', items=PRIMITIVE)
+# parameters are parsed into a frozenset, which requires hashable schemas
+OBJECT = ObjectValue(type='object', properties=pmap({'role': StringValue(type='string'), 'age': PRIMITIVE}))
+
+
+def _param(name, location, schema, style=None, explode=None, required=False):
+    return OperationParameter(name=name, in_=ParamLocation(location), schema=schema, required=required,
+                              style=None if style is None else ParamStyle(style), explode=explode)
+
+
+def _decoder(location, style, explode, schema):
+    return string_decoder(_param('id', location, schema, style, explode))
+
+
+@pt.mark.parametrize('location, style, explode, schema, raw, expected', [
+    # https://swagger.io/specification/#style-examples
+    ('path', 'simple', False, PRIMITIVE, '5', 5),
+    ('path', 'simple', False, ARRAY, '3,4,5', [3, 4, 5]),
+    ('path', 'simple', False, OBJECT, 'role,admin,age,5', {'role': 'admin', 'age': 5}),
+    ('path', 'simple', True, OBJECT, 'role=admin,age=5', {'role': 'admin', 'age': 5}),
+    ('path', 'label', False, PRIMITIVE, '.5', 5),
+    ('path', 'label', False, ARRAY, '.3,4,5', [3, 4, 5]),
+    ('path', 'label', True, ARRAY, '.3.4.5', [3, 4, 5]),
+    ('path', 'label', False, OBJECT, '.role,admin,age,5', {'role': 'admin', 'age': 5}),
+    ('path', 'label', True, OBJECT, '.role=admin.age=5', {'role': 'admin', 'age': 5}),
+    ('path', 'matrix', False, PRIMITIVE, ';id=5', 5),
+    ('path', 'matrix', False, ARRAY, ';id=3,4,5', [3, 4, 5]),
+    ('path', 'matrix', True, ARRAY, ';id=3;id=4;id=5', [3, 4, 5]),
+    ('path', 'matrix', False, OBJECT, ';id=role,admin,age,5', {'role': 'admin', 'age': 5}),
+    ('path', 'matrix', True, OBJECT, ';role=admin;age=5', {'role': 'admin', 'age': 5}),
+    ('header', 'simple', False, ARRAY, '3,4,5', [3, 4, 5]),
+    ('cookie', 'form', False, ARRAY, '3,4,5', [3, 4, 5]),
+])
+def test_string_decoders(location, style, explode, schema, raw, expected):
+    assert _decoder(location, style, explode, schema)(raw) == expected
+
+
+def test_parameter_decoder():
+    decoder = ParameterDecoder([
+        _param('id', 'path', PRIMITIVE, required=True),
+        _param('tags', 'query', ArrayValue(type='array', items=StringValue(type='string'))),
+        _param('ids', 'query', ARRAY, explode=False),
+        _param('piped', 'query', ARRAY, 'pipeDelimited', explode=False),
+        _param('spaced', 'query', ARRAY, 'spaceDelimited', explode=False),
+        _param('filter', 'query', OBJECT, 'deepObject', explode=True),
+        _param('limit', 'query', PRIMITIVE, required=True),
+        _param('flag', 'query', BooleanValue(type='boolean')),
+        _param('X-Rate', 'header', FloatValue(type='number')),
+        _param('session', 'cookie', StringValue(type='string')),
+    ])
+    rv = decoder.decode(
+        query='tags=a&tags=b%20c&ids=1,2&piped=3|4&spaced=5%206&filter[role]=admin&filter[age]=7&limit=10&flag=true',
+        headers={'x-rate': '1.5'},
+        cookies='theme=dark; session=abc',
+        path={'id': '42'},
+    )
+    assert rv.path == {'id': 42}
+    assert rv.query == {'tags': ['a', 'b c'], 'ids': [1, 2], 'piped': [3, 4], 'spaced': [5, 6],
+                        'filter': {'role': 'admin', 'age': 7}, 'limit': 10, 'flag': True}
+    assert rv.header == {'X-Rate': 1.5}
+    assert rv.cookie == {'session': 'abc'}
+
+    assert decoder.decode(query='limit=1', path={'id': '1'}).query == {'limit': 1}
+    with pt.raises(ParameterError) as e:
+        decoder.decode(query='', path={'id': '1'})
+    assert e.value.location is ParamLocation.QUERY and e.value.name == 'limit'
+    with pt.raises(ParameterError) as e:
+        decoder.decode(query='limit=x', path={'id': '1'})
+    assert e.value.name == 'limit'
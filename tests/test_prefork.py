@@ -0,0 +1,44 @@
+import gc
+import sys
+
+import pytest as pt
+from typeit.schema.errors import Error
+
+from openapi_type import parse_spec
+from openapi_type.prefork import freeze, parse_shared, unique_memory
+
+from .test_graph import SPEC
+
+
+def test_parse_shared():
+    enabled = gc.isenabled()
+    try:
+        assert parse_shared(SPEC) == parse_spec(SPEC)
+        # the collector stays disabled until the workers are forked
+        assert not gc.isenabled()
+        frozen = gc.get_freeze_count()
+        freeze()
+        assert gc.get_freeze_count() > frozen
+    finally:
+        gc.unfreeze()
+        if enabled:
+            gc.enable()
+    if sys.platform == 'linux':
+        assert unique_memory() > 0
+
+
+def test_parse_shared_errors():
+    enabled = gc.isenabled()
+    gc.enable()
+    frozen = gc.get_freeze_count()
+    try:
+        with pt.raises(Error):
+            parse_shared({**SPEC, 'paths': []})
+        # a failed parse does not leave the process without garbage collection
+        assert gc.isenabled()
+        with pt.raises(RuntimeError):
+            freeze()
+        assert gc.get_freeze_count() == frozen
+    finally:
+        if not enabled:
+            gc.disable()
@@ -0,0 +1,62 @@
+import threading
+
+import pytest as pt
+
+from openapi_type import _spec_node, parse_spec, serialize_spec
+from openapi_type.custom_types import iter_schema_nodes
+from openapi_type.profiling import profile
+
+from .test_graph import SPEC
+
+
+def test_profile():
+    spec = parse_spec(SPEC)
+    with profile() as p:
+        assert parse_spec(SPEC) == spec
+    types = {x.name: x for x in p.types()}
+    assert types['Info'].calls == 1
+    # every $ref of the spec
+    assert types['RefSchema'].calls == 11
+    assert all(x.seconds >= x.own_seconds for x in types.values())
+    pointers = {x.name: x for x in p.pointers()}
+    assert {'/paths/~1pets/get', '/components/schemas/Pet', '/components/schemas'} <= set(pointers)
+    assert '/paths/~1pets/get/responses' not in pointers
+    assert pointers['/components/schemas'].seconds >= pointers['/components/schemas/Pet'].seconds
+    assert 'Location' in p.report()
+
+    # the schema graph is restored on leaving the block
+    assert not any('deserialize' in x.__dict__ for x in iter_schema_nodes(_spec_node()))
+    with profile(depth=1) as p:
+        serialize_spec(spec)
+    assert {'/info', '/paths', '/components'} <= {x.name for x in p.pointers()}
+    assert all(x.name.count('/') == 1 for x in p.pointers())
+    with profile():
+        with pt.raises(RuntimeError):
+            with profile():
+                pass
+
+
+def test_profile_threads():
+    spec = parse_spec(SPEC)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def run():
+        barrier.wait()
+        for _ in range(5):
+            results.append(parse_spec(SPEC) == spec)
+
+    with profile() as p:
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for x in threads:
+            x.start()
+        for x in threads:
+            x.join()
+    assert results == [True] * 20
+    types = {x.name: x for x in p.types()}
+    assert types['Info'].calls == 20
+    assert types['RefSchema'].calls == 20 * 11
+    # every thread keeps its own stack of calls, so nested calls are never attributed to another thread
+    assert all(x.seconds >= x.own_seconds >= 0 for x in types.values())
+    assert {x.name: x.calls for x in p.pointers()}['/info'] == 20
+
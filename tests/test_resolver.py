@@ -0,0 +1,50 @@
+import pytest as pt
+
+from openapi_type import parse_spec, Reference, ArrayValue, ObjectValue
+from openapi_type.custom_types import Ref, RefTo
+from openapi_type.resolver import Resolver, UnresolvedReference, ReferenceCycle
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .utils import load_spec
+
+
+def _schemas_spec(schemas):
+    return parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Refs'},
+        'paths': {},
+        'components': {'schemas': schemas},
+    })
+
+
+def test_resolve_petstore():
+    spec = load_spec(CUSTOM_EXAMPLES_DIR / 'petstore.json')
+    resolver = Resolver(spec)
+    pet = Ref(RefTo.SCHEMAS, 'Pet')
+    assert pet in resolver.used
+    assert resolver.resolve(pet) is spec.components.schemas['Pet']
+    assert resolver.resolve(Reference(pet)) is resolver.resolve(pet)
+    assert not resolver.dangling
+    assert not resolver.cycles()
+
+
+def test_dangling_and_cycles():
+    spec = _schemas_spec({
+        'Alias': {'$ref': '#/components/schemas/Node'},
+        'Node': {'type': 'object', 'properties': {'children': {'type': 'array', 'items': {'$ref': '#/components/schemas/Node'}}}},
+        'Broken': {'type': 'array', 'items': {'$ref': '#/components/schemas/Missing'}},
+        'Loop1': {'$ref': '#/components/schemas/Loop2'},
+        'Loop2': {'$ref': '#/components/schemas/Loop1'},
+    })
+    resolver = Resolver(spec)
+    assert isinstance(resolver.resolve(Ref(RefTo.SCHEMAS, 'Alias')), ObjectValue)
+    assert isinstance(resolver[Ref(RefTo.SCHEMAS, 'Broken')], ArrayValue)
+    assert resolver.dangling == {Ref(RefTo.SCHEMAS, 'Missing')}
+    with pt.raises(UnresolvedReference):
+        resolver.resolve(Ref(RefTo.SCHEMAS, 'Missing'))
+    with pt.raises(ReferenceCycle):
+        resolver.resolve(Ref(RefTo.SCHEMAS, 'Loop1'))
+    assert sorted(map(sorted, resolver.cycles())) == [
+        [Ref(RefTo.SCHEMAS, 'Loop1'), Ref(RefTo.SCHEMAS, 'Loop2')],
+        [Ref(RefTo.SCHEMAS, 'Node')],
+    ]
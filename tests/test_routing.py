@@ -0,0 +1,74 @@
+import pytest as pt
+
+from openapi_type import parse_spec
+from openapi_type.routing import Router, PathParameterError
+
+
+def _operation(*params):
+    return {
+        'parameters': [{'name': name, 'in': 'path', 'required': True, 'schema': schema} for name, schema in params],
+        'responses': {'200': {'description': 'OK'}},
+    }
+
+
+def test_router():
+    spec = parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Routes'},
+        'paths': {
+            '/users/{id}': {'get': _operation(('id', {'type': 'integer'}))},
+            '/users/me': {'get': _operation()},
+            '/users/{id}/orders/{order}': {'get': _operation(('id', {'type': 'integer'}),
+                                                             ('order', {'$ref': '#/components/schemas/OrderId'}))},
+            '/users/me/orders/recent': {'get': _operation()},
+            '/files/{name}.{ext}': {'get': _operation(('ext', {'type': 'string', 'enum': ['json', 'yaml']}))},
+        },
+        'components': {'schemas': {'OrderId': {'type': 'integer'}}},
+    })
+    router = Router(spec)
+
+    route = router.match('GET', '/users/42/orders/7')
+    assert route.template == '/users/{id}/orders/{order}'
+    assert route.params == {'id': 42, 'order': 7}
+    assert route.operation is spec.paths[route.template].get
+
+    assert router.match('GET', '/users/me').template == '/users/me'
+    assert router.match('GET', '/users/me').params == {}
+    # the literal branch does not match, the search continues with the template
+    with pt.raises(PathParameterError):
+        router.match('GET', '/users/me/orders/3')
+    assert router.match('GET', '/users/me/orders/recent').template == '/users/me/orders/recent'
+
+    assert router.match('GET', '/files/spec.json').params == {'name': 'spec', 'ext': 'json'}
+    assert router.match('GET', '/files/a%20b.yaml').params == {'name': 'a b', 'ext': 'yaml'}
+
+    route = router.match('POST', '/users/42')
+    assert route.template == '/users/{id}' and route.operation is None and route.params == {'id': '42'}
+    assert router.match('GET', '/users') is None
+    assert router.match('GET', '/users/42/orders') is None
+    with pt.raises(PathParameterError):
+        router.match('GET', '/users/x')
+
+
+def test_router_path_parameter_checks():
+    spec = parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Routes'},
+        'paths': {
+            '/files/{name}.{ext}': {'get': _operation(('ext', {'type': 'string', 'enum': ['json', 'yaml']}))},
+            '/pages/{page}': {'get': _operation(('page', {'type': 'integer'}))},
+            '/scores/{score}': {'get': _operation(('score', {'type': 'number'}))},
+        },
+    })
+    router = Router(spec)
+
+    assert router.match('GET', '/files/a.yaml').params == {'name': 'a', 'ext': 'yaml'}
+    with pt.raises(PathParameterError):
+        router.match('GET', '/files/a.exe')
+
+    assert router.match('GET', '/pages/-12').params == {'page': -12}
+    assert router.match('GET', '/scores/1.5e3').params == {'score': 1500.0}
+    for path in ('/pages/1_000', '/pages/%2012%20', '/pages/%D9%A1', '/pages/+1',
+                 '/scores/nan', '/scores/inf', '/scores/1_0.5'):
+        with pt.raises(PathParameterError):
+            router.match('GET', path)
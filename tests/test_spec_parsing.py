@@ -11,3 +11,65 @@ def test_parsing(name, spec_file):
     oapi = load_spec(spec_file)
     assert isinstance(oapi, OpenAPI)
     assert parse_spec(serialize_spec(oapi)) == oapi
+
+
+def _spec_with_schemas(schemas):
+    return {
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Dispatch'},
+        'paths': {},
+        'components': {'schemas': schemas},
+    }
+
+
+def test_schema_dispatch():
+    from openapi_type import dispatch_stats, ObjectWithAdditionalProperties, StringValue
+
+    dispatch_stats.reset()
+    oapi = parse_spec(_spec_with_schemas({'Str': {'type': 'string'}}))
+    assert oapi.components.schemas['Str'] == StringValue(type='string')
+    assert dispatch_stats.dispatched > 0
+    assert dispatch_stats.fallbacks == 0
+
+    dispatch_stats.reset()
+    # "properties" is malformed, so ObjectValue is rejected
+    # and the ordered trial picks ObjectWithAdditionalProperties
+    oapi = parse_spec(_spec_with_schemas({'Obj': {'type': 'object', 'properties': 1}}))
+    assert oapi.components.schemas['Obj'] == ObjectWithAdditionalProperties(type='object')
+    assert dispatch_stats.dispatched == 0
+    assert dispatch_stats.fallbacks > 0
+
+
+def test_interning():
+    from openapi_type import InternPool
+    from .paths import CUSTOM_EXAMPLES_DIR
+    import json
+
+    with (CUSTOM_EXAMPLES_DIR / 'petstore.json').open() as f:
+        data = json.load(f)
+    copy = json.loads(json.dumps(data))
+    pool = InternPool()
+    a = parse_spec(data, pool=pool)
+    b = parse_spec(copy, pool=pool)
+    assert a == b
+    stats = pool.stats()
+    assert stats.refs == 7
+    assert stats.hits > stats.misses
+
+    put, post = a.paths['/pet'].put, a.paths['/pet'].post
+    assert next(iter(put.request_body.content)) is next(iter(post.request_body.content))
+    assert a.paths['/pet'].put.description is b.paths['/pet'].put.description
+    # separate parses do not share values by default
+    assert parse_spec(copy).paths['/pet'].put.description is not a.paths['/pet'].put.description
+
+
+def test_interning_union_fast_path():
+    from openapi_type import _spec_node
+    from openapi_type.custom_types import InterningStr, UnionSchema, iter_schema_nodes
+
+    unions = [x.typ for x in iter_schema_nodes(_spec_node()) if isinstance(x.typ, UnionSchema)]
+    string_unions = [x for x in unions if any(isinstance(v.typ, InterningStr) for _, v in x.variant_nodes)]
+    assert string_unions
+    for typ in string_unions:
+        # strings take the primitive fast path instead of the trial of every variant
+        assert typ.primitive_types[str] in typ.variant_schema_types
@@ -0,0 +1,78 @@
+import pytest as pt
+
+from openapi_type import parse_spec
+from openapi_type.custom_types import Ref, RefTo
+from openapi_type.validation import InvalidPayload, ValidatorCompiler
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .utils import load_spec
+
+
+def _compiler(schemas):
+    spec = parse_spec({
+        'openapi': '3.0.0',
+        'info': {'version': '1', 'title': 'Validation'},
+        'paths': {},
+        'components': {'schemas': schemas},
+    })
+    return spec, ValidatorCompiler(spec)
+
+
+def _error(validate, payload):
+    with pt.raises(InvalidPayload) as e:
+        validate(payload)
+    return e.value.pointer
+
+
+def test_compiled_validators():
+    spec, compiler = _compiler({
+        'Node': {
+            'type': 'object',
+            'required': ['name'],
+            'properties': {
+                'name': {'type': 'string', 'pattern': '^[a-z]+$'},
+                'kind': {'type': 'string', 'enum': ['leaf', 'branch']},
+                'weight': {'type': 'integer', 'minimum': 0, 'maximum': 10},
+                'children': {'type': 'array', 'items': {'$ref': '#/components/schemas/Node'}},
+                'labels': {'type': 'object', 'additionalProperties': {'type': 'string'}},
+            },
+        },
+        'Id': {'oneOf': [{'type': 'integer'}, {'type': 'number'}]},
+        'Named': {'allOf': [{'$ref': '#/components/schemas/Node'},
+                            {'type': 'object', 'required': ['kind'], 'properties': {'kind': {'type': 'string'}}}]},
+        'Flag': {'anyOf': [{'type': 'boolean'}, {'type': 'string'}]},
+    })
+    schemas = spec.components.schemas
+    node = compiler.compile(schemas['Node'])
+    assert compiler.compile(schemas['Node']) is node
+
+    node({'name': 'root', 'children': [{'name': 'leaf', 'kind': 'leaf', 'weight': 3, 'labels': {'a': 'b'}}]})
+    assert _error(node, {}) == ''
+    assert _error(node, {'name': 'Root'}) == '/name'
+    assert _error(node, {'name': 'a', 'kind': 'trunk'}) == '/kind'
+    assert _error(node, {'name': 'a', 'weight': 11}) == '/weight'
+    assert _error(node, {'name': 'a', 'weight': True}) == '/weight'
+    assert _error(node, {'name': 'a', 'children': [{'name': 'b'}, {'name': 'c', 'labels': {'x/y': 1}}]}) \
+        == '/children/1/labels/x~1y'
+
+    one_of = compiler.compile(schemas['Id'])
+    one_of(1.5)
+    assert _error(one_of, 1) == ''  # an integer is a number too
+    all_of = compiler.compile(schemas['Named'])
+    all_of({'name': 'a', 'kind': 'leaf'})
+    assert _error(all_of, {'name': 'a'}) == ''
+    any_of = compiler.compile(schemas['Flag'])
+    any_of(True)
+    any_of('yes')
+    assert _error(any_of, 1) == ''
+
+
+def test_operation_validators():
+    spec = load_spec(CUSTOM_EXAMPLES_DIR / 'petstore.json')
+    compiler = ValidatorCompiler(spec)
+    for item in spec.paths.values():
+        for operation in (item.get, item.post, item.put, item.delete):
+            if operation is not None:
+                assert all(callable(x) for x in compiler.request_body(operation).values())
+                assert all(callable(x) for x in compiler.responses(operation).values())
+    assert compiler.compile(spec.components.schemas['Pet']) is compiler._compile_ref(Ref(RefTo.SCHEMAS, 'Pet'))
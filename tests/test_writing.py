@@ -0,0 +1,36 @@
+import io
+import json
+
+import pytest as pt
+
+from benchmarks.generator import generate_spec
+from openapi_type import parse_spec, serialize_spec
+from openapi_type.writing import _yaml_dump, iter_json, write_json, write_yaml
+
+from .paths import CUSTOM_EXAMPLES_DIR
+from .utils import load_spec
+
+
+@pt.fixture(params=['petstore', 'generated'])
+def spec(request):
+    if request.param == 'petstore':
+        return load_spec(CUSTOM_EXAMPLES_DIR / 'petstore.json')
+    return parse_spec(generate_spec(50, union_ratio=0.2))
+
+
+def test_write_json(spec):
+    expected = json.dumps(serialize_spec(spec), sort_keys=True, separators=(',', ':'))
+    assert ''.join(iter_json(spec)) == expected
+    out = io.BytesIO()
+    write_json(spec, out)
+    assert out.getvalue() == expected.encode()
+    assert parse_spec(json.loads(expected)) == spec
+
+
+def test_write_yaml(spec):
+    yaml = pt.importorskip('yaml')
+    data = serialize_spec(spec)
+    out = io.StringIO()
+    write_yaml(spec, out)
+    assert out.getvalue() == _yaml_dump()(data)
+    assert yaml.safe_load(out.getvalue()) == data